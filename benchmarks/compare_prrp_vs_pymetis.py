@@ -20,9 +20,9 @@ from memory_profiler import memory_usage
 from typing import Dict, List, Set, Tuple
 
 # Import PRRP and PyMETIS functions
-from src.utils import load_graph_from_metis
+from src.metis_parser import MetisGraph, csr_to_adjacency_lists, read_metis
 from src.graph_prrp import run_graph_prrp
-from src.pymetis_partition import partition_graph_pymetis
+from src.pymetis_partition import partition_csr_pymetis
 
 # File paths
 GRAPH_FILE_PATH = os.path.join(
@@ -58,14 +58,18 @@ def count_edge_cuts(adj_list: Dict[int, List[int]], partitions: Dict[int, Set[in
     return edge_cuts // 2
 
 
-def benchmark_partitioning(graph: Dict[int, List[int]]):
+def benchmark_partitioning(metis_graph: MetisGraph):
     """
     Benchmarks PRRP and PyMETIS partitioning performance and writes results.
 
     Parameters:
-        graph (Dict[int, List[int]]): The input graph as an adjacency list.
+        metis_graph (MetisGraph): The parsed graph; PRRP uses its CSR graph and PyMETIS
+            additionally receives its vertex and edge weights.
     """
     print("===== Benchmarking PRRP vs PyMETIS =====")
+    graph = metis_graph.graph
+    adj_list = csr_to_adjacency_lists(graph)
+    pymetis_args = (graph, NUM_PARTITIONS, metis_graph.vwgt, metis_graph.adjwgt)
 
     # **Benchmark PRRP**
     print("\nRunning PRRP Partitioning...")
@@ -77,7 +81,7 @@ def benchmark_partitioning(graph: Dict[int, List[int]]):
 
         prrp_memory = memory_usage(
             (run_graph_prrp, (graph, NUM_PARTITIONS, TARGET_CARDINALITY, MAX_RETRIES, MAX_SIZE)))
-        prrp_edge_cuts = count_edge_cuts(graph, prrp_partitions)
+        prrp_edge_cuts = count_edge_cuts(adj_list, prrp_partitions)
 
         print(f"PRRP Execution Time: {prrp_time:.2f} seconds")
         print(f"PRRP Peak Memory Usage: {max(prrp_memory):.2f} MiB")
@@ -90,12 +94,12 @@ def benchmark_partitioning(graph: Dict[int, List[int]]):
     print("\nRunning PyMETIS Partitioning...")
     try:
         start_time = time.time()
-        pymetis_partitions = partition_graph_pymetis(graph, NUM_PARTITIONS)
+        pymetis_partitions = partition_csr_pymetis(*pymetis_args)
         pymetis_time = time.time() - start_time
 
         pymetis_memory = memory_usage(
-            (partition_graph_pymetis, (graph, NUM_PARTITIONS)))
-        pymetis_edge_cuts = count_edge_cuts(graph, pymetis_partitions)
+            (partition_csr_pymetis, pymetis_args))
+        pymetis_edge_cuts = count_edge_cuts(adj_list, pymetis_partitions)
 
         print(f"PyMETIS Execution Time: {pymetis_time:.2f} seconds")
         print(f"PyMETIS Peak Memory Usage: {max(pymetis_memory):.2f} MiB")
@@ -126,12 +130,12 @@ def main():
 
     print("Loading synthetic graph...")
     try:
-        graph = load_graph_from_metis(GRAPH_FILE_PATH)
+        metis_graph = read_metis(GRAPH_FILE_PATH)
     except Exception as e:
         print(f"Failed to load graph: {e}")
         return
 
-    benchmark_partitioning(graph)
+    benchmark_partitioning(metis_graph)
 
 
 if __name__ == "__main__":
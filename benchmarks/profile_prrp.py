@@ -21,7 +21,8 @@ Usage:
 """
 
 
-from src.utils import find_connected_components, load_graph_from_metis, construct_adjacency_list, random_seed_selection
+from src.utils import find_connected_components, construct_adjacency_list, random_seed_selection
+from src.graph_store import load_or_convert_metis
 from src.graph_prrp import run_graph_prrp, grow_partition, merge_disconnected_areas, split_partition
 from memory_profiler import memory_usage
 import cProfile
@@ -122,7 +123,8 @@ def main():
 
     print("Loading synthetic graph...")
     try:
-        graph = load_graph_from_metis(GRAPH_FILE_PATH)
+        # Parses the METIS file once and memory-maps the binary graph file on later runs.
+        graph = load_or_convert_metis(GRAPH_FILE_PATH).graph
     except Exception as e:
         sys.exit(f"Failed to load graph: {e}")
 
@@ -0,0 +1,109 @@
+"""
+adjacency_cache.py
+
+This module provides a persistent on-disk cache for contiguity graphs built from shapefiles.
+
+Building the adjacency of a shapefile requires reading and relating every geometry. The
+result depends only on the file contents, the contiguity rule and the column used as area
+identifier, so it is stored once under a key derived from those three and reused by later
+runs. A cache entry is a graph file (see graph_store) that is memory-mapped on load, so a
+cache hit neither touches the geometry nor copies the graph into memory up front.
+
+The cache directory defaults to $PRRP_CACHE_DIR, or ~/.cache/prrp if that is unset.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Optional
+
+from src.csr_graph import CSRGraph
+from src.graph_store import load_graph, save_graph
+
+logger = logging.getLogger(__name__)
+
+# Shapefile components whose contents determine the graph: geometry, index and attributes.
+_SHAPEFILE_COMPONENTS = (".shp", ".shx", ".dbf")
+_HASH_CHUNK = 1 << 20
+
+
+def default_cache_dir() -> str:
+    """Returns $PRRP_CACHE_DIR, or ~/.cache/prrp if it is unset."""
+    return os.environ.get("PRRP_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "prrp")
+
+
+def shapefile_fingerprint(file_path: str) -> str:
+    """
+    Returns a SHA-256 digest of the contents of a shapefile's .shp, .shx and .dbf files.
+
+    Raises:
+        FileNotFoundError: If the .shp file does not exist.
+    """
+    base, _ = os.path.splitext(file_path)
+    digest = hashlib.sha256()
+    for extension in _SHAPEFILE_COMPONENTS:
+        component = base + extension
+        if not os.path.exists(component):
+            if extension == ".shp":
+                raise FileNotFoundError(component)
+            continue
+        digest.update(extension.encode())
+        with open(component, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(file_path: str, contiguity: str = "rook", id_column: str = "GEOID") -> str:
+    """
+    Returns the cache key of a shapefile's graph: a digest of the file contents, the
+    contiguity rule and the identifier column.
+    """
+    digest = hashlib.sha256()
+    digest.update(shapefile_fingerprint(file_path).encode())
+    digest.update(f"\0{contiguity}\0{id_column}".encode())
+    return digest.hexdigest()
+
+
+def load_shapefile_graph(file_path: str,
+                         contiguity: str = "rook",
+                         id_column: str = "GEOID",
+                         cache_dir: Optional[str] = None,
+                         use_cache: bool = True) -> CSRGraph:
+    """
+    Returns the contiguity graph of a shapefile, keyed by the values of id_column.
+
+    On a cache hit the stored graph is memory-mapped and the shapefile's geometry is never
+    read. On a miss the graph is built with build_contiguity_csr and stored for later runs.
+
+    Parameters:
+        file_path (str): Path to the .shp file.
+        contiguity (str): "rook" or "queen".
+        id_column (str): Attribute column holding the area identifiers.
+        cache_dir (str, optional): Cache directory; see default_cache_dir.
+        use_cache (bool): If False, always build the graph and leave the cache untouched.
+
+    Returns:
+        CSRGraph: The contiguity graph.
+    """
+    entry_path = None
+    if use_cache:
+        key = cache_key(file_path, contiguity, id_column)
+        entry_path = os.path.join(cache_dir or default_cache_dir(), key + ".prrpg")
+        if os.path.exists(entry_path):
+            logger.info(f"Loaded cached {contiguity} graph for {file_path} from {entry_path}.")
+            return load_graph(entry_path).graph
+
+    # Imported here so cache hits do not pay for loading geopandas.
+    import geopandas as gpd
+    from src.utils import build_contiguity_csr
+
+    gdf = gpd.read_file(file_path)
+    graph = build_contiguity_csr(gdf.geometry.values, gdf[id_column].tolist(), contiguity)
+    if entry_path is not None:
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        save_graph(entry_path, graph, meta={"source": os.path.abspath(file_path),
+                                            "contiguity": contiguity, "id_column": id_column})
+        logger.info(f"Cached {contiguity} graph for {file_path} in {entry_path}.")
+    return graph
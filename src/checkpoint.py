@@ -0,0 +1,290 @@
+"""
+checkpoint.py
+
+This module provides an append-only checkpoint file for long PRRP ensemble runs.
+
+A large ensemble can run for hours, and if its results only exist in the parent process
+at the end, a single killed worker or pre-empted node loses all of them. A checkpoint
+records every completed solution as soon as it arrives, together with its position in the
+ensemble and its random seed, so that a rerun only generates the solutions that are missing.
+
+The seed of solution i is derived from the ensemble's root seed and i alone, through
+numpy's SeedSequence spawning (see solution_seed). Any range of indices can therefore be
+generated anywhere: a host running one shard of an ensemble writes its solutions to its
+own checkpoint file, and merge_shards combines the shard files into the same solutions a
+single host would have produced.
+
+Layout (all integers little-endian):
+    - 8-byte magic b"PRRPCKP1"
+    - 8-byte length of the JSON header, followed by the header itself. The header holds the
+      digest of the graph, the cardinalities and the root seed of the ensemble.
+    - one record per completed solution: solution index (int64), seed (int64), number of
+      labels (uint32), CRC-32 of the labels (uint32), then the int32 label array of the
+      solution (see src/solution.py).
+
+Records are only ever appended. A record cut short by a crash, or one whose CRC does not
+match, ends the readable part of the file; it is truncated away when the file is reopened.
+"""
+
+import json
+import logging
+import os
+import random
+import struct
+import time
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+from src.graph_store import graph_digest
+from src.solution import Solution
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PRRPCKP1"
+_LENGTH = struct.Struct("<Q")
+_RECORD = struct.Struct("<qqII")
+
+
+def solution_seed(root_seed: int, index: int) -> int:
+    """
+    Returns the seed of solution index of the ensemble with root_seed. This is the state of
+    the index-th child of SeedSequence(root_seed), so it depends on nothing but the two
+    arguments and seeds of different indices are statistically independent.
+    """
+    child = np.random.SeedSequence(root_seed, spawn_key=(index,))
+    return int(child.generate_state(1, dtype=np.uint32)[0])
+
+
+def ensemble_seeds(root_seed: int, count: int, start: int = 0) -> List[int]:
+    """Returns the seeds of solutions start..start+count-1 of the ensemble with root_seed."""
+    return [solution_seed(root_seed, index) for index in range(start, start + count)]
+
+
+def shard_range(solutions_count: int, num_shards: int, shard_index: int) -> range:
+    """
+    Returns the solution indices of one shard when solutions_count solutions are split into
+    num_shards contiguous shards of nearly equal size.
+
+    Raises:
+        ValueError: If shard_index is not in 0..num_shards-1.
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError("shard_index must be between 0 and num_shards - 1.")
+    return range(solutions_count * shard_index // num_shards,
+                 solutions_count * (shard_index + 1) // num_shards)
+
+
+class SolutionCheckpoint:
+    """
+    An append-only file of completed solutions of one ensemble.
+
+    Opening an existing checkpoint checks that it belongs to the same graph and
+    cardinalities, reads the indices of the solutions it already holds and drops any torn
+    record at its end. New solutions are appended with append(). Each record is flushed to
+    the operating system at once; it is also synced to disk at most every sync_interval
+    seconds, and on close().
+
+    Example:
+        with SolutionCheckpoint("run.ckpt", graph, cardinalities) as checkpoint:
+            for index in checkpoint.missing(50000):
+                seed = checkpoint.seed(index)
+                checkpoint.append(index, seed, solve(seed))
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 graph: CSRGraph,
+                 cardinalities: List[int],
+                 root_seed: Optional[int] = None,
+                 sync_interval: float = 5.0):
+        """
+        Parameters:
+            file_path (str): Path of the checkpoint file; created if it does not exist.
+            graph (CSRGraph): The graph the solutions are labelled over.
+            cardinalities (List[int]): The target region sizes of the ensemble.
+            root_seed (int, optional): Root seed of a new ensemble. Drawn at random if omitted.
+                For an existing checkpoint it must be omitted or match the stored one.
+            sync_interval (float): Maximum number of seconds between syncs to disk.
+
+        Raises:
+            ValueError: If the file is not a checkpoint or belongs to another ensemble.
+        """
+        self.file_path = file_path
+        self.graph = graph
+        self.sync_interval = sync_interval
+        self.completed: Dict[int, int] = {}
+        header = _ensemble_header(graph, cardinalities)
+
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            stored, data_start = _read_checked_header(file_path, header, root_seed)
+            self.root_seed = stored["root_seed"]
+            end = data_start
+            for index, seed, _, end in _scan_records(file_path, data_start, graph.num_nodes):
+                self.completed[index] = seed
+            if end < os.path.getsize(file_path):
+                logger.warning(f"Discarding a torn record at the end of checkpoint {file_path}.")
+                os.truncate(file_path, end)
+            logger.info(f"Resuming checkpoint {file_path} with {len(self.completed)} solution(s).")
+        else:
+            self.root_seed = random.getrandbits(63) if root_seed is None else root_seed
+            header["root_seed"] = self.root_seed
+            encoded = json.dumps(header).encode()
+            with open(file_path, "wb") as f:
+                f.write(MAGIC + _LENGTH.pack(len(encoded)) + encoded)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._file = open(file_path, "ab")
+        self._last_sync = time.monotonic()
+
+    def seed(self, index: int) -> int:
+        """Returns the seed of solution index of this ensemble."""
+        return solution_seed(self.root_seed, index)
+
+    def missing(self, indices: Union[int, Iterable[int]]) -> List[int]:
+        """
+        Returns the indices without a solution in the checkpoint yet, among the given ones
+        or, for an integer, among 0..indices-1.
+        """
+        if isinstance(indices, int):
+            indices = range(indices)
+        return [index for index in indices if index not in self.completed]
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def append(self, index: int, seed: int, solution: Solution) -> None:
+        """Records the solution at position index of the ensemble, generated from seed."""
+        labels = np.ascontiguousarray(solution.labels, dtype="<i4")
+        payload = labels.tobytes()
+        self._file.write(_RECORD.pack(index, seed, labels.size, zlib.crc32(payload)) + payload)
+        self._file.flush()
+        self.completed[index] = seed
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Forces appended records to disk."""
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def solutions(self) -> Iterator[Tuple[int, int, Solution]]:
+        """Yields (index, seed, solution) for every stored record, in file order."""
+        self._file.flush()
+        _, data_start = _read_header(self.file_path)
+        for index, seed, labels, _ in _scan_records(self.file_path, data_start,
+                                                    self.graph.num_nodes, with_labels=True):
+            yield index, seed, Solution(labels, self.graph)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "SolutionCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _read_header(file_path: str) -> Tuple[dict, int]:
+    with open(file_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not a PRRP checkpoint file.")
+        (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        header = json.loads(f.read(length))
+    return header, len(MAGIC) + _LENGTH.size + length
+
+
+def _ensemble_header(graph: CSRGraph, cardinalities: List[int]) -> dict:
+    """The header fields every checkpoint of an ensemble shares, apart from the root seed."""
+    return {"graph": graph_digest(graph), "num_nodes": graph.num_nodes,
+            "cardinalities": sorted(cardinalities, reverse=True)}
+
+
+def _read_checked_header(file_path: str, expected: dict,
+                         root_seed: Optional[int]) -> Tuple[dict, int]:
+    """
+    Reads the header of an existing checkpoint and checks it against the expected graph and
+    cardinalities, and against root_seed unless it is None.
+    """
+    stored, data_start = _read_header(file_path)
+    if root_seed is not None and root_seed != stored["root_seed"]:
+        raise ValueError(f"Checkpoint {file_path} was started with another root seed.")
+    if any(stored[key] != value for key, value in expected.items()):
+        raise ValueError(
+            f"Checkpoint {file_path} belongs to a different graph or cardinalities.")
+    return stored, data_start
+
+
+def _scan_records(file_path: str, data_start: int, num_nodes: int, with_labels: bool = False):
+    """
+    Yields (index, seed, labels or None, end offset) for each intact record, stopping at the
+    first short or corrupted one.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(data_start)
+        end = data_start
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            index, seed, size, crc = _RECORD.unpack(head)
+            if size != num_nodes:
+                return
+            payload = f.read(4 * size)
+            if len(payload) < 4 * size or zlib.crc32(payload) != crc:
+                return
+            end += _RECORD.size + len(payload)
+            labels = np.frombuffer(payload, dtype="<i4").astype(np.int32) if with_labels else None
+            yield index, seed, labels, end
+
+
+def merge_shards(shard_paths: Iterable[str],
+                 graph: CSRGraph,
+                 cardinalities: List[int],
+                 solutions_count: int) -> List[Solution]:
+    """
+    Combines the shard files of one ensemble into its solutions 0..solutions_count-1.
+    The shard files are only read, never modified.
+
+    Parameters:
+        shard_paths (Iterable[str]): Checkpoint files written by the shards.
+        graph (CSRGraph): The graph the solutions are labelled over.
+        cardinalities (List[int]): The target region sizes of the ensemble.
+        solutions_count (int): Size of the ensemble.
+
+    Returns:
+        List[Solution]: The solutions in index order, identical to a single-host run.
+
+    Raises:
+        FileNotFoundError: If a shard file does not exist.
+        ValueError: If the shards belong to different ensembles, a record's seed does not
+            match its index, or solutions are missing.
+    """
+    header = _ensemble_header(graph, cardinalities)
+    root_seed = None
+    solutions: Dict[int, Solution] = {}
+    # Shards are only read: a torn tail is ignored rather than truncated away.
+    for path in shard_paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        stored, data_start = _read_checked_header(path, header, root_seed)
+        root_seed = stored["root_seed"]
+        for index, seed, labels, _ in _scan_records(path, data_start, graph.num_nodes,
+                                                    with_labels=True):
+            if seed != solution_seed(root_seed, index):
+                raise ValueError(
+                    f"Shard {path} holds solution {index} with a seed of another ensemble.")
+            if index < solutions_count:
+                solutions[index] = Solution(labels, graph)
+
+    absent = solutions_count - len(solutions)
+    if absent:
+        raise ValueError(f"{absent} of {solutions_count} solutions are missing from the shards.")
+    logger.info(f"Merged {solutions_count} solutions from shard files.")
+    return [solutions[index] for index in range(solutions_count)]
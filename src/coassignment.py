@@ -0,0 +1,289 @@
+"""
+coassignment.py
+
+This module accumulates co-assignment counts over ensembles of PRRP solutions.
+
+PRRP is used to draw many independent regionalizations for statistical inference, and a
+common summary is how often two areas end up in the same region. Counting this for all
+pairs is quadratic in the number of areas and is rarely needed: pairs far apart in the
+contiguity graph are almost never co-assigned. CoAssignmentAccumulator therefore fixes,
+once, the set of candidate pairs within a given graph distance, and then updates one
+count per pair for each solution with a single vectorized comparison of region labels.
+
+Accumulators over the same graph and distance can be merged, so each worker can keep a
+partial accumulator and the parent combines them at the end. The hosts of a sharded run
+save theirs to files, and merge_accumulator_shards combines the files.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.csr_graph import CSRGraph
+from src.graph_store import graph_digest
+from src.solution import Solution
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on solution x pair label comparisons per vectorized step in add_many.
+_BATCH_ELEMENTS = 1 << 22
+
+
+def pairs_within_distance(graph: CSRGraph, max_distance: int) -> sp.csr_matrix:
+    """
+    Returns the node pairs (i, j), i < j, whose graph distance is at most max_distance, as
+    the upper triangle of a boolean sparse matrix over dense node indices.
+
+    Raises:
+        ValueError: If max_distance is less than 1.
+    """
+    if max_distance < 1:
+        raise ValueError("max_distance must be at least 1.")
+    n = graph.num_nodes
+    adjacency = sp.csr_matrix(
+        (np.ones(graph.indices.size, dtype=bool), graph.indices, graph.indptr), shape=(n, n))
+    step = adjacency + sp.identity(n, dtype=bool, format="csr")
+    reach = step
+    for _ in range(max_distance - 1):
+        reach = reach @ step
+    pairs = sp.triu(reach, k=1, format="csr")
+    pairs.sort_indices()
+    return pairs
+
+
+class CoAssignmentAccumulator:
+    """
+    Counts, for every pair of areas within max_distance hops, the number of solutions that
+    put both areas in the same region.
+
+    Attributes:
+        graph (CSRGraph): The graph whose dense node indices the solutions refer to.
+        max_distance (int): Largest graph distance of a counted pair.
+        rows, cols (np.ndarray): The candidate pairs (rows[k] < cols[k]), in row-major order.
+        counts (np.ndarray): Co-assignment count of each candidate pair.
+        num_solutions (int): Number of solutions accumulated so far.
+    """
+
+    def __init__(self, graph: CSRGraph, max_distance: int = 1):
+        """
+        Parameters:
+            graph (CSRGraph): The contiguity graph of the areas.
+            max_distance (int): Only pairs at most this many hops apart are counted.
+        """
+        self.graph = graph
+        self.max_distance = max_distance
+        pairs = pairs_within_distance(graph, max_distance)
+        self._indptr = pairs.indptr.astype(np.int64)
+        self.rows = np.repeat(np.arange(graph.num_nodes, dtype=np.int32),
+                              np.diff(pairs.indptr))
+        self.cols = pairs.indices.astype(np.int32)
+        self.counts = np.zeros(self.cols.size, dtype=np.int64)
+        self.num_solutions = 0
+        # Another graph object found equal to self.graph (e.g. a copy unpickled from a
+        # worker), so its Solutions are not digested again.
+        self._equal_graph: Optional[CSRGraph] = None
+        self._digest: Optional[str] = None
+        logger.debug("Co-assignment accumulator tracks %d pairs within distance %d.",
+                     self.cols.size, max_distance)
+
+    @property
+    def num_pairs(self) -> int:
+        """The number of candidate pairs."""
+        return int(self.cols.size)
+
+    def _graph_digest(self) -> str:
+        if self._digest is None:
+            self._digest = graph_digest(self.graph)
+        return self._digest
+
+    def _check_graph(self, graph: CSRGraph) -> None:
+        if graph is self.graph or graph is self._equal_graph:
+            return
+        if graph.num_nodes != self.graph.num_nodes or graph_digest(graph) != self._graph_digest():
+            logger.error("Solution was built over a different graph than the accumulator.")
+            raise ValueError("Solution belongs to a different graph than the accumulator.")
+        self._equal_graph = graph
+
+    def _labels(self, solution: Any) -> np.ndarray:
+        if isinstance(solution, Solution):
+            self._check_graph(solution.graph)
+            return solution.labels
+        if isinstance(solution, np.ndarray):
+            if solution.shape != (self.graph.num_nodes,):
+                logger.error(f"Label array of shape {solution.shape} does not match a graph "
+                             f"of {self.graph.num_nodes} nodes.")
+                raise ValueError("Label arrays must have one entry per node of the graph.")
+            return solution
+        if isinstance(solution, dict):
+            return Solution.from_partitions(solution, self.graph).labels
+        return Solution.from_regions(solution, self.graph).labels
+
+    def add(self, solution: Any) -> None:
+        """
+        Adds one solution.
+
+        Parameters:
+            solution: A Solution, an int32 label array over the graph's dense indices, a
+                spatial solution (list of sets of area IDs) or a graph solution
+                (dict of partition ID to set of node IDs).
+
+        Raises:
+            ValueError: If a Solution belongs to another graph, or a label array does not
+                have one entry per node.
+        """
+        labels = self._labels(solution)
+        left = labels[self.rows]
+        self.counts += (left == labels[self.cols]) & (left >= 0)
+        self.num_solutions += 1
+
+    def add_many(self, solutions: Iterable[Any], batch_size: Optional[int] = None) -> None:
+        """
+        Adds several solutions, comparing labels for up to batch_size solutions per
+        vectorized step. Accepts any iterable, including the streaming generators of
+        spatial_prrp, and consumes it lazily.
+
+        Parameters:
+            solutions (Iterable): Solutions in any form accepted by add().
+            batch_size (int, optional): Solutions per step. By default, as many as keep the
+                temporary comparison arrays to a few million elements.
+        """
+        batch_size = batch_size or max(1, min(256, _BATCH_ELEMENTS // max(self.num_pairs, 1)))
+        batch = []
+        for solution in solutions:
+            batch.append(self._labels(solution))
+            if len(batch) == batch_size:
+                self._add_batch(batch)
+                batch = []
+        if batch:
+            self._add_batch(batch)
+
+    def _add_batch(self, batch) -> None:
+        labels = np.stack(batch)
+        left = labels[:, self.rows]
+        same = (left == labels[:, self.cols]) & (left >= 0)
+        self.counts += same.sum(axis=0)
+        self.num_solutions += len(batch)
+
+    def merge(self, other: "CoAssignmentAccumulator") -> "CoAssignmentAccumulator":
+        """
+        Adds the counts of another accumulator over the same graph and distance, in place.
+
+        Returns:
+            CoAssignmentAccumulator: self, for chaining.
+
+        Raises:
+            ValueError: If the two accumulators track different pairs.
+        """
+        if (other.max_distance != self.max_distance
+                or other.graph.num_nodes != self.graph.num_nodes
+                or not np.array_equal(other._indptr, self._indptr)
+                or not np.array_equal(other.cols, self.cols)):
+            raise ValueError("Accumulators over different graphs or distances cannot be merged.")
+        self.counts += other.counts
+        self.num_solutions += other.num_solutions
+        return self
+
+    def __iadd__(self, other: "CoAssignmentAccumulator") -> "CoAssignmentAccumulator":
+        return self.merge(other)
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the counts to an .npz file, so that hosts of a sharded run can ship their
+        partial accumulators to the one that merges them.
+        """
+        np.savez(file_path, counts=self.counts, cols=self.cols, indptr=self._indptr,
+                 num_solutions=self.num_solutions, max_distance=self.max_distance,
+                 graph=np.array(self._graph_digest()))
+
+    @classmethod
+    def load(cls, file_path: str, graph: CSRGraph) -> "CoAssignmentAccumulator":
+        """
+        Reads an accumulator written by save() for the same graph.
+
+        Raises:
+            ValueError: If the file was written for another graph.
+        """
+        with np.load(file_path) as data:
+            accumulator = cls(graph, int(data["max_distance"]))
+            if (str(data["graph"]) != accumulator._graph_digest()
+                    or not np.array_equal(data["indptr"], accumulator._indptr)
+                    or not np.array_equal(data["cols"], accumulator.cols)):
+                raise ValueError(f"Accumulator in {file_path} was built over another graph.")
+            accumulator.counts = data["counts"].astype(np.int64)
+            accumulator.num_solutions = int(data["num_solutions"])
+        return accumulator
+
+    def _pair_position(self, i: int, j: int) -> Optional[int]:
+        if i > j:
+            i, j = j, i
+        start, end = self._indptr[i], self._indptr[i + 1]
+        k = start + int(np.searchsorted(self.cols[start:end], j))
+        return k if k < end and self.cols[k] == j else None
+
+    def count(self, area_a: Any, area_b: Any) -> int:
+        """
+        Returns how many solutions put two areas (by identifier) in the same region.
+
+        Raises:
+            KeyError: If the pair is farther apart than max_distance and so is not tracked.
+        """
+        i, j = self.graph.index_of(area_a), self.graph.index_of(area_b)
+        if i == j:
+            return self.num_solutions
+        k = self._pair_position(i, j)
+        if k is None:
+            raise KeyError((area_a, area_b))
+        return int(self.counts[k])
+
+    def to_sparse(self, frequencies: bool = False) -> sp.csr_matrix:
+        """
+        Returns the symmetric area x area matrix of co-assignment counts over dense
+        indices (zero on the diagonal and for untracked pairs).
+
+        Parameters:
+            frequencies (bool): If True, divide the counts by the number of solutions.
+        """
+        n = self.graph.num_nodes
+        values = self.counts / max(self.num_solutions, 1) if frequencies else self.counts
+        upper = sp.csr_matrix((values, self.cols, self._indptr), shape=(n, n))
+        return (upper + upper.T).tocsr()
+
+    def to_dict(self, frequencies: bool = False) -> Dict[tuple, float]:
+        """Returns the nonzero counts (or frequencies) keyed by pairs of area identifiers."""
+        nonzero = np.flatnonzero(self.counts)
+        rows = self.graph.ids_of(self.rows[nonzero])
+        cols = self.graph.ids_of(self.cols[nonzero])
+        values = self.counts[nonzero]
+        if frequencies:
+            values = values / max(self.num_solutions, 1)
+        return dict(zip(zip(rows, cols), values.tolist()))
+
+
+def merge_accumulator_shards(accumulator_paths: Iterable[str],
+                             graph: CSRGraph) -> CoAssignmentAccumulator:
+    """
+    Combines the accumulators saved by the hosts of a sharded run into one. Its counts are
+    those a single host would have accumulated over the whole ensemble.
+
+    Parameters:
+        accumulator_paths (Iterable[str]): Files written by CoAssignmentAccumulator.save().
+        graph (CSRGraph): The graph the ensemble was generated on.
+
+    Returns:
+        CoAssignmentAccumulator: The merged accumulator.
+
+    Raises:
+        ValueError: If no paths are given, or the files were built over another graph or
+            with different distances.
+    """
+    merged = None
+    for path in accumulator_paths:
+        part = CoAssignmentAccumulator.load(path, graph)
+        merged = part if merged is None else merged.merge(part)
+    if merged is None:
+        logger.error("No accumulator files to merge.")
+        raise ValueError("No accumulator files to merge.")
+    logger.info(f"Merged accumulators over {merged.num_solutions} solutions.")
+    return merged
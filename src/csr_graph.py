@@ -0,0 +1,530 @@
+"""
+csr_graph.py
+
+This module provides a compressed sparse row (CSR) graph representation for the
+P-Regionalization through Recursive Partitioning (PRRP) algorithm.
+
+A CSRGraph stores an undirected graph as two NumPy arrays:
+    - indptr: offsets into `indices`, one entry per node plus a trailing total.
+    - indices: the concatenated neighbor lists, addressed by dense node index.
+
+Nodes are addressed internally by dense indices 0..n-1, and the caller's original
+node identifiers are kept alongside so results can be mapped back. Dictionary
+adjacency lists (node -> neighbors) are accepted through CSRGraph.from_adjacency,
+which is the only place the dict form is needed.
+"""
+
+import logging
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+logger = logging.getLogger(__name__)
+
+# Largest number of neighbor entries that int32 offsets can address.
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _offset_dtype(nnz: int) -> np.dtype:
+    """
+    Returns the narrowest offset dtype able to address nnz neighbor entries.
+    """
+    return np.dtype(np.int32) if nnz <= _INT32_MAX else np.dtype(np.int64)
+
+
+def _contiguous_offset(node_ids: List[Any]) -> Optional[int]:
+    """
+    Returns k if node_ids is exactly [k, k + 1, ..., k + n - 1] of plain ints, else None.
+    """
+    if not node_ids:
+        return 0
+    first = node_ids[0]
+    if type(first) is not int:
+        return None
+    for position, node_id in enumerate(node_ids):
+        if type(node_id) is not int or node_id != first + position:
+            return None
+    return first
+
+
+def _identifier_array(node_ids: List[Any]) -> np.ndarray:
+    """
+    Stores identifiers compactly: all-int as int64, all-str as fixed-width unicode,
+    anything else (tuples, mixed types) as an object array.
+    """
+    kinds = {type(node_id) for node_id in node_ids}
+    if kinds == {int}:
+        return np.asarray(node_ids, dtype=np.int64)
+    if kinds == {str}:
+        return np.asarray(node_ids, dtype=str)
+    array = np.empty(len(node_ids), dtype=object)
+    array[:] = node_ids
+    return array
+
+
+class CSRGraph:
+    """
+    An immutable undirected graph stored in compressed sparse row form.
+
+    The neighbors of dense node i are indices[indptr[i]:indptr[i + 1]]. Node identifiers
+    are either an integer range (stored as a single offset) or an explicit array, in
+    which case a lookup table from identifier to dense index is built on first use.
+    """
+
+    __slots__ = ("indptr", "indices", "node_ids", "_id_offset", "_id_to_index")
+
+    def __init__(self, indptr: Any, indices: Any, node_ids: Optional[Iterable[Any]] = None):
+        indptr = np.asarray(indptr)
+        indices = np.asarray(indices)
+        if indptr.ndim != 1 or indptr.size == 0:
+            raise ValueError("indptr must be a non-empty one-dimensional array.")
+        if indices.ndim != 1:
+            raise ValueError("indices must be a one-dimensional array.")
+        if int(indptr[0]) != 0 or int(indptr[-1]) != indices.size:
+            raise ValueError(
+                "indptr must start at 0 and end at the number of neighbor entries.")
+
+        num_nodes = indptr.size - 1
+        self.indptr = indptr.astype(_offset_dtype(indices.size), copy=False)
+        self.indices = indices.astype(np.int32, copy=False)
+        self._id_to_index = None
+
+        if node_ids is None:
+            self.node_ids = None
+            self._id_offset = 0
+            return
+
+        if isinstance(node_ids, range) and node_ids.step == 1:
+            offset = node_ids.start
+            node_ids = None if len(node_ids) == num_nodes else node_ids
+        elif not isinstance(node_ids, np.ndarray):
+            node_ids = list(node_ids)
+            offset = _contiguous_offset(node_ids)
+            if offset is not None:
+                node_ids = None
+            else:
+                node_ids = _identifier_array(node_ids)
+        else:
+            offset = None
+
+        if node_ids is not None and len(node_ids) != num_nodes:
+            raise ValueError(
+                f"Expected {num_nodes} node identifiers, got {len(node_ids)}.")
+        self.node_ids = node_ids
+        self._id_offset = offset
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_adjacency(cls, adj_list: Dict[Any, Iterable[Any]]) -> "CSRGraph":
+        """
+        Builds a CSRGraph from a dictionary adjacency list (node -> iterable of neighbors).
+
+        Node order follows the dictionary's iteration order.
+
+        Parameters:
+            adj_list (Dict[Any, Iterable[Any]]): The adjacency list to convert.
+
+        Returns:
+            CSRGraph: The equivalent CSR graph.
+
+        Raises:
+            KeyError: If a neighbor is not itself a key of adj_list.
+        """
+        node_ids = list(adj_list.keys())
+        num_nodes = len(node_ids)
+        counts = np.fromiter((len(nbrs) for nbrs in adj_list.values()),
+                             dtype=np.int64, count=num_nodes)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        nnz = int(indptr[-1])
+        flat = chain.from_iterable(adj_list.values())
+
+        offset = _contiguous_offset(node_ids)
+        if offset is not None:
+            indices = np.fromiter(flat, dtype=np.int64, count=nnz) - offset
+            out_of_range = (indices < 0) | (indices >= num_nodes)
+            if out_of_range.any():
+                bad = int(indices[np.argmax(out_of_range)]) + offset
+                raise KeyError(f"Neighbor {bad} is not a node of the graph.")
+        else:
+            lookup = {node_id: i for i, node_id in enumerate(node_ids)}
+            try:
+                indices = np.fromiter((lookup[nbr] for nbr in flat),
+                                      dtype=np.int64, count=nnz)
+            except KeyError as e:
+                raise KeyError(
+                    f"Neighbor {e.args[0]!r} is not a node of the graph.") from None
+
+        return cls(indptr, indices, node_ids)
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, sources: Any, targets: Any,
+                   node_ids: Optional[Iterable[Any]] = None) -> "CSRGraph":
+        """
+        Builds a CSRGraph from arrays of undirected edges given by dense endpoints.
+
+        Each edge (sources[k], targets[k]) should appear once; it is stored in both
+        directions. Neighbor lists come out sorted by dense index.
+
+        Parameters:
+            num_nodes (int): Number of nodes.
+            sources (array-like): Dense index of one endpoint of every edge.
+            targets (array-like): Dense index of the other endpoint of every edge.
+            node_ids (Iterable, optional): Identifiers of the nodes in dense order.
+
+        Returns:
+            CSRGraph: The CSR graph.
+
+        Raises:
+            ValueError: If an endpoint is outside 0..num_nodes-1.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if sources.shape != targets.shape:
+            raise ValueError("sources and targets must have the same length.")
+        if sources.size and (min(sources.min(), targets.min()) < 0
+                             or max(sources.max(), targets.max()) >= num_nodes):
+            raise ValueError("Edge endpoint outside the node range.")
+        rows = np.concatenate([sources, targets])
+        cols = np.concatenate([targets, sources])
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, cols[order], node_ids)
+
+    def to_adjacency(self) -> Dict[Any, Set[Any]]:
+        """
+        Converts the graph back into a dictionary adjacency list of sets.
+
+        Returns:
+            Dict[Any, Set[Any]]: Mapping from node identifiers to sets of neighbor identifiers.
+        """
+        ids = self.ids_of(np.arange(self.num_nodes))
+        return {ids[i]: set(self.ids_of(self.neighbors(i))) for i in range(self.num_nodes)}
+
+    # ------------------------------------------------------------------
+    # Structure
+    # ------------------------------------------------------------------
+    @property
+    def num_nodes(self) -> int:
+        return self.indptr.size - 1
+
+    @property
+    def num_edges(self) -> int:
+        """Number of undirected edges (each edge is stored in both directions)."""
+        return int(self.indices.size // 2)
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def __repr__(self) -> str:
+        return f"CSRGraph(num_nodes={self.num_nodes}, num_edges={self.num_edges})"
+
+    def degrees(self) -> np.ndarray:
+        """Returns the degree of every node as an array."""
+        return np.diff(self.indptr)
+
+    def degree(self, i: int) -> int:
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Returns a read-only view of the dense neighbor indices of node i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    # ------------------------------------------------------------------
+    # Identifier mapping
+    # ------------------------------------------------------------------
+    @property
+    def id_offset(self) -> Optional[int]:
+        """The first identifier if identifiers are a contiguous integer range, else None."""
+        return self._id_offset
+
+    def _lookup(self) -> Dict[Any, int]:
+        if self._id_to_index is None:
+            self._id_to_index = {node_id: i for i,
+                                 node_id in enumerate(self.node_ids.tolist())}
+        return self._id_to_index
+
+    def index_of(self, node_id: Any) -> int:
+        """
+        Returns the dense index of a node identifier.
+
+        Raises:
+            KeyError: If node_id is not a node of the graph.
+        """
+        if self._id_offset is not None:
+            if isinstance(node_id, (int, np.integer)):
+                i = int(node_id) - self._id_offset
+                if 0 <= i < self.num_nodes:
+                    return i
+            raise KeyError(node_id)
+        return self._lookup()[node_id]
+
+    def indices_of(self, node_ids: Iterable[Any]) -> np.ndarray:
+        """Returns the dense indices of several node identifiers as an int64 array."""
+        return np.fromiter((self.index_of(node_id) for node_id in node_ids), dtype=np.int64)
+
+    def id_of(self, i: int) -> Any:
+        """Returns the original identifier of dense node i."""
+        if self._id_offset is not None:
+            return int(i) + self._id_offset
+        return self.node_ids[i].item() if self.node_ids.dtype != object else self.node_ids[i]
+
+    def ids_of(self, indices: Iterable[int]) -> List[Any]:
+        """Returns the original identifiers of several dense nodes as a list."""
+        indices = np.asarray(
+            indices if isinstance(indices, np.ndarray) else list(indices), dtype=np.int64)
+        if self._id_offset is not None:
+            return (indices + self._id_offset).tolist()
+        return self.node_ids[indices].tolist()
+
+
+def as_csr_graph(G: Any) -> CSRGraph:
+    """
+    Returns G as a CSRGraph, converting dictionary adjacency lists on the way in.
+
+    Parameters:
+        G (CSRGraph or dict): The input graph.
+
+    Returns:
+        CSRGraph: G itself if it is already a CSRGraph, otherwise its CSR conversion.
+
+    Raises:
+        TypeError: If G is neither a CSRGraph nor a dictionary.
+    """
+    if isinstance(G, CSRGraph):
+        return G
+    if isinstance(G, dict):
+        return CSRGraph.from_adjacency(G)
+    logger.error("Unsupported graph type. Expected CSRGraph or dict.")
+    raise TypeError("Unsupported graph type. Expected CSRGraph or dict.")
+
+
+def articulation_points(graph: CSRGraph, nodes: Optional[Iterable[int]] = None) -> Set[int]:
+    """
+    Computes articulation points with an iterative Tarjan traversal in O(V + E) time.
+
+    If nodes is given, the articulation points of the subgraph induced by those dense
+    nodes are returned instead, and the cost is proportional to the subgraph's size.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        nodes (Iterable[int], optional): Dense nodes of the induced subgraph to analyse.
+
+    Returns:
+        Set[int]: Dense indices of the articulation points.
+    """
+    if nodes is None:
+        inside = None
+        roots: Iterable[int] = range(graph.num_nodes)
+    else:
+        inside = nodes if isinstance(nodes, (set, frozenset)) else set(nodes)
+        roots = inside
+
+    indptr, indices = graph.indptr, graph.indices
+
+    def neighbors_of(u: int) -> List[int]:
+        nbrs = indices[indptr[u]:indptr[u + 1]].tolist()
+        if inside is None:
+            return nbrs
+        return [v for v in nbrs if v in inside]
+
+    disc: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    ap: Set[int] = set()
+    timer = 0
+
+    for root in roots:
+        if root in disc:
+            continue
+        disc[root] = low[root] = timer
+        timer += 1
+        root_children = 0
+        stack = [(root, -1, iter(neighbors_of(root)))]
+
+        while stack:
+            u, parent, nbr_iter = stack[-1]
+            descended = False
+            for v in nbr_iter:
+                if v not in disc:
+                    disc[v] = low[v] = timer
+                    timer += 1
+                    stack.append((v, u, iter(neighbors_of(v))))
+                    descended = True
+                    break
+                if v != parent and disc[v] < low[u]:
+                    low[u] = disc[v]
+            if descended:
+                continue
+
+            stack.pop()
+            if not stack:
+                break
+            w = stack[-1][0]
+            if low[u] < low[w]:
+                low[w] = low[u]
+            if w == root:
+                root_children += 1
+            elif low[u] >= disc[w]:
+                ap.add(w)
+
+        if root_children > 1:
+            ap.add(root)
+
+    return ap
+
+
+def induced_components(graph: CSRGraph, nodes: Iterable[int]) -> List[Set[int]]:
+    """
+    Finds the connected components of the subgraph induced by a set of dense nodes.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        nodes (Iterable[int]): Dense nodes of the induced subgraph.
+
+    Returns:
+        List[Set[int]]: Connected components, each a set of dense indices.
+    """
+    inside = nodes if isinstance(nodes, (set, frozenset)) else set(nodes)
+    indptr, indices = graph.indptr, graph.indices
+    visited: Set[int] = set()
+    components: List[Set[int]] = []
+
+    for start in inside:
+        if start in visited:
+            continue
+        visited.add(start)
+        component = {start}
+        stack = [start]
+        while stack:
+            u = stack.pop()
+            for v in indices[indptr[u]:indptr[u + 1]].tolist():
+                if v in inside and v not in visited:
+                    visited.add(v)
+                    component.add(v)
+                    stack.append(v)
+        components.append(component)
+
+    return components
+
+
+def gather_neighbors(graph: CSRGraph, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collects the neighbor lists of several dense nodes in one vectorized step.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        nodes (np.ndarray): Dense node indices.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (sources, neighbors), where neighbors[k] is a neighbor
+            of nodes[sources[k]]. Neighbor lists appear in the order of nodes.
+    """
+    nodes = np.asarray(nodes, dtype=np.int64)
+    starts = graph.indptr[nodes].astype(np.int64)
+    degrees = graph.indptr[nodes + 1] - starts
+    sources = np.repeat(np.arange(nodes.size), degrees)
+    offsets = np.arange(sources.size) + np.repeat(starts - (np.cumsum(degrees) - degrees), degrees)
+    return sources, graph.indices[offsets]
+
+
+def component_labels(graph: CSRGraph, nodes: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Labels the connected components of the subgraph induced by a sorted array of dense
+    nodes. Only the edges of those nodes are touched, so the cost depends on the size of
+    the subgraph and not on the size of the graph.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        nodes (np.ndarray): Sorted, unique dense node indices.
+
+    Returns:
+        Tuple[int, np.ndarray]: The number of components, and the component of every entry
+            of nodes.
+    """
+    k = len(nodes)
+    if k == 0:
+        return 0, np.zeros(0, dtype=np.int32)
+    sources, neighbors = gather_neighbors(graph, nodes)
+    positions = np.minimum(np.searchsorted(nodes, neighbors), k - 1)
+    inside = nodes[positions] == neighbors
+    # Sources are already grouped by row, so the induced CSR structure is built directly.
+    indptr = np.zeros(k + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources[inside], minlength=k), out=indptr[1:])
+    targets = positions[inside].astype(np.int32)
+    adjacency = sp.csr_matrix((np.ones(targets.size), targets, indptr), shape=(k, k))
+    return connected_components(adjacency, directed=False)
+
+
+def biconnected_blocks(graph: CSRGraph, nodes: Iterable[int]) -> List[Set[int]]:
+    """
+    Computes the biconnected blocks of the subgraph induced by a set of dense nodes.
+
+    Uses the vertex-stack form of the Hopcroft–Tarjan algorithm, iteratively. Every edge
+    of the induced subgraph belongs to exactly one block; a node lying in two or more
+    blocks is an articulation point. Nodes without induced neighbors belong to no block.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        nodes (Iterable[int]): Dense nodes of the induced subgraph.
+
+    Returns:
+        List[Set[int]]: The blocks, each a set of dense indices.
+    """
+    inside = nodes if isinstance(nodes, (set, frozenset)) else set(nodes)
+    indptr, indices = graph.indptr, graph.indices
+
+    def neighbors_of(u: int) -> List[int]:
+        return [v for v in indices[indptr[u]:indptr[u + 1]].tolist() if v in inside]
+
+    disc: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    blocks: List[Set[int]] = []
+    timer = 0
+
+    for root in inside:
+        if root in disc:
+            continue
+        disc[root] = low[root] = timer
+        timer += 1
+        stack = [(root, -1, iter(neighbors_of(root)))]
+        vertex_stack = [root]
+
+        while stack:
+            u, parent, nbr_iter = stack[-1]
+            descended = False
+            for v in nbr_iter:
+                if v not in disc:
+                    disc[v] = low[v] = timer
+                    timer += 1
+                    stack.append((v, u, iter(neighbors_of(v))))
+                    vertex_stack.append(v)
+                    descended = True
+                    break
+                if v != parent and disc[v] < low[u]:
+                    low[u] = disc[v]
+            if descended:
+                continue
+
+            stack.pop()
+            if not stack:
+                break
+            w = stack[-1][0]
+            if low[u] < low[w]:
+                low[w] = low[u]
+            if low[u] >= disc[w]:
+                # w separates the subtree rooted at u: pop it off as one block.
+                block = {w}
+                while True:
+                    x = vertex_stack.pop()
+                    block.add(x)
+                    if x == u:
+                        break
+                blocks.append(block)
+
+    return blocks
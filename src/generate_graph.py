@@ -109,5 +109,9 @@ if __name__ == "__main__":
         num_nodes=1000000, avg_degree=5, graph_type="mixed")
     save_graph_to_metis(graph, "data/sample/synthetic_large_graph_1000k.graph")
 
+    # Also write the binary graph file that the benchmarks memory-map instead of re-parsing.
+    from src.graph_store import load_or_convert_metis
+    load_or_convert_metis("data/sample/synthetic_large_graph_1000k.graph")
+
     print(
         f"Graph generation completed in {time.time() - start_time:.2f} seconds.")
@@ -0,0 +1,180 @@
+"""
+graph_overlay.py
+
+This module provides a delta layer over an immutable CSRGraph.
+
+Connectivity repairs in graph PRRP, and articulation-area reassignment in utils, change a
+few edges of a graph that may have millions of nodes. Writing those changes into the input
+would corrupt a graph that other runs, or other threads, are still reading, and copying
+the whole graph before every run costs far more than the run's own changes. A GraphOverlay
+records the added and removed edges next to its base graph instead. The base is never
+modified, so one loaded graph can back any number of overlays. An overlay can be read
+like a graph (neighbors, has_edge, components) or materialized when a standalone graph
+is needed.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+
+logger = logging.getLogger(__name__)
+
+
+class GraphOverlay:
+    """
+    Virtual edge additions and removals over an immutable CSRGraph.
+
+    Nodes are the dense indices of the base graph. Only the changed adjacency is stored,
+    so the memory used grows with the number of changes, not with the graph.
+    """
+
+    def __init__(self, base: CSRGraph):
+        """
+        Parameters:
+            base (CSRGraph): The graph the overlay is laid over. It is never modified.
+        """
+        self.base = base
+        self._added: Dict[int, Set[int]] = {}
+        self._removed: Dict[int, Set[int]] = {}
+
+    def __repr__(self) -> str:
+        return (f"GraphOverlay({self.base!r}, added={len(self.added_edges())}, "
+                f"removed={len(self.removed_edges())})")
+
+    @property
+    def num_nodes(self) -> int:
+        return self.base.num_nodes
+
+    def __len__(self) -> int:
+        return self.base.num_nodes
+
+    def _in_base(self, u: int, v: int) -> bool:
+        return bool((self.base.neighbors(u) == v).any())
+
+    # ------------------------------------------------------------------
+    # Changes
+    # ------------------------------------------------------------------
+    def add_edge(self, u: int, v: int) -> None:
+        """
+        Adds the undirected edge (u, v). Re-adding a removed base edge restores it.
+
+        Raises:
+            ValueError: If u == v.
+        """
+        if u == v:
+            raise ValueError(f"Cannot add a self-loop at node {u}.")
+        if v in self._removed.get(u, ()):
+            self._removed[u].discard(v)
+            self._removed[v].discard(u)
+        elif not self._in_base(u, v):
+            self._added.setdefault(u, set()).add(v)
+            self._added.setdefault(v, set()).add(u)
+
+    def remove_edge(self, u: int, v: int) -> None:
+        """Removes the undirected edge (u, v) if present, whether it is virtual or in the base."""
+        if v in self._added.get(u, ()):
+            self._added[u].discard(v)
+            self._added[v].discard(u)
+        elif self._in_base(u, v):
+            self._removed.setdefault(u, set()).add(v)
+            self._removed.setdefault(v, set()).add(u)
+
+    def isolate(self, u: int) -> List[int]:
+        """Removes every edge of node u and returns its former neighbors."""
+        neighbors = self.neighbors(u)
+        for v in neighbors:
+            self.remove_edge(u, v)
+        return neighbors
+
+    def clear(self) -> None:
+        """Discards every change, leaving the overlay equal to its base."""
+        self._added.clear()
+        self._removed.clear()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def neighbors(self, u: int) -> List[int]:
+        """Returns the dense neighbors of u with the overlay's changes applied."""
+        neighbors = self.base.neighbors(u).tolist()
+        removed = self._removed.get(u)
+        if removed:
+            neighbors = [v for v in neighbors if v not in removed]
+        added = self._added.get(u)
+        if added:
+            neighbors.extend(sorted(added))
+        return neighbors
+
+    def degree(self, u: int) -> int:
+        return (self.base.degree(u) - len(self._removed.get(u, ()))
+                + len(self._added.get(u, ())))
+
+    def has_edge(self, u: int, v: int) -> bool:
+        if v in self._added.get(u, ()):
+            return True
+        return v not in self._removed.get(u, ()) and self._in_base(u, v)
+
+    def has_changes(self) -> bool:
+        """True if the overlay differs from its base graph."""
+        return any(self._added.values()) or any(self._removed.values())
+
+    def added_edges(self) -> List[Tuple[int, int]]:
+        """Returns the virtual edges as sorted (u, v) pairs with u < v."""
+        return sorted((u, v) for u, nbrs in self._added.items() for v in nbrs if u < v)
+
+    def removed_edges(self) -> List[Tuple[int, int]]:
+        """Returns the removed base edges as sorted (u, v) pairs with u < v."""
+        return sorted((u, v) for u, nbrs in self._removed.items() for v in nbrs if u < v)
+
+    def components(self, nodes: Optional[Iterable[int]] = None) -> List[Set[int]]:
+        """
+        Finds the connected components of the overlay graph, or of the subgraph it induces
+        on the given dense nodes.
+        """
+        inside = None if nodes is None else set(nodes)
+        roots = range(self.num_nodes) if inside is None else inside
+        visited: Set[int] = set()
+        components: List[Set[int]] = []
+        for root in roots:
+            if root in visited:
+                continue
+            visited.add(root)
+            component = {root}
+            stack = [root]
+            while stack:
+                for v in self.neighbors(stack.pop()):
+                    if v not in visited and (inside is None or v in inside):
+                        visited.add(v)
+                        component.add(v)
+                        stack.append(v)
+            components.append(component)
+        return components
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+    def materialize(self) -> CSRGraph:
+        """Returns a new CSRGraph with the overlay's changes applied, keeping the base's identifiers."""
+        base = self.base
+        rows = np.repeat(np.arange(base.num_nodes, dtype=np.int64), base.degrees())
+        cols = base.indices.astype(np.int64)
+        keep = rows < cols
+        removed = self.removed_edges()
+        if removed:
+            dropped = np.array([u * base.num_nodes + v for u, v in removed], dtype=np.int64)
+            keep &= ~np.isin(rows * base.num_nodes + cols, dropped)
+        added = np.array(self.added_edges(), dtype=np.int64).reshape(-1, 2)
+        sources = np.concatenate([rows[keep], added[:, 0]])
+        targets = np.concatenate([cols[keep], added[:, 1]])
+        node_ids = None if base.node_ids is None and base.id_offset == 0 \
+            else base.ids_of(np.arange(base.num_nodes))
+        return CSRGraph.from_edges(base.num_nodes, sources, targets, node_ids)
+
+    def to_adjacency(self) -> Dict[Any, Set[Any]]:
+        """Returns the overlay graph as a dictionary adjacency list keyed by node identifiers."""
+        base = self.base
+        ids = base.ids_of(np.arange(base.num_nodes))
+        return {ids[u]: {ids[v] for v in self.neighbors(u)} for u in range(base.num_nodes)}
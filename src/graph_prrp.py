@@ -4,138 +4,190 @@ Graph-Based PRRP Implementation
 This module implements a graph partitioning algorithm using the principles of
 P-Regionalization through Recursive Partitioning (PRRP). It ensures:
     - Connectivity preservation via articulation point checks (using Tarjan’s Algorithm helpers).
-    - Efficient handling of graphs through an adjacency list (via construct_adjacency_list).
+    - Efficient handling of graphs through a compressed sparse row graph (CSRGraph).
     - Recursive partitioning with growth, merging of disconnected areas, and splitting of oversized partitions.
-    
-The graph input is expected to be provided in METIS format (parsed via metis_parser.py)
-or already as an adjacency list. This implementation leverages utilities from utils.py.
+
+The graph input is expected to be provided in METIS format (parsed via metis_parser.py),
+as a CSRGraph, or as an adjacency list. Adjacency lists are converted to a CSRGraph once
+on entry, and every phase then works on dense node indices. This implementation leverages
+utilities from utils.py and csr_graph.py.
+
+The input graph is never modified, so one loaded graph can be shared by concurrent runs.
+Connectivity-repair edges are recorded in a GraphOverlay (graph_overlay.py) when one is
+passed in place of the graph.
 """
 
 import logging
 import random
 import heapq
-from collections import deque
-from typing import Dict, Set, List
-
-# Import required functions from utils.
-from src.utils import (
-    construct_adjacency_list,
-    find_articulation_points,
-    random_seed_selection,
-    find_connected_components,
-    find_boundary_areas,
-    DisjointSetUnion,  # For union-find operations
-    # is_articulation_point is no longer needed in grow_partition now
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.csr_graph import (
+    CSRGraph,
+    as_csr_graph,
+    articulation_points,
+    gather_neighbors,
+    induced_components,
 )
+from src.graph_overlay import GraphOverlay
+from src.instrumentation import count
+from src.seed_index import GaplessSeedIndex
+from src.solution import UNASSIGNED
+from src.split_engine import peel_boundary
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
+# Accepted values of run_graph_prrp's leftover_policy.
+LEFTOVER_POLICIES = ("most_shared", "smallest")
 
-def run_graph_prrp(G: Dict, p: int, C: int, MR: int, MS: int) -> Dict[int, Set]:
+
+def _as_graph(G: Any) -> CSRGraph:
+    """
+    Returns the CSRGraph to partition: G itself, a conversion, or for an overlay its base,
+    materialized with the overlay's changes if it has any. Dense indices are the same in all
+    three, so repairs can be recorded back into the overlay.
+    """
+    if isinstance(G, GraphOverlay):
+        return G.materialize() if G.has_changes() else G.base
+    return as_csr_graph(G)
+
+
+def _is_dense(G: Any) -> bool:
+    """True if node sets passed with G are dense indices (CSRGraph and overlay inputs)."""
+    return isinstance(G, (CSRGraph, GraphOverlay))
+
+
+def _to_dense(graph: CSRGraph, G: Any, nodes: Iterable) -> Set[int]:
+    """Maps caller node identifiers to dense indices (identity for dense inputs)."""
+    if _is_dense(G):
+        return set(nodes)
+    return set(graph.indices_of(nodes).tolist())
+
+
+def _from_dense(graph: CSRGraph, G: Any, nodes: Iterable[int]) -> Set:
+    """Maps dense indices back to caller node identifiers (identity for dense inputs)."""
+    if _is_dense(G):
+        return set(nodes)
+    return set(graph.ids_of(nodes))
+
+
+def _record_repair_edges(G: Any, repair_edges: List[Tuple[int, int]]) -> None:
+    """
+    Records connectivity-repair edges in G if it is a GraphOverlay. The input graph itself
+    is never modified, so other inputs only see the repairs in the debug log.
+    """
+    if isinstance(G, GraphOverlay):
+        for u, v in repair_edges:
+            G.add_edge(u, v)
+    elif repair_edges:
+        logger.debug("%d repair edges not recorded; pass a GraphOverlay to keep them.",
+                     len(repair_edges))
+
+
+def run_graph_prrp(G: Any, p: int, C: int, MR: int, MS: int,
+                   precomputed_ap: Optional[Set[int]] = None,
+                   leftover_policy: str = "most_shared") -> Dict[int, Set]:
     """
     Main PRRP function to partition a graph.
 
     Parameters:
-        G (Dict): Input graph as an adjacency list (node -> neighbors).
+        G (CSRGraph, GraphOverlay or Dict): Input graph as a CSRGraph or an adjacency list
+            (node -> neighbors). A GraphOverlay is partitioned on its base graph with the
+            overlay's changes applied, and receives the connectivity-repair edges; G is
+            otherwise left unchanged.
         p (int): Desired number of partitions.
         C (int): Target partition cardinality (ideal number of nodes per partition).
         MR (int): Maximum number of retries for growing a partition.
         MS (int): Maximum allowed partition size before splitting.
+        precomputed_ap (Set[int], optional): Articulation points of G as dense indices, when the
+            caller partitions the same graph repeatedly. Computed here if omitted.
+        leftover_policy (str): How nodes left over after growth pick among adjacent
+            partitions: "most_shared" (most edges to the node) or "smallest" (fewest nodes).
+            See _assign_leftovers.
 
     Returns:
-        Dict[int, Set]: Mapping of partition IDs to sets of nodes.
+        Dict[int, Set]: Mapping of partition IDs to sets of node identifiers.
+
+    Raises:
+        ValueError: If the graph is too small for p or C, or leftover_policy is unknown.
     """
-    # Build or convert the graph into an efficient adjacency list.
-    G_adj = construct_adjacency_list(G)
-    all_nodes = set(G_adj.keys())
+    if leftover_policy not in LEFTOVER_POLICIES:
+        logger.error("Unknown leftover policy %r.", leftover_policy)
+        raise ValueError(f"Unknown leftover policy {leftover_policy!r}; "
+                         f"expected one of {', '.join(LEFTOVER_POLICIES)}.")
+
+    # Build the CSR graph once; every phase below works on dense indices.
+    graph = _as_graph(G)
+    num_nodes = graph.num_nodes
 
-    if len(all_nodes) < p:
+    if num_nodes < p:
         logger.error(
             "Number of nodes is less than the number of desired partitions.")
         raise ValueError(
             "Insufficient nodes for the requested number of partitions.")
 
-    if C > len(all_nodes):
+    if C > num_nodes:
         logger.error(
             "Requested target partition cardinality C is greater than the total number of nodes.")
         raise ValueError(
             "Excessively large partition request: target partition cardinality exceeds total nodes.")
 
-    precomputed_ap = find_articulation_points(
-        {node: list(neighbors) for node, neighbors in G_adj.items()})
-
-    partitions = {}
+    if precomputed_ap is None:
+        precomputed_ap = articulation_points(graph)
+    # Assigned-neighbor counts are kept up to date as nodes are taken and released,
+    # so each seed pick costs O(degree) instead of a rescan of every node.
+    seed_index = GaplessSeedIndex(graph)
+
+    partitions: Dict[int, Set[int]] = {}
+    # Partition ID of every dense node, or UNASSIGNED. Growth writes it as nodes are taken,
+    # and it answers every "is this node assigned" and "which partition" query.
+    labels = np.full(num_nodes, UNASSIGNED, dtype=np.int32)
+    repair_edges: List[Tuple[int, int]] = []
     partition_id = 1
-    unassigned = set(all_nodes)
-
-    while unassigned and partition_id <= p:
-        assigned_nodes = set().union(*partitions.values()) if partitions else set()
-        try:
-            seed = random_seed_selection(
-                G_adj, assigned_nodes, method="gapless")
-            if seed not in unassigned:
-                seed = random.choice(list(unassigned))
-        except ValueError:
-            seed = random.choice(list(unassigned))
-
-        grown_partition = grow_partition(
-            G_adj, unassigned, partition_id, C, MR, precomputed_ap)
-        logger.info(
-            f"Grew partition {partition_id} with {len(grown_partition)} nodes.")
-
-        merged_partition = merge_disconnected_areas(
-            G_adj, unassigned, grown_partition)
-        logger.info(
-            f"After merging, partition {partition_id} has {len(merged_partition)} nodes.")
+
+    while len(seed_index) and partition_id <= p:
+        grown_partition = _grow_partition(
+            graph, labels, partition_id, C, MR, precomputed_ap, seed_index)
+        logger.debug("Grew partition %d with %d nodes.", partition_id, len(grown_partition))
+
+        merged_partition = _merge_disconnected_areas(
+            graph, grown_partition, repair_edges)
+        logger.debug("After merging, partition %d has %d nodes.",
+                     partition_id, len(merged_partition))
 
         dropped_nodes = grown_partition - merged_partition
         if dropped_nodes:
-            logger.info(
-                f"Returning {len(dropped_nodes)} dropped nodes to unassigned.")
-            unassigned |= dropped_nodes
+            count("graph.dropped_nodes", len(dropped_nodes))
+            labels[list(dropped_nodes)] = UNASSIGNED
+            for node in dropped_nodes:
+                seed_index.release(node)
 
         if len(merged_partition) > MS:
-            logger.info(
-                f"Partition {partition_id} exceeds maximum size {MS}. Splitting...")
-            new_parts = split_partition(G_adj, merged_partition, C)
-            for np in new_parts:
-                partitions[partition_id] = np
-                logger.info(
-                    f"Created partition {partition_id} with {len(np)} nodes after splitting.")
+            count("graph.splits")
+            new_parts = _split_partition(graph, merged_partition, C)
+            for part in new_parts:
+                partitions[partition_id] = part
+                labels[list(part)] = partition_id
+                logger.debug("Created partition %d with %d nodes after splitting.",
+                             partition_id, len(part))
                 partition_id += 1
         else:
             partitions[partition_id] = merged_partition
             partition_id += 1
 
-        unassigned -= merged_partition
-
-    # Final assignment: Instead of using sum() and any() repeatedly, we compute the candidate score incrementally.
-    while unassigned:
-        node = unassigned.pop()
-        best_pid = None
-        best_score = -1
-        for pid, part in partitions.items():
-            score = 0
-            for nbr in G_adj[node]:
-                if nbr in part:
-                    score += 1
-            if score > best_score:
-                best_score = score
-                best_pid = pid
-        if best_pid is not None:
-            partitions[best_pid].add(node)
-        else:
-            smallest_pid = min(partitions.items(),
-                               key=lambda item: len(item[1]))[0]
-            partitions[smallest_pid].add(node)
+    # Final assignment of the nodes no partition grew over.
+    if len(seed_index):
+        if not partitions:
+            partitions[1] = set()
+        _assign_leftovers(graph, labels, partitions, leftover_policy)
 
     for pid, part in partitions.items():
-        induced = {n: list(G_adj[n] & part) for n in part}
-        comps = find_connected_components(induced)
+        comps = induced_components(graph, part)
         if len(comps) > 1:
             def is_isolated_component(comp):
-                return all(len(G_adj[n] & part) == 0 for n in comp)
+                return all(not (labels[graph.neighbors(n)] == pid).any() for n in comp)
             non_isolated = [
                 comp for comp in comps if not is_isolated_component(comp)]
             main_comp = max(
@@ -145,25 +197,88 @@ def run_graph_prrp(G: Dict, p: int, C: int, MR: int, MS: int) -> Dict[int, Set]:
                 if comp is main_comp:
                     continue
                 for node in comp:
-                    if main_node not in G_adj[node]:
-                        G_adj[node].add(main_node)
-                    if node not in G_adj[main_node]:
-                        G_adj[main_node].add(node)
+                    repair_edges.append((node, main_node))
 
-    return partitions
+    _record_repair_edges(G, repair_edges)
+
+    return {pid: set(graph.ids_of(part)) for pid, part in partitions.items()}
 
 
-def grow_partition(G: Dict, U: Set, p: int, c: int, MR: int, precomputed_ap: Set = None) -> Set:
+def _assign_leftovers(graph: CSRGraph,
+                      labels: np.ndarray,
+                      partitions: Dict[int, Set[int]],
+                      policy: str) -> None:
+    """
+    Assigns every UNASSIGNED node to a partition with a multi-source breadth-first search
+    seeded by all partitions at once, updating labels and partitions in place.
+
+    The search advances one level at a time over the CSR arrays. Each level consists of the
+    leftover nodes adjacent to an assigned node, and each such node joins one of the
+    partitions it touches, chosen by policy:
+        - "most_shared": the partition it shares the most edges with.
+        - "smallest": the partition with the fewest nodes at the start of the level.
+    Ties go to the lowest partition ID. Every leftover node is gathered at most twice,
+    so the pass is linear in the leftover nodes' edges whatever the number of partitions.
+    Nodes with no path to any partition join the smallest partition.
+    """
+    sizes = np.bincount(labels[labels != UNASSIGNED], minlength=max(partitions) + 1)
+    leftover = np.flatnonzero(labels == UNASSIGNED)
+    sources, neighbors = gather_neighbors(graph, leftover)
+    frontier = np.unique(leftover[sources[labels[neighbors] != UNASSIGNED]])
+    levels = 0
+
+    while frontier.size:
+        sources, neighbors = gather_neighbors(graph, frontier)
+        candidates = labels[neighbors]
+        touching = candidates != UNASSIGNED
+        sources, candidates = sources[touching], candidates[touching]
+        if policy == "most_shared":
+            pairs, shared = np.unique(np.stack([sources, candidates]), axis=1, return_counts=True)
+            sources, candidates = pairs
+            order = np.lexsort((candidates, -shared, sources))
+        else:
+            order = np.lexsort((candidates, sizes[candidates], sources))
+        sources, candidates = sources[order], candidates[order]
+        first = np.ones(sources.size, dtype=bool)
+        first[1:] = sources[1:] != sources[:-1]
+        chosen = candidates[first]
+
+        labels[frontier] = chosen
+        sizes += np.bincount(chosen, minlength=sizes.size)
+        levels += 1
+
+        _, neighbors = gather_neighbors(graph, frontier)
+        frontier = np.unique(neighbors[labels[neighbors] == UNASSIGNED])
+
+    unreachable = labels[leftover] == UNASSIGNED
+    if unreachable.any():
+        labels[leftover[unreachable]] = min(partitions, key=lambda pid: (sizes[pid], pid))
+
+    assigned = labels[leftover]
+    order = np.argsort(assigned, kind="stable")
+    pids, starts = np.unique(assigned[order], return_index=True)
+    for pid, group in zip(pids.tolist(), np.split(leftover[order], starts[1:])):
+        partitions[pid].update(group.tolist())
+    count("graph.leftover_nodes", leftover.size)
+    logger.debug("Assigned %d leftover nodes in %d search levels (%s policy); "
+                 "%d had no path to a partition.",
+                 leftover.size, levels, policy, int(unreachable.sum()))
+
+
+def grow_partition(G: Any, U: Set, p: int, c: int, MR: int, precomputed_ap: Set = None) -> Set:
     """
     Grows a partition by expanding from a seed until reaching the target cardinality.
     Uses a heap-based priority queue for expansion based on the number of unassigned neighbors,
     and uses the precomputed set of articulation points to filter candidates.
 
-    If precomputed_ap is not provided, it is computed within the function.
+    The seed is an unassigned node with the most neighbors outside U, so the partition
+    grows against the ones already placed. If precomputed_ap is not provided, it is
+    computed within the function. When G is a CSRGraph, U, precomputed_ap and the result
+    hold dense node indices.
 
     Parameters:
-        G (Dict): Graph as an adjacency list.
-        U (Set): Set of unassigned nodes.
+        G (CSRGraph or Dict): Graph as a CSRGraph or an adjacency list.
+        U (Set): Set of unassigned nodes. Nodes added to the partition are removed from U.
         p (int): Identifier of the current partition.
         c (int): Target number of nodes for the partition.
         MR (int): Maximum number of retries if growth stalls.
@@ -172,157 +287,166 @@ def grow_partition(G: Dict, U: Set, p: int, c: int, MR: int, precomputed_ap: Set
     Returns:
         Set: The grown partition.
     """
+    graph = _as_graph(G)
     if precomputed_ap is None:
-        from src.utils import find_articulation_points
-        precomputed_ap = find_articulation_points(
-            {node: list(neighbors) for node, neighbors in G.items()})
+        ap = articulation_points(graph)
+    else:
+        ap = _to_dense(graph, G, precomputed_ap)
+
+    dense_U = _to_dense(graph, G, U)
+    # Nodes outside U count as assigned; the placeholder label 0 is never a partition ID.
+    labels = np.zeros(graph.num_nodes, dtype=np.int32)
+    if dense_U:
+        labels[np.fromiter(dense_U, dtype=np.int64, count=len(dense_U))] = UNASSIGNED
+    seed_index = GaplessSeedIndex(graph, np.flatnonzero(labels != UNASSIGNED))
+    partition = _from_dense(graph, G, _grow_partition(graph, labels, p, c, MR, ap, seed_index))
+    U.difference_update(partition)
+    return partition
+
+
+def _grow_partition(graph: CSRGraph, labels: np.ndarray, p: int, c: int, MR: int,
+                    precomputed_ap: Set[int], seed_index: GaplessSeedIndex) -> Set[int]:
+    """
+    Dense-index implementation of grow_partition.
 
-    if len(U) < c:
-        partition = set(U)
-        U.clear()
+    A node is unassigned iff its label is UNASSIGNED, and seed_index must index exactly
+    those nodes. Every node added to the partition is labelled p and assigned in seed_index.
+    """
+    if len(seed_index) < c:
+        partition = set(np.flatnonzero(labels == UNASSIGNED).tolist())
+        labels[list(partition)] = p
+        for node in partition:
+            seed_index.assign(node)
         return partition
 
     partition = set()
     attempts = 0
 
-    try:
-        seed = random_seed_selection(G, set(), method="gapless")
-        if seed not in U:
-            seed = random.choice(list(U))
-    except ValueError:
-        seed = random.choice(list(U))
+    def take(node):
+        partition.add(node)
+        labels[node] = p
+        seed_index.assign(node)
 
-    partition.add(seed)
-    U.discard(seed)
+    take(seed_index.select_best_seed())
+    seed = next(iter(partition))
     # Use a heap-based priority queue. Each element is (priority, node)
     # Priority is defined as -#unassigned_neighbors (so higher connectivity gets higher priority).
     heap = []
 
     def get_priority(node):
         # Count unassigned neighbors
-        return -sum(1 for nbr in G[node] if nbr in U)
+        return -int((labels[graph.neighbors(node)] == UNASSIGNED).sum())
     heapq.heappush(heap, (get_priority(seed), seed))
 
     while heap and len(partition) < c:
         prio, current = heapq.heappop(heap)
         # Expand from current: consider its neighbors that are unassigned and not in precomputed_ap.
-        for nbr in G[current]:
-            if nbr in U and nbr not in precomputed_ap:
-                partition.add(nbr)
-                U.discard(nbr)
+        neighbors = graph.neighbors(current)
+        for nbr in neighbors[labels[neighbors] == UNASSIGNED].tolist():
+            if nbr not in precomputed_ap:
+                take(nbr)
                 heapq.heappush(heap, (get_priority(nbr), nbr))
                 if len(partition) >= c:
                     break
-        if not heap and len(partition) < c and U:
+        if not heap and len(partition) < c and len(seed_index):
             # If the heap is empty, pick a new candidate from neighbors of current partition.
             adjacent_candidates = set()
             for node in partition:
-                adjacent_candidates |= (G[node] & U)
+                neighbors = graph.neighbors(node)
+                adjacent_candidates.update(neighbors[labels[neighbors] == UNASSIGNED].tolist())
             new_seed = random.choice(
-                list(adjacent_candidates)) if adjacent_candidates else random.choice(list(U))
-            partition.add(new_seed)
-            U.discard(new_seed)
+                list(adjacent_candidates)) if adjacent_candidates else seed_index.select_seed()
+            take(new_seed)
             heapq.heappush(heap, (get_priority(new_seed), new_seed))
             attempts += 1
             if attempts >= MR:
-                logger.warning(
-                    f"Partition {p} growth stalled after {MR} retries.")
+                count("graph.stalled_growths")
+                logger.debug("Partition %d growth stalled after %d retries.", p, MR)
                 break
 
     return partition
 
 
-def merge_disconnected_areas(G: Dict, U: Set, Pi: Set) -> Set:
+def merge_disconnected_areas(G: Any, U: Set, Pi: Set) -> Set:
     """
-    Merges disconnected subcomponents in Pi using a union–find approach.
+    Merges disconnected subcomponents in Pi by linking them to its largest component.
+
+    The links are connectivity-repair edges. When G is a GraphOverlay they are recorded in
+    it; the graph itself is never modified.
 
     Parameters:
-        G: Graph adjacency list.
+        G: Graph as a CSRGraph, a GraphOverlay or an adjacency list.
         U: Unassigned nodes (for interface consistency).
         Pi: The current partition.
 
     Returns:
         A connected partition (Pi merged).
     """
-    # Build the induced subgraph for nodes in Pi.
-    induced_adj = {node: {nbr for nbr in G[node] if nbr in Pi} for node in Pi}
-    dsu = {node: node for node in Pi}  # Replace class with direct dictionary
-
-    def find(x):
-        while x != dsu[x]:
-            dsu[x] = dsu[dsu[x]]  # Path compression
-            x = dsu[x]
-        return x
-
-    def union(x, y):
-        dsu[find(y)] = find(x)
+    graph = _as_graph(G)
+    repair_edges: List[Tuple[int, int]] = []
+    _merge_disconnected_areas(graph, _to_dense(graph, G, Pi), repair_edges)
+    _record_repair_edges(G, repair_edges)
+    return Pi
 
-    for node, neighbors in induced_adj.items():
-        for nbr in neighbors:
-            union(node, nbr)
 
-    groups = {}
-    for node in Pi:
-        rep = find(node)
-        groups.setdefault(rep, set()).add(node)
+def _merge_disconnected_areas(graph: CSRGraph, Pi: Set[int], repair_edges: List[Tuple[int, int]]) -> Set[int]:
+    """
+    Dense-index implementation of merge_disconnected_areas. Repair edges linking every
+    minor component of Pi to its largest component are appended to repair_edges.
+    """
+    components = induced_components(graph, Pi)
+    if len(components) <= 1:
+        return Pi
 
-    main_comp = max(groups.values(), key=len)
+    main_comp = max(components, key=len)
     main_node = next(iter(main_comp))
 
-    for group in groups.values():
-        if group is main_comp:
+    for component in components:
+        if component is main_comp:
             continue
-        for node in group:
-            G[node].add(main_node)
-            G[main_node].add(node)
+        for node in component:
+            repair_edges.append((node, main_node))
 
     return Pi
 
 
-def split_partition(G: Dict, Pi: Set, ci: int) -> List[Set]:
+def split_partition(G: Any, Pi: Set, ci: int) -> List[Set]:
     """
     Splits a partition that exceeds the target cardinality while preserving connectivity.
 
     Parameters:
-        G (Dict): Graph as an adjacency list.
+        G (CSRGraph or Dict): Graph as a CSRGraph or an adjacency list.
         Pi (Set): The partition to be split.
         ci (int): Target cardinality for each resulting partition.
 
     Returns:
         List[Set]: List of partitions obtained after splitting.
     """
+    graph = _as_graph(G)
+    parts = _split_partition(graph, _to_dense(graph, G, Pi), ci)
+    return [_from_dense(graph, G, part) for part in parts]
+
+
+def _split_partition(graph: CSRGraph, Pi: Set[int], ci: int) -> List[Set[int]]:
+    """
+    Dense-index implementation of split_partition.
+
+    Boundary nodes (those with a neighbor outside the partition) are peeled off one at a
+    time, preferring nodes that are not articulation points of the partition's induced
+    subgraph so the remaining partition stays connected. Articulation points are tracked
+    incrementally by split_engine.ArticulationTracker.
+    """
     if len(Pi) <= ci:
         return [Pi]
 
-    removed_nodes = set()
-    current_partition = set(Pi)
-    excess = len(Pi) - ci
-    attempts = 0
-    max_attempts = 10 * excess
-
-    while len(removed_nodes) < excess and attempts < max_attempts:
-        mini_adj = {node: list(G[node] & current_partition)
-                    for node in current_partition}
-        boundary_nodes = find_boundary_areas(current_partition, mini_adj)
-        candidates = [
-            node for node in boundary_nodes if not is_articulation_point(G, node)]
-        if not candidates:
-            candidates = list(boundary_nodes)
-        if not candidates:
-            break
-        node_to_remove = random.choice(candidates)
-        current_partition.remove(node_to_remove)
-        removed_nodes.add(node_to_remove)
-        attempts += 1
-
-    removed_adj = {node: [nbr for nbr in G[node]
-                          if nbr in removed_nodes] for node in removed_nodes}
-    new_components = find_connected_components(removed_adj)
+    current_partition, removed_nodes = peel_boundary(graph, Pi, len(Pi) - ci)
+
+    new_components = induced_components(graph, removed_nodes)
 
     partitions = [current_partition]
     partitions.extend(new_components)
 
-    logger.info(
-        f"Split partition into {len(partitions)} partitions with target cardinality {ci}.")
+    logger.debug("Split partition into %d partitions with target cardinality %d.",
+                 len(partitions), ci)
 
     return partitions
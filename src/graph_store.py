@@ -0,0 +1,217 @@
+"""
+graph_store.py
+
+This module provides a native binary container for CSR graphs.
+
+A graph file holds the CSR arrays (indptr, indices), optional vertex and edge weights, the
+node identifier map and a checksum of all array bytes. Text METIS files have to be parsed
+on every load; a graph file is opened by memory-mapping its arrays in place, so it loads in
+milliseconds regardless of size, and worker processes that open the same file share its
+pages through the operating system's page cache.
+
+Layout (all integers little-endian):
+    - 8-byte magic b"PRRPCSR1"
+    - 8-byte length of the JSON header, followed by the header itself
+    - the arrays, each at a 64-byte aligned offset (recorded in the header) from the
+      first aligned position after the header
+
+The checksum is a BLAKE2b digest over the arrays in header order. Verifying it reads every
+page, so load_graph only does so when asked (verify=True).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+from src.metis_parser import read_metis
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PRRPCSR1"
+_ALIGNMENT = 64
+_LENGTH = struct.Struct("<Q")
+_HASH_CHUNK = 1 << 24
+
+
+class StoredGraph(NamedTuple):
+    """
+    A graph read from a graph file.
+
+    Attributes:
+        graph (CSRGraph): The graph, with memory-mapped arrays.
+        vwgt (np.ndarray or None): Vertex weights of shape (num_nodes, ncon), if stored.
+        adjwgt (np.ndarray or None): Edge weights aligned with graph.indices, if stored.
+        meta (dict): Free-form metadata saved with the graph.
+    """
+    graph: CSRGraph
+    vwgt: Optional[np.ndarray] = None
+    adjwgt: Optional[np.ndarray] = None
+    meta: Optional[Dict[str, Any]] = None
+
+
+def _checksum(arrays: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays.values():
+        flat = array.reshape(-1).view(np.uint8)
+        for start in range(0, flat.size, _HASH_CHUNK):
+            digest.update(flat[start:start + _HASH_CHUNK])
+    return digest.hexdigest()
+
+
+def graph_digest(graph: CSRGraph) -> str:
+    """
+    Returns a digest of a graph's structure and identifiers. Two graphs have the same digest
+    exactly when their dense indices refer to the same nodes with the same neighbors.
+    """
+    arrays = {"indptr": graph.indptr.astype(np.int64), "indices": graph.indices}
+    if graph.node_ids is not None and graph.node_ids.dtype != object:
+        arrays["node_ids"] = graph.node_ids
+    elif graph.node_ids is not None:
+        arrays["node_ids"] = np.frombuffer(repr(graph.node_ids.tolist()).encode(), dtype=np.uint8)
+    else:
+        arrays["id_offset"] = np.array([graph.id_offset], dtype=np.int64)
+    return _checksum(arrays)
+
+
+def save_graph(file_path: str,
+               graph: CSRGraph,
+               vwgt: Optional[np.ndarray] = None,
+               adjwgt: Optional[np.ndarray] = None,
+               meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Writes a graph, its optional weights and metadata to a graph file. The file is
+    replaced atomically, so concurrent readers see either the old or the new graph.
+
+    Parameters:
+        file_path (str): Destination path.
+        graph (CSRGraph): The graph to store.
+        vwgt (np.ndarray, optional): Vertex weights, one row per node.
+        adjwgt (np.ndarray, optional): Edge weights aligned with graph.indices.
+        meta (dict, optional): JSON-serializable metadata stored in the header.
+
+    Raises:
+        TypeError: If the node identifiers are neither integers nor strings.
+        ValueError: If the weights do not match the graph.
+    """
+    arrays: Dict[str, np.ndarray] = {"indptr": graph.indptr, "indices": graph.indices}
+    if vwgt is not None:
+        vwgt = np.asarray(vwgt)
+        if vwgt.ndim == 1:
+            vwgt = vwgt[:, None]
+        if vwgt.shape[0] != graph.num_nodes:
+            raise ValueError("vwgt must have one row per node.")
+        arrays["vwgt"] = vwgt
+    if adjwgt is not None:
+        adjwgt = np.asarray(adjwgt)
+        if adjwgt.shape != graph.indices.shape:
+            raise ValueError("adjwgt must be aligned with the graph's indices.")
+        arrays["adjwgt"] = adjwgt
+    if graph.node_ids is not None:
+        if graph.node_ids.dtype == object:
+            raise TypeError("Only integer or string node identifiers can be stored.")
+        arrays["node_ids"] = graph.node_ids
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    position = 0
+    for name, array in arrays.items():
+        sections[name] = {"dtype": array.dtype.str, "shape": list(array.shape),
+                          "offset": position}
+        position = _align(position + array.nbytes)
+    header = json.dumps({
+        "num_nodes": graph.num_nodes,
+        "id_offset": graph.id_offset,
+        "checksum": _checksum(arrays),
+        "meta": meta or {},
+        "arrays": sections,
+    }).encode()
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(header))
+
+    # Written under a temporary name and renamed, so readers never see a partial file.
+    # mkstemp picks a name no other process or thread is using.
+    fd, staging = tempfile.mkstemp(prefix=os.path.basename(file_path) + ".",
+                                   suffix=".tmp", dir=os.path.dirname(file_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.write(b"\0" * (data_start + sections[name]["offset"] - f.tell()))
+                np.ascontiguousarray(array).tofile(f)
+        os.replace(staging, file_path)
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+    logger.info(f"Saved graph with {graph.num_nodes} nodes to {file_path}.")
+
+
+def _align(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+def load_graph(file_path: str, verify: bool = False) -> StoredGraph:
+    """
+    Opens a graph file, memory-mapping its arrays read-only.
+
+    Parameters:
+        file_path (str): Path of the graph file.
+        verify (bool): If True, recompute the checksum over all arrays and compare it.
+
+    Returns:
+        StoredGraph: The graph, its weights and metadata.
+
+    Raises:
+        ValueError: If the file is not a graph file or fails checksum verification.
+    """
+    with open(file_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not a PRRP graph file.")
+        (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        header = json.loads(f.read(length))
+    data_start = _align(len(MAGIC) + _LENGTH.size + length)
+
+    arrays = {
+        name: np.memmap(file_path, dtype=np.dtype(section["dtype"]), mode="r",
+                        offset=data_start + section["offset"], shape=tuple(section["shape"]))
+        for name, section in header["arrays"].items()
+    }
+    if verify and _checksum(arrays) != header["checksum"]:
+        logger.error(f"Checksum mismatch in graph file {file_path}.")
+        raise ValueError(f"Checksum mismatch in graph file {file_path}.")
+
+    if "node_ids" in arrays:
+        node_ids = arrays["node_ids"]
+    else:
+        offset = header["id_offset"]
+        node_ids = range(offset, offset + header["num_nodes"])
+    graph = CSRGraph(arrays["indptr"], arrays["indices"], node_ids)
+    return StoredGraph(graph, arrays.get("vwgt"), arrays.get("adjwgt"), header["meta"])
+
+
+def load_or_convert_metis(metis_path: str, graph_path: Optional[str] = None) -> StoredGraph:
+    """
+    Loads the graph file next to a METIS file, parsing the METIS file and writing the graph
+    file first if it is missing or older than the METIS file.
+
+    Parameters:
+        metis_path (str): Path of the METIS text file.
+        graph_path (str, optional): Path of the graph file. Defaults to metis_path with
+            its extension replaced by ".prrpg".
+
+    Returns:
+        StoredGraph: The memory-mapped graph with any METIS weights.
+    """
+    graph_path = graph_path or os.path.splitext(metis_path)[0] + ".prrpg"
+    if (not os.path.exists(graph_path)
+            or os.path.getmtime(graph_path) < os.path.getmtime(metis_path)):
+        metis = read_metis(metis_path)
+        save_graph(graph_path, metis.graph, metis.vwgt, metis.adjwgt,
+                   meta={"source": os.path.abspath(metis_path)})
+    return load_graph(graph_path)
@@ -0,0 +1,124 @@
+"""
+instrumentation.py
+
+This module provides lightweight instrumentation for the PRRP hot paths.
+
+Region growing, merging and splitting run once per area or per region, which on large graphs
+means millions of steps. Formatting a log message at every step (often with a whole region
+rendered into the string) costs more than the step itself, even when the message is then
+discarded. The hot paths therefore record two kinds of events instead:
+
+    - Counters: integer totals such as the number of growth attempts or removed boundary
+      areas. They are always on, cost one dictionary update per call site, and are usually
+      incremented once per region rather than once per area. Read them with counters() or
+      log them with log_counters().
+    - Trace events: structured records (an event name and keyword fields) emitted for a
+      random sample of steps. Tracing is off by default; call sites guard on
+      TRACER.sampled(), so when it is off no event payload is ever built.
+
+Counters and the tracer are per process: worker processes of a parallel run keep their own.
+Trace sampling uses a private random generator and never consumes values from the global
+random module, so enabling tracing does not change the partitions that are produced.
+"""
+
+import logging
+import random
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_counters: Counter = Counter()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Adds n to the counter called name."""
+    _counters[name] += n
+
+
+def counters() -> Dict[str, int]:
+    """Returns a snapshot of all counters."""
+    return dict(_counters)
+
+
+def reset_counters() -> None:
+    """Sets all counters back to zero."""
+    _counters.clear()
+
+
+def log_counters(level: int = logging.INFO) -> None:
+    """Logs all counters, sorted by name, as a single message."""
+    if _counters and logger.isEnabledFor(level):
+        logger.log(level, "PRRP counters: %s",
+                   ", ".join(f"{name}={value}" for name, value in sorted(_counters.items())))
+
+
+class Tracer:
+    """
+    Emits structured trace events for a random sample of hot-path steps.
+
+    Call sites test sampled() before building an event, so a disabled tracer costs a single
+    attribute check:
+
+        if TRACER.sampled():
+            TRACER.emit("grow.add", area=area, size=len(region))
+
+    By default events are logged on this module's logger at DEBUG level, with the event name
+    and fields attached to the record as prrp_event and prrp_fields. A custom sink receives
+    (event, fields) instead.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self._sink: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        self._rng = random.Random()
+
+    def configure(self,
+                  sample_rate: float,
+                  sink: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                  seed: Optional[int] = None) -> None:
+        """
+        Sets the fraction of steps that are traced.
+
+        Parameters:
+            sample_rate (float): Probability in [0, 1] that a step is traced; 0 disables tracing.
+            sink (callable, optional): Receives (event, fields) for each traced step.
+            seed (int, optional): Seed of the sampling generator, for reproducible traces.
+
+        Raises:
+            ValueError: If sample_rate is outside [0, 1].
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1.")
+        self.sample_rate = sample_rate
+        self.enabled = sample_rate > 0.0
+        self._sink = sink
+        self._rng = random.Random(seed)
+
+    def sampled(self) -> bool:
+        """Returns True if the current step should be traced."""
+        return self.enabled and (self.sample_rate >= 1.0 or self._rng.random() < self.sample_rate)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Records one trace event."""
+        if self._sink is not None:
+            self._sink(event, fields)
+        else:
+            logger.debug("%s %s", event, fields,
+                         extra={"prrp_event": event, "prrp_fields": fields})
+
+
+TRACER = Tracer()
+
+
+def enable_tracing(sample_rate: float = 1.0,
+                   sink: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                   seed: Optional[int] = None) -> None:
+    """Enables sampled tracing of hot-path steps; see Tracer.configure."""
+    TRACER.configure(sample_rate, sink, seed)
+
+
+def disable_tracing() -> None:
+    """Disables tracing."""
+    TRACER.configure(0.0)
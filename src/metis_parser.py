@@ -1,17 +1,23 @@
 """
 metis_parser.py
 
-This module provides a function to load a graph in METIS file format and
-construct an adjacency list representation. It supports both weighted and
+This module loads graphs in METIS file format. It supports both weighted and
 unweighted graphs, converts the default 1‐based METIS indexing to 0‐based indexing,
 and performs robust error handling.
 
-The function returns a tuple:
+read_metis is the single parser behind every METIS loader in the package. It memory-maps
+the file, tokenizes it in line-aligned chunks with NumPy and writes the neighbor lists
+straight into CSR arrays, so peak memory stays close to the size of the resulting arrays.
+load_graph_from_metis wraps it and returns a tuple:
     (adjacency_list, num_nodes, num_edges)
 
-The file is expected to support comment lines (starting with '%') and empty lines.
-It supports graphs with vertex weights, edge weights, or both.
-If vertex weights are present, the first ncon tokens in each vertex line are skipped.
+The file may contain comment lines (starting with '%'). After the header, every other line
+describes one vertex; an empty line is a vertex without neighbors.
+The optional format token "fmt" is read right-aligned as in METIS ("ijk"): i marks vertex
+sizes, j vertex weights and k edge weights, so "1" and "01" mean edge weights, "10" vertex
+weights and "11" both.
+If vertex sizes or weights are present, the leading tokens of each vertex line
+(one size, ncon weights) are skipped.
 If edge weights are present, remaining tokens are expected in pairs (neighbor, weight)
 and only the neighbor (converted to 0-based index) is stored.
 For unweighted graphs, each token (after skipping vertex weights if applicable)
@@ -21,181 +27,343 @@ Refer to Section 4.1.1 of the METIS Manual for details.
 """
 
 import logging
-from typing import Tuple, Dict, List
+import mmap
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
+# Bytes tokenized per step. Temporaries are a small multiple of this, whatever the file size.
+_CHUNK_BYTES = 1 << 20
+# Longest decimal token that fits in int64 without overflow.
+_MAX_TOKEN_DIGITS = 18
+_NEWLINE = ord("\n")
+_PERCENT = ord("%")
+# Byte classes used by the tokenizer.
+_SPACE, _DIGIT, _OTHER = 0, 1, 2
+_BYTE_CLASS = np.full(256, _OTHER, dtype=np.uint8)
+_BYTE_CLASS[[ord(" "), ord("\t"), ord("\r"), ord("\n")]] = _SPACE
+_BYTE_CLASS[ord("0"):ord("9") + 1] = _DIGIT
 
-def load_graph_from_metis(file_path: str) -> Tuple[Dict[int, List[int]], int, int]:
+
+class MetisGraph(NamedTuple):
     """
-    Reads a graph in METIS format from the specified file, constructs an adjacency list,
-    and returns a tuple (adjacency_list, num_nodes, num_edges).
+    A graph read from a METIS file.
+
+    Attributes:
+        graph (CSRGraph): The graph; node identifiers are the 0-based vertex indices.
+        num_edges (int): Number of undirected edges, reconciled with the header count.
+        vwgt (np.ndarray or None): Vertex weights of shape (num_nodes, ncon), if present.
+        adjwgt (np.ndarray or None): Edge weights aligned with graph.indices, if present.
+    """
+    graph: CSRGraph
+    num_edges: int
+    vwgt: Optional[np.ndarray] = None
+    adjwgt: Optional[np.ndarray] = None
+
+
+class _Header(NamedTuple):
+    num_nodes: int
+    edge_count: int
+    vertex_sizes: bool
+    vertex_weights: bool
+    edge_weights: bool
+    ncon: int
+
+
+def _parse_header(tokens: List[bytes]) -> _Header:
+    if len(tokens) < 2:
+        logger.error(
+            "Invalid METIS header: requires at least two tokens (num_nodes and num_edges).")
+        raise ValueError("Invalid METIS header: not enough tokens.")
+    try:
+        num_nodes = int(tokens[0])
+        header_edge_count = int(tokens[1])
+    except Exception as e:
+        logger.error("Invalid numeric values in METIS header.")
+        raise ValueError("Invalid METIS header: invalid numbers.") from e
+
+    fmt = tokens[2].decode().zfill(3) if len(tokens) >= 3 else "000"
+    if len(fmt) != 3 or set(fmt) - {"0", "1"}:
+        logger.error(f"Invalid fmt value '{tokens[2].decode()}' in METIS header.")
+        raise ValueError("Invalid METIS header: invalid fmt.")
+    vertex_weights = fmt[1] == "1"
+    ncon = 1  # Default: one vertex weight per vertex if weights are provided
+    # If vertex weights are present, ncon may be provided as the fourth token.
+    if vertex_weights and len(tokens) >= 4:
+        try:
+            ncon = int(tokens[3])
+        except Exception as e:
+            logger.error("Invalid ncon value in header.")
+            raise ValueError("Invalid ncon in header.") from e
+    return _Header(num_nodes, header_edge_count, fmt[0] == "1", vertex_weights,
+                   fmt[2] == "1", ncon)
+
+
+def _tokenize(chunk: np.ndarray, first_vertex: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Splits a chunk of complete lines into integer tokens.
+
+    Returns:
+        (values, token_lines, vertex_lines): the int64 value of every token outside comment
+        lines, the chunk-local line of each token, and the chunk-local lines that describe
+        vertices (every line that is not a comment).
+    """
+    size = chunk.size
+    kind = _BYTE_CLASS[chunk]
+    is_digit = kind == _DIGIT
+    # Line of every byte; a newline byte belongs to the line it terminates.
+    byte_lines = np.cumsum(chunk == _NEWLINE, dtype=np.int32)
+    byte_lines[chunk == _NEWLINE] -= 1
+    num_lines = int(byte_lines[-1]) + 1
+
+    # A comment line starts with '%' after optional whitespace.
+    comment = np.zeros(num_lines, dtype=bool)
+    percents = np.flatnonzero(chunk == _PERCENT)
+    if percents.size:
+        non_space = np.flatnonzero(kind != _SPACE)
+        previous = np.searchsorted(non_space, percents) - 1
+        at_line_start = (previous < 0) | (byte_lines[non_space[previous]] != byte_lines[percents])
+        comment[byte_lines[percents[at_line_start]]] = True
+    vertex_lines = np.flatnonzero(~comment)
+
+    invalid = np.flatnonzero(kind == _OTHER)
+    if invalid.size:
+        bad_lines = byte_lines[invalid]
+        bad_lines = bad_lines[~comment[bad_lines]]
+        if bad_lines.size:
+            vertex = first_vertex + int(np.searchsorted(vertex_lines, bad_lines[0]))
+            logger.error(f"Vertex {vertex + 1}: Invalid neighbor token.")
+            raise ValueError(f"Invalid neighbor token in vertex {vertex + 1}.")
+
+    # Token boundaries: a digit run starts where the previous byte is not a digit.
+    edges = np.diff(is_digit.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    token_lines = byte_lines[starts]
+    if percents.size:
+        keep = ~comment[token_lines]
+        starts, lengths, token_lines = starts[keep], lengths[keep], token_lines[keep]
+    if starts.size == 0:
+        return np.empty(0, dtype=np.int64), token_lines, vertex_lines
+
+    longest = int(lengths.max())
+    if longest > _MAX_TOKEN_DIGITS:
+        line = token_lines[np.argmax(lengths > _MAX_TOKEN_DIGITS)]
+        vertex = first_vertex + int(np.searchsorted(vertex_lines, line))
+        logger.error(f"Vertex {vertex + 1}: Invalid neighbor token.")
+        raise ValueError(f"Invalid neighbor token in vertex {vertex + 1}.")
+
+    # Horner's rule over digit positions, one vectorized pass per digit of the longest token.
+    digits = chunk - np.uint8(ord("0"))
+    values = digits[starts].astype(np.int64)
+    for k in range(1, longest):
+        longer = np.flatnonzero(lengths > k)
+        values[longer] = values[longer] * 10 + digits[starts[longer] + k]
+    return values, token_lines, vertex_lines
+
+
+def _line_chunks(buffer: mmap.mmap, start: int):
+    """Yields (begin, end) byte ranges of at most about _CHUNK_BYTES that end on a line break."""
+    size = len(buffer)
+    while start < size:
+        end = min(start + _CHUNK_BYTES, size)
+        if end < size:
+            newline = buffer.find(b"\n", end - 1)
+            end = size if newline < 0 else newline + 1
+        yield start, end
+        start = end
 
-    The function handles:
-      - Skipping comment and empty lines.
-      - Parsing the header for number of nodes, number of edges, and an optional format token.
-      - Supporting weighted graphs:
-           * If vertex weights are present, the first ncon tokens (ncon specified in header
-             or defaulting to 1) in each vertex line are skipped.
-           * If edge weights are present, the remaining tokens are expected in pairs
-             (neighbor, weight) and only the neighbor (converted to 0-based index) is stored.
-      - For unweighted graphs, each token (after skipping vertex weights if applicable)
-        is interpreted as a neighbor.
-      - Conversion from 1-based indexing to 0-based indexing.
-      - Self-loop prevention (ignoring edges from a node to itself).
+
+def read_metis(file_path: str) -> MetisGraph:
+    """
+    Reads a METIS graph file into CSR arrays.
+
+    The file is memory-mapped and tokenized chunk by chunk; each vertex's neighbors are
+    converted to 0-based indices, self-loops are dropped, and the result is written into
+    a preallocated indices buffer sized from the header edge count. Vertex weights and
+    edge weights are kept as parallel arrays (edge weights of dropped self-loops too are
+    dropped), so a single parse serves both PRRP and METIS partitioning.
 
     Parameters:
         file_path (str): Path to the METIS graph file.
 
     Returns:
-        Tuple[Dict[int, List[int]], int, int]:
-            - adjacency_list: A dictionary mapping each vertex (0-based) to a list of neighbor vertices.
-            - num_nodes: Total number of nodes.
-            - num_edges: Total number of undirected edges.
+        MetisGraph: The CSR graph and its reconciled undirected edge count.
 
     Raises:
         ValueError: If the file is empty, the header is invalid, or if token parsing fails.
         IOError: If the file cannot be read.
     """
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
+        f = open(file_path, "rb")
     except Exception as e:
         logger.error(f"Error reading file '{file_path}': {e}")
         raise
+    with f:
+        if f.seek(0, 2) == 0:
+            logger.error("METIS file is empty.")
+            raise ValueError("Empty METIS file.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _read_metis_buffer(buffer, file_path)
 
-    # Filter out empty lines and comments (lines starting with '%')
-    content_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if not stripped or stripped.startswith('%'):
-            continue
-        content_lines.append(stripped)
 
-    if not content_lines:
+def _read_metis_buffer(buffer: mmap.mmap, file_path: str) -> MetisGraph:
+    # The header is the first line that is neither blank nor a comment.
+    position = 0
+    header_tokens: List[bytes] = []
+    while position < len(buffer):
+        newline = buffer.find(b"\n", position)
+        end = len(buffer) if newline < 0 else newline + 1
+        line = buffer[position:end].strip()
+        position = end
+        if line and not line.startswith(b"%"):
+            header_tokens = line.split()
+            break
+    if not header_tokens:
         logger.error(
             "METIS file is empty or contains only comments/whitespace.")
         raise ValueError("Empty METIS file.")
 
-    # Parse header
-    header_tokens = content_lines[0].split()
-    if len(header_tokens) < 2:
-        logger.error(
-            "Invalid METIS header: requires at least two tokens (num_nodes and num_edges).")
-        raise ValueError("Invalid METIS header: not enough tokens.")
+    header = _parse_header(header_tokens)
+    num_nodes = header.num_nodes
+    skip = int(header.vertex_sizes) + (header.ncon if header.vertex_weights else 0)
+    stride = 2 if header.edge_weights else 1
 
-    try:
-        num_nodes = int(header_tokens[0])
-        header_edge_count = int(header_tokens[1])
-    except Exception as e:
-        logger.error("Invalid numeric values in METIS header.")
-        raise ValueError("Invalid header numbers.") from e
+    sizes = int(header.vertex_sizes)
+    ncon = header.ncon if header.vertex_weights else 0
+    degrees = np.zeros(num_nodes, dtype=np.int64)
+    indices = np.empty(max(2 * header.edge_count, 0), dtype=np.int32)
+    vwgt = np.zeros((num_nodes, ncon), dtype=np.int64) if ncon else None
+    adjwgt = np.empty(indices.size, dtype=np.int64) if header.edge_weights else None
+    nnz = 0
+    vertex = 0
 
-    # Determine if weights are provided
-    vertex_weights = False
-    edge_weights = False
-    ncon = 1  # Default: one vertex weight per vertex if weights are provided
-    if len(header_tokens) >= 3:
-        fmt = header_tokens[2]
-        if len(fmt) >= 1:
-            vertex_weights = (fmt[0] == '1')
-        if len(fmt) >= 2:
-            edge_weights = (fmt[1] == '1')
-        # If vertex weights are present, ncon may be provided as the fourth token.
-        if vertex_weights and len(header_tokens) >= 4:
-            try:
-                ncon = int(header_tokens[3])
-            except Exception as e:
-                logger.error("Invalid ncon value in header.")
-                raise ValueError("Invalid ncon in header.") from e
-
-    # Check if there are enough vertex lines
-    if len(content_lines) - 1 < num_nodes:
-        logger.error(
-            "The number of vertex lines in the file is less than the expected number of nodes.")
-        raise ValueError("Insufficient vertex lines in METIS file.")
+    for begin, end in _line_chunks(buffer, position):
+        if vertex >= num_nodes:
+            break
+        # Slicing copies one chunk, so no view into the map outlives this loop.
+        chunk = np.frombuffer(buffer[begin:end], dtype=np.uint8)
+        values, token_lines, vertex_lines = _tokenize(chunk, vertex)
+        # Comment tokens are already gone, so every token sits on a vertex line.
+        # Lines past the last vertex are ignored.
+        lines_here = min(vertex_lines.size, num_nodes - vertex)
+        owners = np.searchsorted(vertex_lines, token_lines)
+        in_range = owners < lines_here
+        values, owners = values[in_range], owners[in_range]
 
-    adjacency_list: Dict[int, List[int]] = {}
+        counts = np.bincount(owners, minlength=lines_here)
+        position_in_line = np.arange(owners.size) - np.repeat(np.cumsum(counts) - counts, counts)
 
-    # Process each vertex line (vertices are expected in order; content_lines[1] is vertex 1, etc.)
-    for i in range(num_nodes):
-        line = content_lines[i + 1]
-        tokens = line.split()
-        token_index = 0
-
-        # If vertex weights are provided, skip the first ncon tokens.
-        if vertex_weights:
-            if len(tokens) < ncon:
-                logger.error(
-                    f"Vertex {i + 1} does not contain enough tokens for vertex weights.")
-                raise ValueError(
-                    f"Insufficient vertex weight tokens for vertex {i + 1}.")
-            token_index += ncon
-
-        neighbors: List[int] = []
-        # Process remaining tokens
-        if edge_weights:
-            remaining_tokens = tokens[token_index:]
-            if len(remaining_tokens) % 2 != 0:
+        if skip:
+            short = np.flatnonzero(counts < skip)
+            if short.size:
+                bad = vertex + int(short[0])
                 logger.error(
-                    f"Vertex {i + 1}: Expected an even number of tokens for edge weights, got {len(remaining_tokens)}.")
+                    f"Vertex {bad + 1} does not contain enough tokens for vertex weights.")
                 raise ValueError(
-                    f"Edge weights tokens count error in vertex {i + 1}.")
-            for j in range(0, len(remaining_tokens), 2):
-                try:
-                    # Convert to 0-based index
-                    neighbor = int(remaining_tokens[j]) - 1
-                except Exception as e:
-                    logger.error(
-                        f"Vertex {i + 1}: Invalid neighbor token '{remaining_tokens[j]}'.")
-                    raise ValueError(
-                        f"Invalid neighbor token in vertex {i + 1}.") from e
-                # Avoid self-loop
-                if neighbor != i:
-                    neighbors.append(neighbor)
-        else:
-            for token in tokens[token_index:]:
-                try:
-                    neighbor = int(token) - 1  # Convert to 0-based index
-                except Exception as e:
-                    logger.error(
-                        f"Vertex {i + 1}: Invalid neighbor token '{token}'.")
-                    raise ValueError(
-                        f"Invalid neighbor token in vertex {i + 1}.") from e
-                # Avoid self-loop
-                if neighbor != i:
-                    neighbors.append(neighbor)
-
-        # Validate neighbor indices
-        for neighbor in neighbors:
-            if neighbor < 0 or neighbor >= num_nodes:
+                    f"Insufficient vertex weight tokens for vertex {bad + 1}.")
+        if stride == 2:
+            odd = np.flatnonzero((counts - skip) % 2)
+            if odd.size:
+                bad = vertex + int(odd[0])
                 logger.error(
-                    f"Vertex {i + 1}: Neighbor index {neighbor + 1} is out of valid range (1 to {num_nodes}).")
+                    f"Vertex {bad + 1}: Expected an even number of tokens for edge weights, got {int(counts[odd[0]] - skip)}.")
                 raise ValueError(
-                    f"Neighbor index out of range in vertex {i + 1}.")
+                    f"Edge weights tokens count error in vertex {bad + 1}.")
+
+        if ncon:
+            is_weight = (position_in_line >= sizes) & (position_in_line < skip)
+            vwgt[owners[is_weight] + vertex, position_in_line[is_weight] - sizes] = values[is_weight]
+
+        is_neighbor = (position_in_line >= skip) & ((position_in_line - skip) % stride == 0)
+        neighbors, owners = values[is_neighbor] - 1, owners[is_neighbor] + vertex
+        # Avoid self-loops.
+        not_loop = neighbors != owners
+        neighbors, owners = neighbors[not_loop], owners[not_loop]
+        if adjwgt is not None:
+            # The weight token follows its neighbor token.
+            weights = values[np.flatnonzero(is_neighbor)[not_loop] + 1]
 
-        adjacency_list[i] = neighbors
+        out_of_range = (neighbors < 0) | (neighbors >= num_nodes)
+        if out_of_range.any():
+            k = int(np.argmax(out_of_range))
+            logger.error(
+                f"Vertex {owners[k] + 1}: Neighbor index {neighbors[k] + 1} is out of valid range (1 to {num_nodes}).")
+            raise ValueError(
+                f"Neighbor index out of range in vertex {owners[k] + 1}.")
+
+        degrees[vertex:vertex + lines_here] = np.bincount(
+            owners - vertex, minlength=lines_here)
+        if nnz + neighbors.size > indices.size:
+            indices = np.resize(indices, max(2 * indices.size, nnz + neighbors.size))
+        indices[nnz:nnz + neighbors.size] = neighbors
+        if adjwgt is not None:
+            if nnz + neighbors.size > adjwgt.size:
+                adjwgt = np.resize(adjwgt, indices.size)
+            adjwgt[nnz:nnz + neighbors.size] = weights
+        nnz += neighbors.size
+        vertex += lines_here
+
+    if vertex < num_nodes:
+        logger.error(
+            "The number of vertex lines in the file is less than the expected number of nodes.")
+        raise ValueError("Insufficient vertex lines in METIS file.")
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+    graph = CSRGraph(indptr, indices[:nnz])
 
     # Determine the final number of edges.
-    total_neighbor_entries = sum(len(neigh)
-                                 for neigh in adjacency_list.values())
-    if total_neighbor_entries == header_edge_count:
-        final_num_edges = header_edge_count
-    elif total_neighbor_entries == 2 * header_edge_count:
+    header_edge_count = header.edge_count
+    if nnz == header_edge_count or nnz == 2 * header_edge_count:
         final_num_edges = header_edge_count
     else:
-        final_num_edges = total_neighbor_entries // 2
+        final_num_edges = nnz // 2
         logger.warning(
-            f"Computed total neighbor entries ({total_neighbor_entries}) do not match the header edge count ({header_edge_count}). "
+            f"Computed total neighbor entries ({nnz}) do not match the header edge count ({header_edge_count}). "
             f"Using computed edge count: {final_num_edges}."
         )
 
     logger.info(
         f"Loaded METIS graph from '{file_path}': {num_nodes} nodes, {final_num_edges} edges.")
-    return adjacency_list, num_nodes, final_num_edges
+    return MetisGraph(graph, final_num_edges, vwgt,
+                      adjwgt[:nnz] if adjwgt is not None else None)
+
+
+def load_graph_from_metis(file_path: str) -> Tuple[Dict[int, List[int]], int, int]:
+    """
+    Reads a graph in METIS format from the specified file, constructs an adjacency list,
+    and returns a tuple (adjacency_list, num_nodes, num_edges).
+
+    Parsing is done by read_metis; see it and the module docstring for the accepted format,
+    the 1-based to 0-based conversion and self-loop removal.
+
+    Parameters:
+        file_path (str): Path to the METIS graph file.
+
+    Returns:
+        Tuple[Dict[int, List[int]], int, int]:
+            - adjacency_list: A dictionary mapping each vertex (0-based) to a list of neighbor vertices.
+            - num_nodes: Total number of nodes.
+            - num_edges: Total number of undirected edges.
+
+    Raises:
+        ValueError: If the file is empty, the header is invalid, or if token parsing fails.
+        IOError: If the file cannot be read.
+    """
+    metis = read_metis(file_path)
+    return csr_to_adjacency_lists(metis.graph), metis.graph.num_nodes, metis.num_edges
+
+
+def csr_to_adjacency_lists(graph: CSRGraph, base: int = 0) -> Dict[int, List[int]]:
+    """
+    Converts a CSR graph with dense identifiers into {vertex: [neighbors]} lists, adding
+    base to every vertex number (1 for METIS-style numbering).
+    """
+    flat = (graph.indices.astype(np.int64) + base).tolist()
+    bounds = graph.indptr.tolist()
+    return {i + base: flat[bounds[i]:bounds[i + 1]] for i in range(graph.num_nodes)}
@@ -4,14 +4,9 @@ import geopandas as gpd
 import logging
 import numpy as np
 
-# Configure logging
+from src.metis_parser import csr_to_adjacency_lists, read_metis
+
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-if not logger.handlers:
-    logger.addHandler(handler)
 
 def load_shapefile(file_path: str) -> list:
     """
@@ -54,37 +49,21 @@ def load_metis_graph(file_path: str) -> (nx.Graph, dict):
         dict: Adjacency list
     """
     try:
-        with open(file_path, "r") as f:
-            lines = f.readlines()
+        graph = read_metis(file_path).graph
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
         return None, None
     except Exception as e:
-        logger.error(f"Error reading file {file_path}: {e}")
-        return None, None
-
-    try:
-        header = lines[0].strip().split()
-        num_nodes, num_edges = int(header[0]), int(header[1])
-    except Exception as e:
-        logger.error(f"Error parsing header in file {file_path}: {e}")
+        logger.error(f"Error reading METIS graph {file_path}: {e}")
         return None, None
 
-    adjacency_list = {}
-
-    try:
-        for node_id, line in enumerate(lines[1:], start=1):
-            neighbors = list(map(lambda x: int(x) - 1, line.strip().split()))
-            adjacency_list[node_id - 1] = neighbors  # Convert to 0-based index
-    except Exception as e:
-        logger.error(f"Error parsing adjacency list in file {file_path}: {e}")
-        return None, None
+    adjacency_list = csr_to_adjacency_lists(graph)
 
     G = nx.Graph()
     try:
-        for node, neighbors in adjacency_list.items():
-            for neighbor in neighbors:
-                G.add_edge(node, neighbor)
+        G.add_nodes_from(range(graph.num_nodes))
+        sources = np.repeat(np.arange(graph.num_nodes), graph.degrees())
+        G.add_edges_from(zip(sources.tolist(), graph.indices.tolist()))
     except Exception as e:
         logger.error(f"Error creating NetworkX graph: {e}")
         return None, None
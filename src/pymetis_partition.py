@@ -1,14 +1,13 @@
 import metis
+import pymetis
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
 
 def partition_graph_pymetis(adj_list: Dict[int, List[int]], num_partitions: int) -> Dict[int, Set[int]]:
@@ -50,3 +49,45 @@ def partition_graph_pymetis(adj_list: Dict[int, List[int]], num_partitions: int)
 
     logger.info("PyMETIS partitioning completed successfully.")
     return partition_dict
+
+
+def partition_csr_pymetis(graph: CSRGraph,
+                          num_partitions: int,
+                          vwgt: Optional[np.ndarray] = None,
+                          adjwgt: Optional[np.ndarray] = None) -> Dict[int, Set[int]]:
+    """
+    Partitions a CSR graph using PyMETIS, passing the CSR arrays and optional weights
+    (for example those returned by metis_parser.read_metis) without rebuilding lists.
+
+    Parameters:
+        graph (CSRGraph): The graph to partition.
+        num_partitions (int): The number of partitions to divide the graph into.
+        vwgt (np.ndarray, optional): Vertex weights of shape (num_nodes, ncon).
+        adjwgt (np.ndarray, optional): Edge weights aligned with graph.indices.
+
+    Returns:
+        Dict[int, Set[int]]: A dictionary mapping partition indices to sets of node IDs.
+    """
+    if num_partitions <= 1:
+        logger.error("Number of partitions must be greater than 1.")
+        raise ValueError("Number of partitions must be greater than 1.")
+
+    try:
+        logger.info(
+            f"Partitioning CSR graph using PyMETIS into {num_partitions} partitions...")
+        _, partitions = pymetis.part_graph(
+            num_partitions,
+            xadj=graph.indptr,
+            adjncy=graph.indices,
+            vweights=None if vwgt is None else np.ascontiguousarray(vwgt).ravel(),
+            eweights=adjwgt)
+    except Exception as e:
+        logger.error(f"PyMETIS partitioning failed: {e}")
+        raise RuntimeError(f"PyMETIS failed due to: {e}")
+
+    partitions = np.asarray(partitions)
+    partition_dict = {i: set(graph.ids_of(np.flatnonzero(partitions == i)))
+                      for i in range(num_partitions)}
+
+    logger.info("PyMETIS partitioning completed successfully.")
+    return partition_dict
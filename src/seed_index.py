@@ -0,0 +1,198 @@
+"""
+seed_index.py
+
+This module provides an incremental index for gapless seed selection in the
+P-Regionalization through Recursive Partitioning (PRRP) algorithm.
+
+Gapless seeding prefers unassigned nodes that touch already-assigned nodes, so new
+regions grow against existing ones instead of leaving holes. Rather than rescoring every
+unassigned node on each selection, GaplessSeedIndex keeps each unassigned node in a
+bucket keyed by its number of assigned neighbors and moves only the neighbors of a node
+when that node is assigned or released. Every update and selection costs O(degree).
+"""
+
+import logging
+import random
+from array import array
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+
+logger = logging.getLogger(__name__)
+
+
+class GaplessSeedIndex:
+    """
+    Buckets the unassigned nodes of a CSRGraph by their number of assigned neighbors.
+
+    Nodes are dense indices of the graph. Buckets are arrays with a position table, so a
+    node can be moved between buckets or sampled uniformly from a bucket in O(1).
+    """
+
+    def __init__(self, graph: CSRGraph, assigned: Optional[Iterable[int]] = None):
+        """
+        Parameters:
+            graph (CSRGraph): The graph whose nodes are indexed.
+            assigned (Iterable[int], optional): Dense nodes that are already assigned.
+        """
+        self.graph = graph
+        num_nodes = graph.num_nodes
+        is_assigned = np.zeros(num_nodes, dtype=np.int8)
+        if assigned is not None:
+            assigned = np.fromiter(assigned, dtype=np.int64)
+            is_assigned[assigned] = 1
+
+        # Number of assigned neighbors of every node, assigned or not, so that
+        # released nodes re-enter the right bucket without a rescan.
+        hits = np.zeros(graph.indices.size + 1, dtype=np.int64)
+        np.cumsum(is_assigned[graph.indices], out=hits[1:])
+        counts = hits[graph.indptr[1:]] - hits[graph.indptr[:-1]]
+
+        self._assigned = array("b", is_assigned.tobytes())
+        self._count = array("i", counts.astype(np.int32).tobytes())
+        self._pos = array("i", bytes(4 * num_nodes))
+        max_degree = int(graph.degrees().max()) if num_nodes else 0
+        self._buckets: List[array] = [array("i") for _ in range(max_degree + 1)]
+
+        unassigned = np.flatnonzero(is_assigned == 0)
+        order = unassigned[np.argsort(counts[unassigned], kind="stable")]
+        for node in order.tolist():
+            bucket = self._buckets[self._count[node]]
+            self._pos[node] = len(bucket)
+            bucket.append(node)
+
+        self._num_unassigned = int(unassigned.size)
+        self._num_adjacent = self._num_unassigned - len(self._buckets[0])
+        self._top = max((b for b, bucket in enumerate(self._buckets) if bucket), default=0)
+
+    # ------------------------------------------------------------------
+    # Bucket maintenance
+    # ------------------------------------------------------------------
+    def _remove(self, node: int) -> None:
+        bucket = self._buckets[self._count[node]]
+        position = self._pos[node]
+        last = bucket.pop()
+        if last != node:
+            bucket[position] = last
+            self._pos[last] = position
+
+    def _insert(self, node: int) -> None:
+        count = self._count[node]
+        bucket = self._buckets[count]
+        self._pos[node] = len(bucket)
+        bucket.append(node)
+        if count > self._top:
+            self._top = count
+
+    def __len__(self) -> int:
+        """Number of unassigned nodes."""
+        return self._num_unassigned
+
+    def __contains__(self, node: int) -> bool:
+        """True if node is unassigned (and therefore a possible seed)."""
+        return not self._assigned[node]
+
+    def assigned_neighbor_count(self, node: int) -> int:
+        return self._count[node]
+
+    def assign(self, node: int) -> None:
+        """
+        Marks node as assigned and raises the score of its unassigned neighbors.
+
+        Raises:
+            ValueError: If node is already assigned.
+        """
+        if self._assigned[node]:
+            raise ValueError(f"Node {node} is already assigned.")
+        self._remove(node)
+        self._assigned[node] = 1
+        self._num_unassigned -= 1
+        if self._count[node]:
+            self._num_adjacent -= 1
+
+        for nbr in self.graph.neighbors(node).tolist():
+            if self._assigned[nbr]:
+                self._count[nbr] += 1
+                continue
+            self._remove(nbr)
+            if self._count[nbr] == 0:
+                self._num_adjacent += 1
+            self._count[nbr] += 1
+            self._insert(nbr)
+
+    def release(self, node: int) -> None:
+        """
+        Returns node to the unassigned pool and lowers the score of its unassigned neighbors.
+
+        Raises:
+            ValueError: If node is not assigned.
+        """
+        if not self._assigned[node]:
+            raise ValueError(f"Node {node} is not assigned.")
+        self._assigned[node] = 0
+        self._num_unassigned += 1
+        if self._count[node]:
+            self._num_adjacent += 1
+        self._insert(node)
+
+        for nbr in self.graph.neighbors(node).tolist():
+            if self._assigned[nbr]:
+                self._count[nbr] -= 1
+                continue
+            self._remove(nbr)
+            self._count[nbr] -= 1
+            if self._count[nbr] == 0:
+                self._num_adjacent -= 1
+            self._insert(nbr)
+
+    # ------------------------------------------------------------------
+    # Seed selection
+    # ------------------------------------------------------------------
+    def select_seed(self) -> int:
+        """
+        Selects an unassigned node uniformly among those adjacent to an assigned node.
+
+        If no unassigned node touches the assigned set (e.g. before the first region),
+        a uniformly random unassigned node is returned instead.
+
+        Returns:
+            int: The dense index of the selected seed.
+
+        Raises:
+            ValueError: If every node is assigned.
+        """
+        if not self._num_unassigned:
+            logger.error("No unassigned nodes available for seed selection.")
+            raise ValueError("No unassigned nodes available.")
+
+        if not self._num_adjacent:
+            bucket = self._buckets[0]
+            return bucket[random.randrange(len(bucket))]
+
+        offset = random.randrange(self._num_adjacent)
+        for bucket in self._buckets[1:self._top + 1]:
+            if offset < len(bucket):
+                return bucket[offset]
+            offset -= len(bucket)
+        raise AssertionError("Seed index bucket sizes are inconsistent.")
+
+    def select_best_seed(self) -> int:
+        """
+        Selects an unassigned node uniformly among those with the most assigned neighbors.
+
+        Returns:
+            int: The dense index of the selected seed.
+
+        Raises:
+            ValueError: If every node is assigned.
+        """
+        if not self._num_unassigned:
+            logger.error("No unassigned nodes available for seed selection.")
+            raise ValueError("No unassigned nodes available.")
+
+        while not self._buckets[self._top]:
+            self._top -= 1
+        bucket = self._buckets[self._top]
+        return bucket[random.randrange(len(bucket))]
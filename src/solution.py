@@ -0,0 +1,122 @@
+"""
+solution.py
+
+This module provides a compact representation of PRRP solutions.
+
+A solution assigns every node of a graph to a region. Stored as a list or dictionary of
+Python sets it costs roughly 60-100 bytes per area and is slow to pickle back from worker
+processes. A Solution instead holds one int32 label per dense node index of a CSRGraph
+(4 bytes per area) and produces the familiar set-based views only when asked:
+
+    - to_regions(): List[Set] in region order, as returned by spatial PRRP.
+    - to_partitions(): Dict[int, Set] keyed from 1, as returned by graph PRRP.
+
+The graph is shared by reference, so an ensemble of solutions over the same graph stores
+its node identifiers once. Label -1 marks a node that belongs to no region.
+"""
+
+from typing import Any, Dict, Iterable, List, Set
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+
+UNASSIGNED = -1
+
+
+class Solution:
+    """
+    A partition of a graph's nodes into regions, stored as an int32 label array.
+
+    Attributes:
+        labels (np.ndarray): Region label of each dense node index, or UNASSIGNED.
+        graph (CSRGraph): The graph whose dense node indices the labels address.
+    """
+
+    __slots__ = ("labels", "graph")
+
+    def __init__(self, labels: Any, graph: CSRGraph):
+        """
+        Parameters:
+            labels (array-like): One region label per node of graph; -1 for unassigned nodes.
+            graph (CSRGraph): The graph the labels refer to.
+
+        Raises:
+            ValueError: If labels does not have one entry per node.
+        """
+        labels = np.asarray(labels, dtype=np.int32)
+        if labels.shape != (graph.num_nodes,):
+            raise ValueError("labels must have one entry per node of the graph.")
+        self.labels = labels
+        self.graph = graph
+
+    @classmethod
+    def from_regions(cls, regions: Iterable[Iterable[Any]], graph: CSRGraph) -> "Solution":
+        """
+        Builds a solution from regions given as collections of node identifiers. The i-th
+        region receives label i; nodes in no region are left unassigned.
+
+        Raises:
+            KeyError: If a region contains an identifier that is not a node of graph.
+        """
+        labels = np.full(graph.num_nodes, UNASSIGNED, dtype=np.int32)
+        for label, region in enumerate(regions):
+            labels[graph.indices_of(region)] = label
+        return cls(labels, graph)
+
+    @classmethod
+    def from_partitions(cls, partitions: Dict[int, Iterable[Any]], graph: CSRGraph) -> "Solution":
+        """
+        Builds a solution from a graph PRRP result, mapping partition IDs 1..k to labels
+        0..k-1 in sorted ID order.
+        """
+        return cls.from_regions((partitions[pid] for pid in sorted(partitions)), graph)
+
+    @property
+    def num_regions(self) -> int:
+        """The number of regions, one more than the largest label."""
+        return int(self.labels.max()) + 1 if self.labels.size else 0
+
+    def region_sizes(self) -> np.ndarray:
+        """Returns the number of nodes with each label as an array of length num_regions."""
+        assigned = self.labels[self.labels != UNASSIGNED]
+        return np.bincount(assigned, minlength=self.num_regions)
+
+    def region_indices(self, label: int) -> np.ndarray:
+        """Returns the dense node indices carrying a label."""
+        return np.flatnonzero(self.labels == label)
+
+    def region(self, label: int) -> Set[Any]:
+        """Returns the node identifiers of one region as a set."""
+        return set(self.graph.ids_of(self.region_indices(label)))
+
+    def region_of(self, node_id: Any) -> int:
+        """Returns the label of a node identifier, or UNASSIGNED."""
+        return int(self.labels[self.graph.index_of(node_id)])
+
+    def to_regions(self) -> List[Set[Any]]:
+        """Returns the regions as a list of identifier sets, indexed by label."""
+        order = np.argsort(self.labels, kind="stable")
+        sorted_labels = self.labels[order]
+        start = np.searchsorted(sorted_labels, 0)
+        bounds = np.searchsorted(sorted_labels, np.arange(1, self.num_regions))
+        ids = self.graph.ids_of(order[start:])
+        cuts = [0, *(bounds - start).tolist(), len(ids)]
+        return [set(ids[a:b]) for a, b in zip(cuts, cuts[1:])] if self.num_regions else []
+
+    def to_partitions(self) -> Dict[int, Set[Any]]:
+        """Returns the regions as a dictionary from partition ID (label + 1) to identifier set."""
+        return {label + 1: region for label, region in enumerate(self.to_regions())}
+
+    def __len__(self) -> int:
+        return self.num_regions
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Solution):
+            return NotImplemented
+        return np.array_equal(self.labels, other.labels)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Solution(num_nodes={self.labels.size}, num_regions={self.num_regions})"
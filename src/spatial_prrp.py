@@ -1,26 +1,29 @@
 import os
 import random
 import logging
-from typing import Dict, Set, List, Any
+import threading
+from collections import deque
+from typing import Dict, Set, List, Any, Iterable, Iterator, Optional, Tuple
 from multiprocessing import Pool, cpu_count
 
+import numpy as np
+
+from src.checkpoint import SolutionCheckpoint, ensemble_seeds, merge_shards, shard_range
+from src.csr_graph import CSRGraph, as_csr_graph, component_labels, gather_neighbors
+from src.instrumentation import TRACER, count, log_counters
 from src.prrp_data_loader import load_shapefile
+from src.seed_index import GaplessSeedIndex
+from src.solution import Solution
 from src.utils import (
     construct_adjacency_list,
-    find_connected_components,
-    find_boundary_areas,
-    parallel_execute,
+    RandomAccessSet,
 )
 
-# Configure module-level logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-if not logger.handlers:
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+
+# Nodes the local searches of _local_fragments may visit per area of the region just grown
+# before merging falls back to a global component pass.
+_LOCAL_MERGE_BUDGET = 8
 
 
 # ==============================
@@ -28,7 +31,8 @@ if not logger.handlers:
 # ==============================
 def get_gapless_seed(adj_list: Dict[int, Set[int]],
                      available_areas: Set[int],
-                     assigned_regions: Set[int]) -> int:
+                     assigned_regions: Set[int],
+                     seed_index: GaplessSeedIndex = None) -> int:
     """
     Selects a gapless seed for region growing, ensuring spatial contiguity.
 
@@ -37,11 +41,16 @@ def get_gapless_seed(adj_list: Dict[int, Set[int]],
     seed from the neighbors of already assigned areas to maintain spatial contiguity.
     If no such neighbor is available, it falls back to selecting a random area from available_areas.
 
+    If a seed_index is given, it must describe the same assignment state (its unassigned
+    nodes are exactly available_areas); the seed is then drawn from it in O(degree) and
+    assigned_regions is not scanned.
+
     Parameters:
         adj_list (Dict[int, Set[int]]): The neighborhood graph represented as an adjacency list.
             Keys are area IDs and values are sets of adjacent area IDs.
         available_areas (Set[int]): Set of unassigned area IDs.
         assigned_regions (Set[int]): Set of area IDs that have already been assigned to regions.
+        seed_index (GaplessSeedIndex, optional): Incremental seed index over the same areas.
 
     Returns:
         int: The selected seed area ID.
@@ -53,9 +62,14 @@ def get_gapless_seed(adj_list: Dict[int, Set[int]],
         logger.error("No available areas to select a seed.")
         raise ValueError("No available areas to select a seed.")
 
+    if seed_index is not None:
+        seed = seed_index.graph.id_of(seed_index.select_seed())
+        logger.debug("Gapless seed selected from index: %s", seed)
+        return seed
+
     if not assigned_regions:
         seed = random.choice(list(available_areas))
-        logger.info(f"First seed selected randomly: {seed}")
+        logger.debug("First seed selected randomly: %s", seed)
         return seed
 
     candidate_seeds = set()
@@ -65,11 +79,12 @@ def get_gapless_seed(adj_list: Dict[int, Set[int]],
 
     if candidate_seeds:
         seed = random.choice(list(candidate_seeds))
-        logger.info(f"Gapless seed selected: {seed}")
+        logger.debug("Gapless seed selected: %s", seed)
         return seed
 
     seed = random.choice(list(available_areas))
-    logger.warning(f"No gapless seed found; selecting random area: {seed}")
+    count("seed.non_gapless")
+    logger.debug("No gapless seed found; selecting random area: %s", seed)
 
     return seed
 
@@ -77,17 +92,35 @@ def get_gapless_seed(adj_list: Dict[int, Set[int]],
 # ==============================
 # 2. Region Growing Phase
 # ==============================
+def _area_mask(graph: CSRGraph, areas: Iterable[Any]) -> bytearray:
+    """
+    Returns the working-set form of a set of area IDs: one byte per dense node of graph,
+    1 for members. Scalar tests and updates index the bytearray directly; vectorized steps
+    operate on a NumPy view of the same memory (see _mask_view).
+    """
+    mask = bytearray(graph.num_nodes)
+    _mask_view(mask)[graph.indices_of(areas)] = True
+    return mask
+
+
+def _mask_view(mask: bytearray) -> np.ndarray:
+    """Returns a writable boolean NumPy view sharing the memory of a working-set mask."""
+    return np.frombuffer(mask, dtype=np.bool_)
+
+
 def grow_region(adj_list: Dict[int, Set[int]],
                 available_areas: Set[int],
                 target_cardinality: int,
-                max_retries: int = 5) -> Set[int]:
+                max_retries: int = 5,
+                seed_index: GaplessSeedIndex = None,
+                graph: Optional[CSRGraph] = None) -> Set[int]:
     """
     Grows a spatially contiguous region until the target cardinality is reached.
 
     The region is grown by:
       1. Selecting an initial seed using gapless seed selection.
       2. Expanding the region by randomly adding unassigned neighbors.
-      3. Dynamically updating the frontier of candidate areas.
+      3. Updating the frontier of candidate areas from each newly added area (see grow_from_seed).
     If the region cannot be grown to meet the target cardinality (due to a lack of available
     neighboring areas), the growth attempt is restarted with a new seed. After max_retries
     unsuccessful attempts, a RuntimeError is raised.
@@ -96,9 +129,14 @@ def grow_region(adj_list: Dict[int, Set[int]],
         adj_list (Dict[int, Set[int]]): The neighborhood graph represented as an adjacency list.
             Keys are area IDs and values are sets of adjacent area IDs.
         available_areas (Set[int]): Set of unassigned area IDs. This set will be updated by removing
-            the areas that become part of the successfully grown region.
+            the areas that become part of the successfully grown region. Failed attempts are
+            rolled back, so it is left unchanged if the call raises.
         target_cardinality (int): The required number of areas in the region.
         max_retries (int): Maximum number of attempts to grow the region before failing.
+        seed_index (GaplessSeedIndex, optional): Incremental seed index whose unassigned nodes
+            are exactly available_areas. The caller updates it once the region is committed.
+        graph (CSRGraph, optional): Prebuilt CSR graph of adj_list. Without it or seed_index,
+            one is built from adj_list on every call, which costs O(V + E) for the whole map.
 
     Returns:
         Set[int]: A set of area IDs representing the successfully grown region.
@@ -107,71 +145,151 @@ def grow_region(adj_list: Dict[int, Set[int]],
         ValueError: If target_cardinality exceeds the number of available areas.
         RuntimeError: If region growth fails after max_retries attempts.
     """
-    if target_cardinality > len(available_areas):
+    if graph is None:
+        graph = seed_index.graph if seed_index is not None else as_csr_graph(adj_list)
+    available = _area_mask(graph, available_areas)
+    region = set(graph.ids_of(
+        _grow_region(graph, available, target_cardinality, max_retries, seed_index)))
+    available_areas.difference_update(region)
+    return region
+
+
+def _grow_region(graph: CSRGraph,
+                 available: bytearray,
+                 target_cardinality: int,
+                 max_retries: int = 5,
+                 seed_index: GaplessSeedIndex = None) -> List[int]:
+    """
+    Dense-index implementation of grow_region over an availability mask.
+    """
+    num_available = available.count(1)
+    if target_cardinality > num_available:
         error_msg = (
             f"Target cardinality ({target_cardinality}) exceeds the number of available areas "
-            f"({len(available_areas)})."
+            f"({num_available})."
         )
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    full_areas = set(adj_list.keys())
+    # Attempts grow directly in the shared availability mask. The region of a failed attempt
+    # is its undo log: setting its bytes back restores the mask in O(region size).
     retries = 0
 
     while retries < max_retries:
-        logger.info(f"Region growing attempt {retries + 1}/{max_retries}")
-        temp_available = available_areas.copy()
-        assigned_regions = full_areas - temp_available
-
+        count("grow.attempts")
         try:
-            seed = get_gapless_seed(adj_list, temp_available, assigned_regions)
+            seed = (seed_index.select_seed() if seed_index is not None
+                    else _gapless_seed(graph, available))
         except ValueError as e:
             logger.error(f"Error selecting seed: {e}")
             raise
 
-        region = {seed}
-        temp_available.remove(seed)
-        logger.debug(
-            f"Started region growing with seed {seed}. Initial region: {region}")
-
-        frontier = set()
-        for area in region:
-            neighbors = set(adj_list.get(area, set()))
-            frontier.update(neighbors.intersection(temp_available))
-
-        while len(region) < target_cardinality:
-            if not frontier:
-                logger.debug(
-                    "Frontier is empty; unable to expand region further.")
-                break
-
-            next_area = random.choice(list(frontier))
-            region.add(next_area)
-            temp_available.remove(next_area)
-            logger.debug(
-                f"Added area {next_area} to region. Current region size: {len(region)}.")
-
-            frontier.clear()
-            for area in region:
-                neighbors = set(adj_list.get(area, set()))
-                frontier.update(neighbors.intersection(temp_available))
+        region = _grow_from_seed(graph, seed, available, target_cardinality)
 
         if len(region) == target_cardinality:
-            available_areas.difference_update(region)
-            logger.info(
-                f"Successfully grown region with target cardinality {target_cardinality}: {region}")
+            logger.debug("Grew region of %d areas.", target_cardinality)
             return region
         else:
+            _mask_view(available)[region] = True
             retries += 1
-            logger.warning(
-                f"Region growth attempt {retries} failed to reach the target cardinality. Retrying with a new seed."
-            )
+            count("grow.retries")
+            logger.debug(
+                "Region growth attempt %d reached %d of %d areas. Retrying with a new seed.",
+                retries, len(region), target_cardinality)
 
     error_msg = f"Region growth failed after {max_retries} attempts."
     logger.error(error_msg)
     raise RuntimeError(error_msg)
 
 
+def _gapless_seed(graph: CSRGraph, available: bytearray) -> int:
+    """
+    Dense counterpart of get_gapless_seed without a seed index: picks an available node
+    adjacent to an unavailable one, or any available node if there is none.
+    """
+    mask = _mask_view(available)
+    free = np.flatnonzero(mask)
+    if free.size == 0:
+        raise ValueError("No available areas to select a seed.")
+    if free.size < mask.size:
+        sources, neighbors = gather_neighbors(graph, free)
+        candidates = free[np.unique(sources[~mask[neighbors]])]
+        if candidates.size:
+            return int(candidates[random.randrange(candidates.size)])
+        count("seed.non_gapless")
+    return int(free[random.randrange(free.size)])
+
+
+def grow_from_seed(adj_list: Dict[int, Set[int]],
+                   seed: int,
+                   available_areas: Set[int],
+                   target_cardinality: int,
+                   graph: Optional[CSRGraph] = None) -> Set[int]:
+    """
+    Grows one region from a seed by repeatedly adding a random frontier area.
+
+    The frontier (available areas adjacent to the region) is maintained incrementally:
+    when an area joins the region, only its own neighbors are examined. Frontier members
+    are kept in a RandomAccessSet, so each step costs O(degree) and growing a region of
+    k areas costs about k adjacency lookups.
+
+    Parameters:
+        adj_list (Dict[int, Set[int]]): The neighborhood graph represented as an adjacency list.
+        seed (int): The area the region starts from; it must be in available_areas.
+        available_areas (Set[int]): Unassigned area IDs. Areas added to the region are removed.
+        target_cardinality (int): The size at which growth stops.
+        graph (CSRGraph, optional): Prebuilt CSR graph of adj_list. Without it, one is
+            built from adj_list on every call, which costs O(V + E) for the whole map.
+
+    Returns:
+        Set[int]: The grown region. It is smaller than target_cardinality if the frontier
+            ran out first.
+    """
+    if seed not in available_areas:
+        raise KeyError(seed)
+    graph = graph if graph is not None else as_csr_graph(adj_list)
+    available = _area_mask(graph, available_areas)
+    region = set(graph.ids_of(
+        _grow_from_seed(graph, graph.index_of(seed), available, target_cardinality)))
+    available_areas.difference_update(region)
+    return region
+
+
+def _grow_from_seed(graph: CSRGraph,
+                    seed: int,
+                    available: bytearray,
+                    target_cardinality: int) -> List[int]:
+    """
+    Dense-index implementation of grow_from_seed. Returns the region in the order its
+    areas were added and clears their bytes in the availability mask.
+    """
+    region = [seed]
+    available[seed] = 0
+
+    frontier = RandomAccessSet(
+        nbr for nbr in graph.neighbors(seed).tolist() if available[nbr])
+
+    while len(region) < target_cardinality:
+        if not frontier:
+            count("grow.frontier_exhausted")
+            break
+
+        next_area = frontier.sample()
+        frontier.remove(next_area)
+        region.append(next_area)
+        available[next_area] = 0
+        if TRACER.sampled():
+            TRACER.emit("grow.add", area=graph.id_of(next_area), size=len(region),
+                        frontier=len(frontier))
+
+        for nbr in graph.neighbors(next_area).tolist():
+            if available[nbr]:
+                frontier.add(nbr)
+
+    count("grow.areas_added", len(region))
+    return region
+
+
 # ==============================
 # 3. Find Largest Connected Component
 # ==============================
@@ -193,8 +311,7 @@ def find_largest_component(connected_components: List[Set[int]]) -> Set[int]:
         raise ValueError("No connected components found.")
 
     largest_component = max(connected_components, key=len)
-    logger.info(
-        f"Largest connected component selected with {len(largest_component)} areas.")
+    logger.debug("Largest connected component has %d areas.", len(largest_component))
 
     return largest_component
 
@@ -206,7 +323,8 @@ def merge_disconnected_areas(
     adj_list: Dict[int, Set[int]],
     available_areas: Set[int],
     current_region: Set[int],
-    parallelize: bool = False
+    parallelize: bool = False,
+    graph: Optional[CSRGraph] = None
 ) -> Set[int]:
     """
     Merges disconnected unassigned areas into the current region to ensure spatial contiguity.
@@ -220,6 +338,8 @@ def merge_disconnected_areas(
         available_areas (Set[int]): Set of unassigned area IDs.
         current_region (Set[int]): The most recently grown region.
         parallelize (bool, optional): Flag to enable parallel execution if applicable. Defaults to False.
+        graph (CSRGraph, optional): Prebuilt CSR graph of adj_list. Without it, one is
+            built from adj_list on every call, which costs O(V + E) for the whole map.
 
     Returns:
         Set[int]: The updated current_region after merging disconnected areas.
@@ -231,45 +351,213 @@ def merge_disconnected_areas(
         logger.info(
             "Parallelize flag is set, but sequential execution is used for region merging.")
 
-    # Create a subgraph from available areas, ensuring only edges between available areas are retained.
-    sub_adj: Dict[int, List[int]] = {
-        area: list(set(adj_list.get(area, set())) & available_areas) for area in available_areas
-    }
+    graph = graph if graph is not None else as_csr_graph(adj_list)
+    merged_areas = graph.ids_of(
+        _merge_disconnected_areas(graph, _area_mask(graph, available_areas), []))
+    current_region.update(merged_areas)
+    available_areas.difference_update(merged_areas)
+    return current_region
 
-    # Find connected components in the subgraph using the utility function.
-    components: List[Set[int]] = find_connected_components(sub_adj)
 
-    if not components:
+def _merge_disconnected_areas(graph: CSRGraph,
+                              available: bytearray,
+                              region: List[int],
+                              connected: bool = False) -> List[int]:
+    """
+    Dense-index implementation of merge_disconnected_areas. Every component of the available
+    nodes except the largest is cleared from the mask and appended to region, which is returned.
+
+    If connected is True, the available nodes were connected before region was taken out
+    of them, so only region's surroundings can have split them and _local_fragments is
+    tried first. The global component pass runs only if the local searches cannot decide.
+    """
+    if connected:
+        fragments = _local_fragments(graph, available, region)
+        if fragments is not None:
+            count("merge.local_decisions")
+            for fragment in fragments:
+                if TRACER.sampled():
+                    TRACER.emit("merge.component", size=len(fragment))
+                for area in fragment:
+                    available[area] = 0
+                region.extend(fragment)
+            merged_count = sum(map(len, fragments))
+            count("merge.components", len(fragments))
+            count("merge.areas", merged_count)
+            logger.debug("Merged %d disconnected areas into the current region.", merged_count)
+            return region
+        count("merge.global_fallbacks")
+
+    mask = _mask_view(available)
+    free = np.flatnonzero(mask)
+    num_components, labels = component_labels(graph, free)
+
+    if not num_components:
         logger.error("No connected components found in available areas.")
         raise RuntimeError("No connected components found in available areas.")
 
-    # Identify the largest connected component.
-    largest_component: Set[int] = find_largest_component(components)
+    sizes = np.bincount(labels, minlength=num_components)
+    largest = int(np.argmax(sizes))
+    merged = free[labels != largest]
+    if TRACER.sampled():
+        for size in np.delete(sizes, largest).tolist():
+            TRACER.emit("merge.component", size=size)
+    mask[merged] = False
+    region.extend(merged.tolist())
 
-    # Merge all smaller disconnected components into the current region.
-    merged_areas = set()
-    for comp in components:
-        if comp != largest_component:
-            logger.info(
-                f"Merging disconnected component with {len(comp)} areas into the current region: {comp}")
-            current_region.update(comp)
-            merged_areas.update(comp)
+    count("merge.components", num_components - 1)
+    count("merge.areas", len(merged))
+    logger.debug("Merged %d disconnected areas into the current region.", len(merged))
 
-    # Ensure merged areas are removed from available_areas.
-    available_areas.difference_update(merged_areas)
+    return region
 
-    logger.info("Completed merging of disconnected unassigned areas.")
 
-    return current_region
+def _local_fragments(graph: CSRGraph,
+                     available: bytearray,
+                     region: List[int]) -> Optional[List[List[int]]]:
+    """
+    Decides from region's surroundings whether taking region out of a connected set of
+    available nodes split it, without visiting the whole set.
+
+    A breadth-first search starts from every available neighbor of region. The searches
+    advance in turns; two searches that reach each other's nodes are joined, and the
+    remainder is still connected as soon as all of them are joined. A group of searches
+    that runs out of nodes has enumerated a detached fragment. Once at most one group is
+    still running, that group holds everything else, so the fragments to merge are known.
+
+    Returns:
+        List[List[int]] or None: The fragments to merge into region (empty if the remainder
+            is still connected), or None if the searches exceeded their budget of
+            _LOCAL_MERGE_BUDGET visits per region area, or a fragment outgrew the rest.
+    """
+    sources: List[int] = []
+    owner: Dict[int, int] = {}
+    for area in region:
+        for nbr in graph.neighbors(area).tolist():
+            if available[nbr] and nbr not in owner:
+                owner[nbr] = len(sources)
+                sources.append(nbr)
+    if len(sources) <= 1:
+        return []
+
+    parent = list(range(len(sources)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    queues = [deque([source]) for source in sources]
+    groups = len(sources)
+    budget = _LOCAL_MERGE_BUDGET * len(region)
+
+    while True:
+        emptied = False
+        for i, queue in enumerate(queues):
+            if not queue:
+                continue
+            for v in graph.neighbors(queue.popleft()).tolist():
+                if not available[v]:
+                    continue
+                j = owner.get(v)
+                if j is None:
+                    owner[v] = i
+                    queue.append(v)
+                    budget -= 1
+                else:
+                    ri, rj = find(i), find(j)
+                    if ri != rj:
+                        parent[ri] = rj
+                        groups -= 1
+                        if groups == 1:
+                            return []
+            emptied = emptied or not queue
+
+        if emptied:
+            running = {find(i) for i, queue in enumerate(queues) if queue}
+            if len(running) <= 1:
+                break
+        if budget <= 0:
+            return None
+
+    fragments: Dict[int, List[int]] = {}
+    for node, i in owner.items():
+        root = find(i)
+        if root not in running:
+            fragments.setdefault(root, []).append(node)
+    rest = available.count(1) - sum(map(len, fragments.values()))
+    if any(len(fragment) > rest for fragment in fragments.values()):
+        return None
+    return list(fragments.values())
+
 
 # ==============================
 # 5. Region Splitting Phase
 # ==============================
 
 
+def _boundary_of(graph: CSRGraph, region: np.ndarray, in_region: bytearray) -> np.ndarray:
+    """Returns the nodes of a region array that have a neighbor outside its membership mask."""
+    sources, neighbors = gather_neighbors(graph, region)
+    return region[np.unique(sources[~_mask_view(in_region)[neighbors]])]
+
+
+def _largest_component_of(graph: CSRGraph, region: np.ndarray) -> np.ndarray:
+    """Returns the largest connected component of a sorted region array, itself sorted."""
+    num_components, labels = component_labels(graph, region)
+    if num_components <= 1:
+        return region
+    return region[labels == np.argmax(np.bincount(labels))]
+
+
+def _locally_connected(graph: CSRGraph, in_region: bytearray, area: int) -> bool:
+    """
+    Returns True if the region neighbors of a just-removed area are still linked to each
+    other through region areas within two hops of it. That proves a previously connected
+    region is still connected; False only means the global check is needed.
+    """
+    nbrs = [u for u in graph.neighbors(area).tolist() if in_region[u]]
+    if len(nbrs) <= 1:
+        return True
+    ball = set(nbrs)
+    for u in nbrs:
+        ball.update(w for w in graph.neighbors(u).tolist() if in_region[w])
+    seen = {nbrs[0]}
+    stack = [nbrs[0]]
+    while stack:
+        for w in graph.neighbors(stack.pop()).tolist():
+            if w in ball and w not in seen:
+                seen.add(w)
+                stack.append(w)
+    return all(u in seen for u in nbrs)
+
+
+def _remove_area(graph: CSRGraph,
+                 region: np.ndarray,
+                 in_region: bytearray,
+                 area: int,
+                 connected: bool) -> np.ndarray:
+    """
+    Removes area from a sorted region array and its membership mask, then keeps only the
+    largest connected component. If connected is True the region was connected before the
+    removal, and the component pass only runs when _locally_connected cannot rule out a split.
+    """
+    in_region[area] = 0
+    region = region[region != area]
+    if connected and _locally_connected(graph, in_region, area):
+        return region
+    largest_component = _largest_component_of(graph, region)
+    if largest_component.size < region.size:
+        _mask_view(in_region)[region] = False
+        _mask_view(in_region)[largest_component] = True
+    return largest_component
+
+
 def remove_boundary_areas(region: Set[int],
                           excess_count: int,
-                          adj_list: Dict[int, Set[int]]) -> Set[int]:
+                          adj_list: Dict[int, Set[int]],
+                          graph: Optional[CSRGraph] = None) -> Set[int]:
     """
     Randomly removes boundary areas from a region until the specified excess count
     is removed, while ensuring that spatial contiguity is maintained.
@@ -283,6 +571,8 @@ def remove_boundary_areas(region: Set[int],
         region (Set[int]): The current set of area IDs in the region.
         excess_count (int): The number of areas to remove from the region.
         adj_list (Dict[int, Set[int]]): The adjacency list representing spatial neighbors.
+        graph (CSRGraph, optional): Prebuilt CSR graph of adj_list. Without it, one is
+            built from adj_list on every call, which costs O(V + E) for the whole map.
 
     Returns:
         Set[int]: The updated region after removing the excess boundary areas.
@@ -290,48 +580,44 @@ def remove_boundary_areas(region: Set[int],
     Raises:
         RuntimeError: If no boundary areas can be found to remove when needed.
     """
-    # Work on a copy so as not to modify the input region directly.
-    adjusted_region = region.copy()
+    graph = graph if graph is not None else as_csr_graph(adj_list)
+    adjusted_region = np.sort(graph.indices_of(region))
+    in_region = bytearray(graph.num_nodes)
+    _mask_view(in_region)[adjusted_region] = True
+    connected = False
 
     while excess_count > 0:
-        # Compute boundary areas. Since our utilities expect lists,
-        # we convert the adj_list from sets to lists.
-        boundary = find_boundary_areas(
-            adjusted_region, {k: list(v) for k, v in adj_list.items()})
-        if not boundary:
+        boundary = _boundary_of(graph, adjusted_region, in_region)
+        if not boundary.size:
             logger.error(
                 "No boundary areas found; cannot remove further without risking discontiguity.")
             raise RuntimeError(
                 "No boundary areas available for removal while splitting region.")
 
         # Randomly select a boundary area to remove.
-        area_to_remove = random.choice(list(boundary))
-        adjusted_region.remove(area_to_remove)
+        area_to_remove = int(boundary[random.randrange(boundary.size)])
         excess_count -= 1
-        logger.info(
-            f"Removed boundary area {area_to_remove} from region; {excess_count} removals remaining.")
-
-        # After removal, check spatial contiguity by building a subgraph.
-        sub_adj: Dict[int, List[int]] = {
-            area: list(adj_list.get(area, set()) & adjusted_region) for area in adjusted_region
-        }
-        components = find_connected_components(sub_adj)
-        if len(components) > 1:
-            # If fragmentation occurs, keep only the largest connected component.
-            largest_component = max(components, key=len)
-            removed = adjusted_region - largest_component
-            adjusted_region = largest_component
-            logger.warning(
-                f"Region split into multiple components. Keeping largest component with {len(adjusted_region)} areas; removed {removed}."
-            )
-            # Continue removal if further excess removal is needed.
+        count("split.boundary_removals")
+        if TRACER.sampled():
+            TRACER.emit("split.remove", area=graph.id_of(area_to_remove),
+                        remaining=excess_count)
 
-    return adjusted_region
+        # If the removal fragmented the region, keep only the largest connected component.
+        remaining = adjusted_region.size - 1
+        adjusted_region = _remove_area(
+            graph, adjusted_region, in_region, area_to_remove, connected)
+        connected = True
+        if adjusted_region.size < remaining:
+            count("split.fragmentations")
+            count("split.fragment_areas", remaining - adjusted_region.size)
+
+    return set(graph.ids_of(adjusted_region))
 
 
 def split_region(region: Set[int],
                  target_cardinality: int,
-                 adj_list: Dict[int, Set[int]]) -> Set[int]:
+                 adj_list: Dict[int, Set[int]],
+                 graph: Optional[CSRGraph] = None) -> Set[int]:
     """
     Adjusts a region’s size by removing excess areas to meet the target cardinality,
     while ensuring that the region remains spatially contiguous.
@@ -346,6 +632,8 @@ def split_region(region: Set[int],
         region (Set[int]): The set of area IDs currently in the region.
         target_cardinality (int): The required number of areas for the region.
         adj_list (Dict[int, Set[int]]): The neighborhood graph represented as an adjacency list.
+        graph (CSRGraph, optional): Prebuilt CSR graph of adj_list. Without it, one is
+            built from adj_list on every call, which costs O(V + E) for the whole map.
 
     Returns:
         Set[int]: The adjusted region that meets the target cardinality.
@@ -353,6 +641,18 @@ def split_region(region: Set[int],
     Raises:
         ValueError: If the region size is below the target cardinality.
     """
+    if len(region) == target_cardinality:
+        return region
+    graph = graph if graph is not None else as_csr_graph(adj_list)
+    return set(graph.ids_of(
+        _split_region(graph, np.sort(graph.indices_of(region)), target_cardinality)))
+
+
+def _split_region(graph: CSRGraph, region: np.ndarray, target_cardinality: int) -> np.ndarray:
+    """
+    Dense-index implementation of split_region over a sorted array of region nodes.
+    Boundary detection and contiguity checks are vectorized over the region's edges.
+    """
     current_size = len(region)
     if current_size < target_cardinality:
         error_msg = (
@@ -361,69 +661,69 @@ def split_region(region: Set[int],
         raise ValueError(error_msg)
 
     if current_size == target_cardinality:
-        logger.info(
-            "Region size matches the target cardinality; no splitting needed.")
         return region
 
     excess_count = current_size - target_cardinality
-    logger.info(
-        f"Splitting region: current size = {current_size}, target = {target_cardinality}, "
-        f"excess areas to remove = {excess_count}."
-    )
+    count("split.regions")
+    logger.debug("Splitting region of %d areas down to %d.", current_size, target_cardinality)
 
     # Remove excess boundary areas until the region size matches the target.
-    adjusted_region = region.copy()
-    removed_areas = set()
+    adjusted_region = region
+    removed_areas: List[int] = []
+    in_region = bytearray(graph.num_nodes)
+    _mask_view(in_region)[region] = True
+    # The merged region need not be connected; the first removal checks it globally.
+    connected = False
 
     while excess_count > 0:
-        boundary = find_boundary_areas(
-            adjusted_region, {k: list(v) for k, v in adj_list.items()})
+        boundary = _boundary_of(graph, adjusted_region, in_region)
 
-        if not boundary:
-            logger.warning(
-                "No more removable boundary areas without risking discontiguity.")
+        if not boundary.size:
+            count("split.boundary_exhausted")
             break  # Stop if further removals could fragment the region
 
-        area_to_remove = random.choice(list(boundary))
-        adjusted_region.remove(area_to_remove)
-        removed_areas.add(area_to_remove)
+        area_to_remove = int(boundary[random.randrange(boundary.size)])
+        removed_areas.append(area_to_remove)
         excess_count -= 1
-        logger.info(
-            f"Removed boundary area {area_to_remove} from region; {excess_count} removals remaining.")
-
-        # After removal, check spatial contiguity by building a subgraph.
-        sub_adj: Dict[int, List[int]] = {
-            area: list(adj_list.get(area, set()) & adjusted_region) for area in adjusted_region
-        }
-        components = find_connected_components(sub_adj)
-
-        if len(components) > 1:
-            # Keep only the largest connected component.
-            largest_component = max(components, key=len)
-            removed_areas.update(adjusted_region - largest_component)
-            adjusted_region = largest_component
-            logger.warning(
-                f"Region split into multiple components. Keeping largest component with {len(adjusted_region)} areas; removed {removed_areas}."
-            )
+        count("split.boundary_removals")
+        if TRACER.sampled():
+            TRACER.emit("split.remove", area=graph.id_of(area_to_remove),
+                        remaining=excess_count)
+
+        # Keep only the largest connected component if the removal fragmented the region.
+        remaining = adjusted_region[adjusted_region != area_to_remove]
+        adjusted_region = _remove_area(
+            graph, adjusted_region, in_region, area_to_remove, connected)
+        connected = True
+        if adjusted_region.size < remaining.size:
+            removed_areas.extend(np.setdiff1d(
+                remaining, adjusted_region, assume_unique=True).tolist())
+            count("split.fragmentations")
+            count("split.fragment_areas", remaining.size - adjusted_region.size)
 
     # If the final adjusted region is smaller than `target_cardinality`, reassign some removed areas
     if len(adjusted_region) < target_cardinality:
         needed_count = target_cardinality - len(adjusted_region)
-        logger.warning(
-            f"Final region too small ({len(adjusted_region)}). Reassigning {needed_count} areas from removed areas.")
+        count("split.refills")
+        members = adjusted_region.tolist()
 
         while needed_count > 0 and removed_areas:
             # Add back a removed area that is adjacent to the current region
-            for area in removed_areas:
-                if any(neighbor in adjusted_region for neighbor in adj_list.get(area, [])):
-                    adjusted_region.add(area)
+            added = False
+            for area in list(removed_areas):
+                if any(in_region[neighbor] for neighbor in graph.neighbors(area).tolist()):
+                    in_region[area] = 1
+                    members.append(area)
                     removed_areas.remove(area)
+                    added = True
                     needed_count -= 1
                     if needed_count == 0:
                         break
+            if not added:
+                break
+        adjusted_region = np.sort(np.asarray(members, dtype=np.int64))
 
-    logger.info(
-        f"Region splitting complete. Final region size is {len(adjusted_region)} areas.")
+    logger.debug("Region splitting complete. Final region size is %d areas.", len(adjusted_region))
 
     return adjusted_region
 
@@ -453,29 +753,50 @@ def run_prrp(areas: List[Dict], num_regions: int, cardinalities: List[int]) -> L
     adj_list = construct_adjacency_list(areas)
     # Ensure that all neighbor values are sets.
     adj_list = {k: set(v) for k, v in adj_list.items()}
-    available_areas = set(adj_list.keys())
+    graph = CSRGraph.from_adjacency(adj_list)
+    return _run_prrp_on_graph(adj_list, graph, cardinalities)
+
+
+def _run_prrp_on_graph(adj_list: Dict[int, Set[int]],
+                       graph: CSRGraph,
+                       cardinalities: List[int]) -> List[Set[int]]:
+    """
+    Runs one PRRP solution on a prebuilt adjacency list and its CSR graph.
+
+    Neither adj_list nor graph is modified, so both can be shared by many solutions.
+    cardinalities is sorted in place in descending order, matching the region order.
+    The working sets are dense: unassigned areas are a one-byte-per-node mask over graph,
+    and regions are arrays of dense indices until they are returned as sets of area IDs.
+    """
+    available = bytearray(b"\x01") * graph.num_nodes
+    seed_index = GaplessSeedIndex(graph)
+    # After the first merge, the available areas are always a single component.
+    remainder_connected = False
 
     # Sort cardinalities in descending order.
     cardinalities.sort(reverse=True)
 
     regions = []
     for target_cardinality in cardinalities:
-        logger.info(f"Growing region with target size: {target_cardinality}")
+        logger.debug("Growing region with target size: %d", target_cardinality)
 
         try:
             # Grow the region.
-            region = grow_region(adj_list, available_areas, target_cardinality)
+            region = _grow_region(graph, available, target_cardinality, seed_index=seed_index)
             # Only perform merge/split if there remain unassigned areas.
-            if available_areas:
-                merged_region = merge_disconnected_areas(
-                    adj_list, available_areas, region)
-                final_region = split_region(
-                    merged_region, target_cardinality, adj_list)
+            if 1 in available:
+                _merge_disconnected_areas(graph, available, region, connected=remainder_connected)
+                remainder_connected = True
+                final_region = _split_region(
+                    graph, np.sort(np.asarray(region, dtype=np.int64)), target_cardinality)
             else:
                 # If no areas remain unassigned, no merge or split is needed.
                 final_region = region
-            regions.append(final_region)
-            logger.info(f"Region finalized with {len(final_region)} areas.")
+            # The grown region, including merged components, has left the available mask.
+            for area in region:
+                seed_index.assign(area)
+            regions.append(set(graph.ids_of(final_region)))
+            logger.debug("Region finalized with %d areas.", len(final_region))
         except Exception as e:
             logger.error(f"Failed to generate region: {e}")
             return []  # Return an empty result indicating failure
@@ -487,30 +808,323 @@ def run_prrp(areas: List[Dict], num_regions: int, cardinalities: List[int]) -> L
 # 7. Parallel Execution of PRRP
 # ==============================
 
+# Adjacency installed once per pool worker by _init_prrp_worker.
+_worker_graph: Dict[str, Any] = {}
+
 
-def _prrp_worker(seed_value: int,
-                 areas: List[Dict[str, Any]],
-                 num_regions: int,
-                 cardinalities: List[int]) -> List[Set[int]]:
+def _init_prrp_worker(adj_list: Dict[int, Set[int]]) -> None:
     """
-    Worker function for parallel PRRP execution. Sets a unique random seed
-    for statistical independence, executes one full PRRP solution, and returns it.
+    Pool initializer: receives the prebuilt adjacency list once per worker process and
+    builds the worker's CSR graph from it, so tasks only need to carry a seed.
+    """
+    _worker_graph["adj_list"] = adj_list
+    _worker_graph["graph"] = CSRGraph.from_adjacency(adj_list)
+
+
+def solve_with_seed(seed_value: int,
+                    adj_list: Dict[int, Set[int]],
+                    graph: CSRGraph,
+                    cardinalities: List[int]) -> List[Set[int]]:
+    """
+    Seeds the global random module and runs one PRRP solution on a prebuilt graph. The same
+    seed, adjacency and cardinalities always give the same solution, wherever it runs.
 
     Parameters:
-        seed_value (int): The random seed for this worker.
-        areas (List[Dict[str, Any]]): List of spatial areas (each area is a dict with keys such as 'id' and 'geometry').
-        num_regions (int): The number of regions to create in this solution.
+        seed_value (int): The random seed of the solution.
+        adj_list (Dict[int, Set[int]]): The adjacency list, with set-valued neighbors. It is
+            not modified.
+        graph (CSRGraph): CSRGraph.from_adjacency(adj_list), built once and reused.
+        cardinalities (List[int]): List of target sizes for each region.
+
+    Returns:
+        List[Set[int]]: The regions of the solution.
+    """
+    random.seed(seed_value)
+    logger.debug("Worker started with seed %d.", seed_value)
+    solution = _run_prrp_on_graph(adj_list, graph, list(cardinalities))
+    logger.debug("Worker with seed %d completed a solution.", seed_value)
+    return solution
+
+
+def _prrp_worker(seed_value: int, cardinalities: List[int]) -> List[Set[int]]:
+    """
+    Worker function for parallel PRRP execution. Runs one solution on the adjacency
+    installed by _init_prrp_worker.
+
+    Parameters:
+        seed_value (int): The random seed for this solution.
         cardinalities (List[int]): A list specifying the target cardinality for each region.
 
     Returns:
         List[Set[int]]: A single PRRP solution, represented as a list of sets where each set contains area IDs for a region.
     """
-    random.seed(seed_value)
-    logger.info(f"Worker started with seed {seed_value}.")
-    solution = run_prrp(areas, num_regions, cardinalities)
-    logger.info(f"Worker with seed {seed_value} completed a solution.")
+    return solve_with_seed(seed_value, _worker_graph["adj_list"],
+                           _worker_graph["graph"], cardinalities)
 
-    return solution
+
+def _prrp_seeded_worker(task: Tuple[int, List[int], bool]) -> Tuple[int, Any]:
+    """
+    Single-argument variant of _prrp_worker for map and imap_unordered. Returns the seed with
+    the solution so that results arriving out of order can still be traced to their seed.
+    With compact set, the solution is sent back as its int32 label array, which pickles to
+    4 bytes per area instead of a list of sets.
+    """
+    seed_value, cardinalities, compact = task
+    solution = _prrp_worker(seed_value, cardinalities)
+    if compact:
+        return seed_value, Solution.from_regions(solution, _worker_graph["graph"]).labels
+    return seed_value, solution
+
+
+def random_seeds(count: int) -> Iterator[int]:
+    """
+    Lazily yields count random seeds for solve_with_seed, from a generator seeded by the
+    global random module, so the seeds are reproducible under random.seed() without being
+    materialized up front.
+
+    Parameters:
+        count (int): Number of seeds.
+
+    Returns:
+        Iterator[int]: The seeds.
+    """
+    rng = random.Random(random.getrandbits(64))
+    for _ in range(count):
+        yield rng.randint(0, 2**31 - 1)
+
+
+class PRRPExecutor:
+    """
+    A persistent pool of PRRP workers that share one prebuilt adjacency list.
+
+    The adjacency is constructed once from the areas and shipped to every worker through
+    the pool initializer; each task then carries only a seed and the cardinalities. The
+    pool is started on first use and reused by every call to run() until close().
+
+    Example:
+        with PRRPExecutor(areas, num_workers=4) as executor:
+            first = executor.run(5, cardinalities, solutions_count=100)
+            second = executor.run(8, other_cardinalities, solutions_count=100)
+    """
+
+    def __init__(self, areas: Any, num_workers: int = None):
+        """
+        Parameters:
+            areas (GeoDataFrame, list, or dict): Spatial areas or a pre-built adjacency list,
+                as accepted by construct_adjacency_list.
+            num_workers (int, optional): Number of worker processes. Defaults to cpu_count().
+        """
+        adj_list = construct_adjacency_list(areas)
+        self.adj_list = {k: set(v) for k, v in adj_list.items()}
+        # Built from the same dict as in every worker, so dense indices agree across processes.
+        self.graph = CSRGraph.from_adjacency(self.adj_list)
+        self.num_workers = num_workers or cpu_count()
+        self._pool = None
+        # (stopped, slots) of every imap stream still open, so close() can unblock them.
+        self._streams: Set[Tuple[threading.Event, threading.Semaphore]] = set()
+
+    def _unpack(self, solution: Any, compact: bool) -> Any:
+        return Solution(solution, self.graph) if compact else solution
+
+    def _get_pool(self) -> Pool:
+        if self._pool is None:
+            logger.info(
+                f"Starting a pool of {self.num_workers} PRRP worker(s).")
+            self._pool = Pool(processes=self.num_workers,
+                              initializer=_init_prrp_worker,
+                              initargs=(self.adj_list,))
+        return self._pool
+
+    def run(self,
+            num_regions: int,
+            cardinalities: List[int],
+            solutions_count: int,
+            seeds: List[int] = None,
+            compact: bool = False) -> List[Any]:
+        """
+        Generates independent PRRP solutions on the pool.
+
+        Parameters:
+            num_regions (int): Number of regions to create per solution.
+            cardinalities (List[int]): List of target sizes for each region.
+            solutions_count (int): Number of solutions to generate.
+            seeds (List[int], optional): One random seed per solution. Drawn at random if omitted.
+            compact (bool): If True, return each solution as a label-array Solution over
+                self.graph instead of a list of sets.
+
+        Returns:
+            List[List[Set[int]]] or List[Solution]: The solutions, in seed order.
+
+        Raises:
+            ValueError: If num_regions does not match the cardinalities or seeds has the wrong length.
+        """
+        if num_regions != len(cardinalities):
+            raise ValueError(
+                "Number of regions must match the length of the cardinalities list.")
+        if seeds is None:
+            seeds = [random.randint(0, 2**31 - 1)
+                     for _ in range(solutions_count)]
+        elif len(seeds) != solutions_count:
+            raise ValueError("Expected one seed per solution.")
+        tasks = [(seed, list(cardinalities), compact) for seed in seeds]
+        return [self._unpack(solution, compact)
+                for _, solution in self._get_pool().map(_prrp_seeded_worker, tasks)]
+
+    def imap(self,
+             num_regions: int,
+             cardinalities: List[int],
+             solutions_count: int,
+             seeds: Optional[Iterable[int]] = None,
+             prefetch: Optional[int] = None,
+             compact: bool = False) -> Iterator[Tuple[int, Any]]:
+        """
+        Generates independent PRRP solutions on the pool and yields them as they complete.
+
+        At most prefetch solutions are queued or in flight at any time: a new task is only
+        handed to the pool once the consumer has taken a finished solution. Memory therefore
+        stays flat however many solutions are requested, and a slow consumer throttles the
+        workers instead of letting results pile up. Closing the iterator early stops
+        submitting tasks; solutions already in flight are discarded. Closing the executor
+        stops every open iterator the same way. The pool feeds tasks from one thread, so
+        other calls on this executor wait until the iterator is done.
+
+        Parameters:
+            num_regions (int): Number of regions to create per solution.
+            cardinalities (List[int]): List of target sizes for each region.
+            solutions_count (int): Number of solutions to generate.
+            seeds (Iterable[int], optional): One random seed per solution, consumed lazily.
+                Drawn at random if omitted.
+            prefetch (int, optional): Maximum number of outstanding solutions.
+                Defaults to twice the number of workers.
+            compact (bool): If True, yield label-array Solutions instead of lists of sets.
+
+        Returns:
+            Iterator[Tuple[int, Any]]: (seed, solution) pairs in completion order.
+
+        Raises:
+            ValueError: If num_regions does not match the cardinalities or prefetch is not positive.
+        """
+        if num_regions != len(cardinalities):
+            raise ValueError(
+                "Number of regions must match the length of the cardinalities list.")
+        prefetch = prefetch or 2 * self.num_workers
+        if prefetch < 1:
+            raise ValueError("prefetch must be positive.")
+        seeds = random_seeds(solutions_count) if seeds is None else seeds
+        return self._imap(list(cardinalities), solutions_count, seeds, prefetch, compact)
+
+    def _imap(self,
+              cardinalities: List[int],
+              solutions_count: int,
+              seeds: Iterable[int],
+              prefetch: int,
+              compact: bool) -> Iterator[Tuple[int, Any]]:
+        # The pool's task handler thread pulls from tasks(); each pull waits for a free slot,
+        # and the consumer frees one slot per solution it receives.
+        slots = threading.Semaphore(prefetch)
+        stopped = threading.Event()
+        stream = (stopped, slots)
+        self._streams.add(stream)
+
+        def tasks() -> Iterator[Tuple[int, List[int], bool]]:
+            for _, seed in zip(range(solutions_count), seeds):
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                yield seed, cardinalities, compact
+
+        results = self._get_pool().imap_unordered(_prrp_seeded_worker, tasks())
+        try:
+            for _ in range(solutions_count):
+                try:
+                    seed, solution = next(results)
+                except StopIteration:
+                    break
+                slots.release()
+                yield seed, self._unpack(solution, compact)
+        finally:
+            self._streams.discard(stream)
+            stopped.set()
+            slots.release()
+
+    def close(self) -> None:
+        """
+        Shuts the worker pool down. Open imap iterators stop submitting tasks, so a partly
+        consumed iterator does not keep the pool alive. The executor can be reused; a new
+        pool starts on demand.
+        """
+        for stopped, slots in list(self._streams):
+            stopped.set()
+            slots.release()
+        self._streams.clear()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "PRRPExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def iter_prrp_solutions(areas: Any,
+                        num_regions: int,
+                        cardinalities: List[int],
+                        solutions_count: int,
+                        num_threads: int = None,
+                        use_multiprocessing: bool = True,
+                        seeds: Optional[Iterable[int]] = None,
+                        prefetch: Optional[int] = None,
+                        compact: bool = False) -> Iterator[Tuple[int, Any]]:
+    """
+    Streams independent PRRP solutions as they are generated. Unlike run_parallel_prrp, which
+    returns only once every solution exists, this lets the caller aggregate or store each
+    solution while later ones are still being computed, with bounded memory.
+
+    Parameters:
+        areas (GeoDataFrame, list, or dict): Spatial areas or a pre-built adjacency list.
+        num_regions (int): Number of regions to create per solution.
+        cardinalities (List[int]): List of target sizes for each region.
+        solutions_count (int): Number of independent PRRP solutions to generate.
+        num_threads (int, optional): Number of worker processes. Defaults to min(solutions_count, cpu_count()).
+        use_multiprocessing (bool, optional): If False, solutions are generated one at a time in this process.
+        seeds (Iterable[int], optional): One random seed per solution. Drawn at random if omitted.
+        prefetch (int, optional): Maximum number of outstanding solutions; see PRRPExecutor.imap.
+        compact (bool, optional): If True, yield label-array Solutions instead of lists of sets.
+
+    Returns:
+        Iterator[Tuple[int, Any]]: (seed, solution) pairs, in completion order when
+            multiprocessing is used and in seed order otherwise.
+
+    Raises:
+        ValueError: If num_regions does not match the length of cardinalities.
+    """
+    if num_regions != len(cardinalities):
+        raise ValueError(
+            "Number of regions must match the length of the cardinalities list.")
+    if seeds is None:
+        seeds = random_seeds(solutions_count)
+    return _iter_prrp_solutions(areas, num_regions, cardinalities, solutions_count,
+                                num_threads, use_multiprocessing, seeds, prefetch, compact)
+
+
+def _iter_prrp_solutions(areas, num_regions, cardinalities, solutions_count,
+                         num_threads, use_multiprocessing, seeds, prefetch, compact):
+    """Generator behind iter_prrp_solutions, split off so arguments are checked eagerly."""
+    if use_multiprocessing:
+        num_threads = num_threads or max(1, min(solutions_count, cpu_count()))
+        with PRRPExecutor(areas, num_workers=num_threads) as executor:
+            yield from executor.imap(num_regions, cardinalities, solutions_count,
+                                     seeds=seeds, prefetch=prefetch, compact=compact)
+    else:
+        adj_list = {k: set(v)
+                    for k, v in construct_adjacency_list(areas).items()}
+        graph = CSRGraph.from_adjacency(adj_list)
+        for _, seed in zip(range(solutions_count), seeds):
+            solution = solve_with_seed(seed, adj_list, graph, cardinalities)
+            yield seed, Solution.from_regions(solution, graph) if compact else solution
 
 
 def run_parallel_prrp(areas: List[Dict[str, Any]],
@@ -518,9 +1132,23 @@ def run_parallel_prrp(areas: List[Dict[str, Any]],
                       cardinalities: List[int],
                       solutions_count: int,
                       num_threads: int = None,
-                      use_multiprocessing: bool = True) -> List[List[Set[int]]]:
+                      use_multiprocessing: bool = True,
+                      compact: bool = False,
+                      checkpoint_path: Optional[str] = None,
+                      root_seed: Optional[int] = None) -> List[Any]:
     """
-    Runs multiple independent PRRP solutions in parallel.
+    Runs multiple independent PRRP solutions in parallel. The adjacency list is built once
+    and shared by all solutions; use PRRPExecutor directly to keep the pool across calls,
+    or iter_prrp_solutions to consume solutions while they are being generated.
+
+    With checkpoint_path, every solution is appended to a checkpoint file as soon as it
+    completes (see src/checkpoint.py). Rerunning the same call after a failure resumes from
+    that file: solutions already recorded are not generated again, and the seeds of the
+    missing ones are rederived from the root seed stored in the checkpoint.
+
+    With root_seed, the seed of every solution is derived from root_seed and the solution's
+    index (see checkpoint.solution_seed), so the ensemble is reproducible and can be split
+    across hosts with run_prrp_shard.
 
     Parameters:
         areas (List[Dict[str, Any]]): List of spatial areas with required attributes (e.g., 'id' and 'geometry').
@@ -530,9 +1158,14 @@ def run_parallel_prrp(areas: List[Dict[str, Any]],
         num_threads (int, optional): Number of parallel threads/processes to use. If None, it defaults to min(solutions_count, cpu_count()).
         use_multiprocessing (bool, optional): If True, uses multiprocessing; otherwise, executes sequentially.
             Defaults to True.
+        compact (bool, optional): If True, return label-array Solutions (see src/solution.py)
+            instead of lists of sets. Defaults to False.
+        checkpoint_path (str, optional): Checkpoint file to record solutions in and resume from.
+        root_seed (int, optional): Root seed of the ensemble. Seeds are drawn at random if omitted.
 
     Returns:
-        List[List[Set[int]]]: A list of PRRP solutions. Each solution is a list of sets (each set represents a region).
+        List[List[Set[int]]]: A list of PRRP solutions. Each solution is a list of sets (each set represents a region),
+            or a Solution if compact is True.
     """
     # Determine the number of threads/processes to use.
     if num_threads is None:
@@ -540,36 +1173,192 @@ def run_parallel_prrp(areas: List[Dict[str, Any]],
     logger.info(
         f"Preparing to generate {solutions_count} PRRP solutions using {num_threads} parallel worker(s).")
 
+    if checkpoint_path is not None:
+        return _run_with_checkpoint(areas, num_regions, cardinalities, solutions_count,
+                                    num_threads, use_multiprocessing, compact, checkpoint_path,
+                                    root_seed)
+
     # Generate unique random seeds for each solution.
-    seeds = [random.randint(0, 2**31 - 1) for _ in range(solutions_count)]
+    if root_seed is not None:
+        seeds = ensemble_seeds(root_seed, solutions_count)
+    else:
+        seeds = [random.randint(0, 2**31 - 1) for _ in range(solutions_count)]
     logger.info(
         f"Generated {solutions_count} random seeds for PRRP solutions.")
 
-    solutions = []
     if use_multiprocessing:
         logger.info(
             "Starting parallel execution of PRRP solutions using multiprocessing.")
-        with Pool(processes=num_threads) as pool:
-            # Each worker gets a unique seed, along with the areas, number of regions, and cardinalities.
-            worker_args = [(seed, areas, num_regions, cardinalities)
-                           for seed in seeds]
-            solutions = pool.starmap(_prrp_worker, worker_args)
+        with PRRPExecutor(areas, num_workers=num_threads) as executor:
+            solutions = executor.run(
+                num_regions, cardinalities, solutions_count, seeds=seeds, compact=compact)
         logger.info("Parallel execution of PRRP solutions completed.")
     else:
         logger.info(
             "Parallelization disabled; executing PRRP solutions sequentially.")
-        for seed in seeds:
-            solutions.append(_prrp_worker(
-                seed, areas, num_regions, cardinalities))
+        if num_regions != len(cardinalities):
+            raise ValueError(
+                "Number of regions must match the length of the cardinalities list.")
+        adj_list = {k: set(v)
+                    for k, v in construct_adjacency_list(areas).items()}
+        graph = CSRGraph.from_adjacency(adj_list)
+        solutions = [solve_with_seed(seed, adj_list, graph, cardinalities)
+                     for seed in seeds]
+        if compact:
+            solutions = [Solution.from_regions(solution, graph) for solution in solutions]
         logger.info("Sequential execution of PRRP solutions completed.")
 
     return solutions
 
 
+def _fill_checkpoint(checkpoint: SolutionCheckpoint,
+                     adj_list: Dict[int, Set[int]],
+                     num_regions: int,
+                     cardinalities: List[int],
+                     indices: Iterable[int],
+                     num_threads: Optional[int],
+                     use_multiprocessing: bool) -> None:
+    """
+    Generates the solutions among indices that are missing from a checkpoint and appends
+    each one as it completes.
+    """
+    missing = checkpoint.missing(indices)
+    logger.info(
+        f"Checkpoint {checkpoint.file_path} is missing {len(missing)} solution(s) of the "
+        f"requested range; generating them.")
+    if not missing:
+        return
+
+    # Completed solutions come back in any order; map each seed to its open positions.
+    seeds = [checkpoint.seed(index) for index in missing]
+    pending: Dict[int, List[int]] = {}
+    for index, seed in zip(missing, seeds):
+        pending.setdefault(seed, []).append(index)
+    stream = iter_prrp_solutions(adj_list, num_regions, cardinalities, len(missing),
+                                 num_threads=num_threads or None,
+                                 use_multiprocessing=use_multiprocessing,
+                                 seeds=seeds, compact=True)
+    for seed, solution in stream:
+        checkpoint.append(pending[seed].pop(), seed, solution)
+
+
+def _run_with_checkpoint(areas: Any,
+                         num_regions: int,
+                         cardinalities: List[int],
+                         solutions_count: int,
+                         num_threads: int,
+                         use_multiprocessing: bool,
+                         compact: bool,
+                         checkpoint_path: str,
+                         root_seed: Optional[int]) -> List[Any]:
+    """
+    Checkpointed variant of run_parallel_prrp: generates only the solutions missing from the
+    checkpoint, appends each one as it completes and returns all of them in ensemble order.
+    """
+    if num_regions != len(cardinalities):
+        raise ValueError(
+            "Number of regions must match the length of the cardinalities list.")
+    adj_list = {k: set(v) for k, v in construct_adjacency_list(areas).items()}
+    graph = CSRGraph.from_adjacency(adj_list)
+
+    with SolutionCheckpoint(checkpoint_path, graph, cardinalities, root_seed) as checkpoint:
+        _fill_checkpoint(checkpoint, adj_list, num_regions, cardinalities,
+                         range(solutions_count), num_threads, use_multiprocessing)
+        stored = {index: solution for index, _, solution in checkpoint.solutions()
+                  if index < solutions_count}
+
+    solutions = [stored[index] for index in range(solutions_count)]
+    return solutions if compact else [solution.to_regions() for solution in solutions]
+
+
+def run_prrp_shard(areas: Any,
+                   num_regions: int,
+                   cardinalities: List[int],
+                   solutions_count: int,
+                   root_seed: int,
+                   num_shards: int,
+                   shard_index: int,
+                   shard_path: str,
+                   num_threads: int = None,
+                   use_multiprocessing: bool = True) -> range:
+    """
+    Generates one shard of an ensemble and records it in a shard file.
+
+    The ensemble of solutions_count solutions is split into num_shards contiguous index
+    ranges. Solution i is always generated from the seed derived from root_seed and i, so
+    hosts can run their shards independently, and merge_prrp_shards combines the shard
+    files into exactly the ensemble that run_parallel_prrp(..., root_seed=root_seed) returns.
+    A shard file is a checkpoint, so rerunning an interrupted shard resumes it.
+
+    Parameters:
+        areas (GeoDataFrame, list, or dict): Spatial areas or a pre-built adjacency list.
+        num_regions (int): Number of regions to create per solution.
+        cardinalities (List[int]): List of target sizes for each region.
+        solutions_count (int): Size of the whole ensemble.
+        root_seed (int): Root seed shared by all shards of the ensemble.
+        num_shards (int): Number of shards the ensemble is split into.
+        shard_index (int): The shard to generate, from 0 to num_shards - 1.
+        shard_path (str): File the shard's solutions are written to.
+        num_threads (int, optional): Number of worker processes on this host.
+        use_multiprocessing (bool, optional): If False, solutions are generated in this process.
+
+    Returns:
+        range: The solution indices covered by this shard.
+
+    Raises:
+        ValueError: If num_regions does not match the cardinalities or shard_index is out of range.
+    """
+    if num_regions != len(cardinalities):
+        raise ValueError(
+            "Number of regions must match the length of the cardinalities list.")
+    indices = shard_range(solutions_count, num_shards, shard_index)
+    adj_list = {k: set(v) for k, v in construct_adjacency_list(areas).items()}
+    graph = CSRGraph.from_adjacency(adj_list)
+    logger.info(
+        f"Generating shard {shard_index + 1}/{num_shards} (solutions {indices.start} to "
+        f"{indices.stop - 1}) into {shard_path}.")
+    with SolutionCheckpoint(shard_path, graph, cardinalities, root_seed) as checkpoint:
+        _fill_checkpoint(checkpoint, adj_list, num_regions, cardinalities,
+                         indices, num_threads, use_multiprocessing)
+    return indices
+
+
+def merge_prrp_shards(areas: Any,
+                      cardinalities: List[int],
+                      solutions_count: int,
+                      shard_paths: Iterable[str],
+                      compact: bool = False) -> List[Any]:
+    """
+    Combines the shard files written by run_prrp_shard into the whole ensemble. Co-assignment
+    accumulators saved by the hosts are combined with coassignment.merge_accumulator_shards.
+
+    Parameters:
+        areas (GeoDataFrame, list, or dict): The spatial areas the shards were generated on.
+        cardinalities (List[int]): List of target sizes for each region.
+        solutions_count (int): Size of the whole ensemble.
+        shard_paths (Iterable[str]): The shard files.
+        compact (bool, optional): If True, return label-array Solutions instead of lists of sets.
+
+    Returns:
+        List[Any]: The solutions in index order.
+
+    Raises:
+        ValueError: If the shards belong to different ensembles or do not cover every solution.
+    """
+    adj_list = {k: set(v) for k, v in construct_adjacency_list(areas).items()}
+    graph = CSRGraph.from_adjacency(adj_list)
+    solutions = merge_shards(shard_paths, graph, cardinalities, solutions_count)
+    return solutions if compact else [solution.to_regions() for solution in solutions]
+
+
 # ==============================
 # 8. Main Execution Block
 # ==============================
 if __name__ == "__main__":
+    # Logging is configured by the application, never at import time.
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
     # Load the shapefile data.
     # get the absolute path to the shapefile.
     shapefile_path = os.path.abspath(os.path.join(
@@ -596,3 +1385,4 @@ if __name__ == "__main__":
     parallel_solutions = run_parallel_prrp(
         sample_areas, num_regions, cardinalities, solutions_count=3, num_threads=2, use_multiprocessing=True)
     logger.info(f"Generated parallel PRRP solutions: {parallel_solutions}")
+    log_counters()
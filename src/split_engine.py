@@ -0,0 +1,204 @@
+"""
+split_engine.py
+
+This module provides the partition splitting engine used by graph-based PRRP.
+
+Splitting peels boundary nodes off an oversized partition while keeping it connected,
+which requires knowing which nodes are articulation points of the partition's induced
+subgraph. ArticulationTracker computes the biconnected blocks of that subgraph once,
+which gives every node's status exactly. Removing a node can only change the status of
+nodes that shared a block with it, so each removal invalidates just those blocks; a
+stale status is re-derived on demand by a local separation search around the node
+instead of another pass over the partition.
+"""
+
+import logging
+import random
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from src.csr_graph import CSRGraph, biconnected_blocks
+from src.utils import RandomAccessSet
+
+logger = logging.getLogger(__name__)
+
+
+class ArticulationTracker:
+    """
+    Maintains the articulation points of the subgraph induced by a shrinking node set.
+
+    Blocks only ever shrink or split under node removal, so the blocks found at
+    construction time bound where statuses can change. Every block carries a version
+    that is bumped when one of its members is removed; a node's cached status is valid
+    while the versions of all blocks it belongs to are unchanged.
+    """
+
+    def __init__(self, graph: CSRGraph, nodes: Iterable[int]):
+        """
+        Parameters:
+            graph (CSRGraph): The graph.
+            nodes (Iterable[int]): Dense nodes of the induced subgraph to track.
+        """
+        self.graph = graph
+        self.nodes: Set[int] = set(nodes)
+        blocks = biconnected_blocks(graph, self.nodes)
+        self._block_version: List[int] = [0] * len(blocks)
+        self._node_blocks: Dict[int, List[int]] = {node: [] for node in self.nodes}
+        for block_id, block in enumerate(blocks):
+            for node in block:
+                self._node_blocks[node].append(block_id)
+        # node -> (version stamp, is articulation point)
+        self._status: Dict[int, Tuple[int, bool]] = {
+            node: (0, len(block_ids) > 1) for node, block_ids in self._node_blocks.items()}
+
+    def __contains__(self, node: int) -> bool:
+        return node in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _stamp(self, node: int) -> int:
+        return sum(self._block_version[block_id] for block_id in self._node_blocks[node])
+
+    def is_articulation_point(self, node: int) -> bool:
+        """
+        Returns True if removing node would disconnect the current induced subgraph.
+
+        Raises:
+            KeyError: If node is not tracked.
+        """
+        if node not in self.nodes:
+            raise KeyError(node)
+        stamp = self._stamp(node)
+        cached_stamp, is_ap = self._status[node]
+        if cached_stamp != stamp:
+            is_ap = self._separates(node)
+            self._status[node] = (stamp, is_ap)
+        return is_ap
+
+    @property
+    def articulation_points(self) -> Set[int]:
+        return {node for node in self.nodes if self.is_articulation_point(node)}
+
+    def remove(self, node: int) -> None:
+        """
+        Removes node from the tracked subgraph, invalidating the blocks that contained it.
+
+        Raises:
+            KeyError: If node is not tracked.
+        """
+        self.nodes.remove(node)
+        del self._status[node]
+        for block_id in self._node_blocks.pop(node):
+            self._block_version[block_id] += 1
+
+    def _separates(self, x: int) -> bool:
+        """
+        Decides whether x is an articulation point of the current induced subgraph.
+
+        One breadth-first search starts from each neighbor of x (avoiding x), and the
+        searches advance in lockstep. Searches that meet are merged. If all of them merge,
+        x is not an articulation point; if some merged group runs out of nodes first, it
+        has explored a whole component that the others cannot reach, so x is one. The
+        cost is bounded by the smallest side of the separation rather than the subgraph.
+        """
+        nodes = self.nodes
+        indptr, indices = self.graph.indptr, self.graph.indices
+        starts = list(dict.fromkeys(
+            v for v in indices[indptr[x]:indptr[x + 1]].tolist() if v in nodes))
+        if len(starts) <= 1:
+            return False
+
+        leader = list(range(len(starts)))
+
+        def find(i: int) -> int:
+            while leader[i] != i:
+                leader[i] = leader[leader[i]]
+                i = leader[i]
+            return i
+
+        owner: Dict[int, int] = {x: -1}
+        queues = [deque() for _ in starts]
+        groups = len(starts)
+        for i, start in enumerate(starts):
+            owner[start] = i
+            queues[i].append(start)
+
+        while True:
+            for i in range(len(starts)):
+                if leader[i] != i:
+                    continue
+                queue = queues[i]
+                if not queue:
+                    return True
+                u = queue.popleft()
+                for w in indices[indptr[u]:indptr[u + 1]].tolist():
+                    if w not in nodes:
+                        continue
+                    o = owner.get(w)
+                    if o is None:
+                        owner[w] = i
+                        queue.append(w)
+                    elif o >= 0:
+                        root = find(o)
+                        if root != i:
+                            leader[root] = i
+                            queue.extend(queues[root])
+                            queues[root].clear()
+                            groups -= 1
+                            if groups == 1:
+                                return False
+
+
+def peel_boundary(graph: CSRGraph, partition: Set[int], count: int) -> Tuple[Set[int], Set[int]]:
+    """
+    Removes up to count random boundary nodes from a partition, preferring nodes whose
+    removal keeps the rest of the partition connected.
+
+    A boundary node has at least one neighbor outside the partition. At every step a node
+    is drawn uniformly from the boundary nodes that are not articulation points of the
+    current partition; if there are none, it is drawn from all boundary nodes. Boundary
+    nodes are sampled without replacement straight from the boundary set, and articulation
+    points drawn along the way are set aside until the removal is made, so each step costs
+    as many articulation checks as it takes to find the first removable node.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        partition (Set[int]): Dense nodes of the partition. It is not modified.
+        count (int): Number of nodes to remove.
+
+    Returns:
+        Tuple[Set[int], Set[int]]: (remaining nodes, removed nodes).
+    """
+    tracker = ArticulationTracker(graph, partition)
+    current = tracker.nodes
+    boundary = RandomAccessSet(
+        node for node in current
+        if any(nbr not in current for nbr in graph.neighbors(node).tolist()))
+    removed: Set[int] = set()
+
+    while len(removed) < count and boundary:
+        rejected = []
+        node = None
+        while boundary:
+            candidate = boundary.sample()
+            boundary.remove(candidate)
+            if not tracker.is_articulation_point(candidate):
+                node = candidate
+                break
+            rejected.append(candidate)
+        if node is None:
+            j = random.randrange(len(rejected))
+            node = rejected[j]
+            rejected[j] = rejected[-1]
+            rejected.pop()
+        for candidate in rejected:
+            boundary.add(candidate)
+
+        tracker.remove(node)
+        removed.add(node)
+        for nbr in graph.neighbors(node).tolist():
+            if nbr in current:
+                boundary.add(nbr)
+
+    return set(current), removed
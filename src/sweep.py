@@ -0,0 +1,238 @@
+"""
+sweep.py
+
+This module runs PRRP over many parameter configurations of the same graph.
+
+Studies typically partition one graph under dozens of (num_regions, cardinalities)
+combinations for spatial PRRP, or (p, C, MR, MS) combinations for graph PRRP. Calling
+run_prrp or run_graph_prrp for each one rebuilds the adjacency list, the CSR graph and
+its identifier map, and recomputes the articulation points every time. A sweep prepares
+the graph once (see PreparedGraph), ships it to every worker of a process pool through the
+pool initializer, and then sends only the configurations. Each result carries the time its
+configuration took inside the worker.
+"""
+
+import logging
+import random
+import time
+from multiprocessing import Pool, cpu_count
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.checkpoint import ensemble_seeds
+from src.csr_graph import CSRGraph, articulation_points, component_labels
+from src.graph_prrp import LEFTOVER_POLICIES, run_graph_prrp
+from src.solution import Solution
+from src.spatial_prrp import random_seeds, solve_with_seed
+from src.utils import construct_adjacency_list
+
+logger = logging.getLogger(__name__)
+
+
+class SpatialConfig(NamedTuple):
+    """A spatial PRRP configuration: the arguments of run_prrp, and how many solutions to draw."""
+    num_regions: int
+    cardinalities: Tuple[int, ...]
+    solutions_count: int = 1
+    root_seed: Optional[int] = None
+
+
+class GraphConfig(NamedTuple):
+    """A graph PRRP configuration: the arguments of run_graph_prrp, and how many solutions to draw."""
+    p: int
+    C: int
+    MR: int
+    MS: int
+    solutions_count: int = 1
+    root_seed: Optional[int] = None
+    leftover_policy: str = "most_shared"
+
+
+SweepConfig = Union[SpatialConfig, GraphConfig]
+
+
+class SweepResult(NamedTuple):
+    """
+    The outcome of one configuration of a sweep.
+
+    Attributes:
+        config (SpatialConfig or GraphConfig): The configuration.
+        solutions (list): Its solutions, in seed order; empty if it raised.
+        elapsed (float): Wall-clock seconds spent on the configuration inside the worker.
+        error (str or None): The exception raised by the configuration, if any.
+    """
+    config: SweepConfig
+    solutions: List[Any]
+    elapsed: float
+    error: Optional[str] = None
+
+
+class PreparedGraph:
+    """
+    The configuration-independent state of a graph, computed once per sweep.
+
+    Attributes:
+        adj_list (Dict[Any, Set[Any]]): Adjacency list with set-valued neighbors (spatial PRRP).
+        graph (CSRGraph): The CSR graph and its identifier map.
+        articulation (Set[int] or None): Articulation points as dense indices (graph PRRP).
+    """
+
+    def __init__(self, areas: Any, articulation: bool = True):
+        """
+        Parameters:
+            areas (GeoDataFrame, list, dict or CSRGraph): Anything construct_adjacency_list accepts.
+            articulation (bool): Whether to compute articulation points, which only graph
+                PRRP configurations use.
+        """
+        self.adj_list = {k: set(v) for k, v in construct_adjacency_list(areas).items()}
+        self.graph = CSRGraph.from_adjacency(self.adj_list)
+        self.articulation = articulation_points(self.graph) if articulation else None
+        self._component_sizes: Optional[List[int]] = None
+
+    @property
+    def component_sizes(self) -> List[int]:
+        """Sizes of the connected components, largest first. Computed on first use."""
+        if self._component_sizes is None:
+            _, labels = component_labels(self.graph, np.arange(self.graph.num_nodes))
+            self._component_sizes = sorted(np.bincount(labels).tolist(), reverse=True)
+        return self._component_sizes
+
+    def check_feasible(self, config: SweepConfig) -> None:
+        """
+        Rejects a spatial configuration that can never succeed on this graph: a region is
+        contiguous, so none can be larger than the largest connected component.
+
+        Raises:
+            ValueError: If a target cardinality exceeds the largest component.
+        """
+        if isinstance(config, SpatialConfig):
+            largest = self.component_sizes[0] if self.component_sizes else 0
+            if max(config.cardinalities, default=0) > largest:
+                raise ValueError(f"A region of {config} is larger than the largest connected "
+                                 f"component ({largest} areas).")
+
+    def run(self, config: SweepConfig, compact: bool = False) -> List[Any]:
+        """Runs every solution of one configuration on the prepared graph."""
+        if config.root_seed is not None:
+            seeds = ensemble_seeds(config.root_seed, config.solutions_count)
+        else:
+            seeds = list(random_seeds(config.solutions_count))
+
+        solutions = []
+        for seed in seeds:
+            if isinstance(config, SpatialConfig):
+                solution = solve_with_seed(seed, self.adj_list, self.graph,
+                                           list(config.cardinalities))
+                solutions.append(Solution.from_regions(solution, self.graph)
+                                 if compact else solution)
+            else:
+                random.seed(seed)
+                solution = run_graph_prrp(self.graph, config.p, config.C, config.MR,
+                                          config.MS, precomputed_ap=self.articulation,
+                                          leftover_policy=config.leftover_policy)
+                solutions.append(Solution.from_partitions(solution, self.graph)
+                                 if compact else solution)
+        return solutions
+
+
+# Prepared graph installed once per pool worker by _init_sweep_worker.
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_sweep_worker(prepared: PreparedGraph) -> None:
+    _worker_state["prepared"] = prepared
+
+
+def _run_config(task: Tuple[SweepConfig, bool]) -> SweepResult:
+    return _run_config_on(_worker_state["prepared"], task)
+
+
+def _run_config_on(prepared: PreparedGraph, task: Tuple[SweepConfig, bool]) -> SweepResult:
+    config, compact = task
+    start = time.perf_counter()
+    try:
+        solutions = prepared.run(config, compact)
+    except Exception as e:
+        logger.warning(f"Sweep configuration {config} failed: {e}")
+        return SweepResult(config, [], time.perf_counter() - start, f"{type(e).__name__}: {e}")
+    return SweepResult(config, solutions, time.perf_counter() - start)
+
+
+def _validate(config: SweepConfig) -> None:
+    if isinstance(config, SpatialConfig):
+        if config.num_regions != len(config.cardinalities):
+            raise ValueError(
+                f"Number of regions must match the length of the cardinalities list: {config}")
+    elif not isinstance(config, GraphConfig):
+        raise TypeError(f"Unknown sweep configuration: {config!r}")
+    elif config.leftover_policy not in LEFTOVER_POLICIES:
+        raise ValueError(f"Unknown leftover policy: {config}")
+    if config.solutions_count < 1:
+        raise ValueError(f"solutions_count must be positive: {config}")
+
+
+def run_sweep(areas: Any,
+              configs: Sequence[SweepConfig],
+              num_workers: Optional[int] = None,
+              use_multiprocessing: bool = True,
+              compact: bool = False) -> List[SweepResult]:
+    """
+    Runs every configuration on one graph, preparing the graph only once.
+
+    Parameters:
+        areas (GeoDataFrame, list, dict, CSRGraph or PreparedGraph): The graph, in any form
+            construct_adjacency_list accepts, or an already prepared graph.
+        configs (Sequence): SpatialConfig and/or GraphConfig entries.
+        num_workers (int, optional): Number of worker processes. Defaults to
+            min(len(configs), cpu_count()).
+        use_multiprocessing (bool): If False, configurations run one after another in this process.
+        compact (bool): If True, solutions are label-array Solutions instead of sets.
+
+    Returns:
+        List[SweepResult]: One result per configuration, in the order given. A configuration
+            that raises is reported through SweepResult.error instead of stopping the sweep.
+
+    Raises:
+        ValueError: If a configuration is inconsistent, or asks for a spatial region larger
+            than the largest connected component of the graph.
+        TypeError: If a configuration is neither a SpatialConfig nor a GraphConfig.
+    """
+    configs = list(configs)
+    for config in configs:
+        _validate(config)
+
+    start = time.perf_counter()
+    if isinstance(areas, PreparedGraph):
+        prepared = areas
+    else:
+        prepared = PreparedGraph(
+            areas, articulation=any(isinstance(c, GraphConfig) for c in configs))
+    for config in configs:
+        prepared.check_feasible(config)
+    logger.info(f"Prepared graph with {prepared.graph.num_nodes} nodes for a sweep of "
+                f"{len(configs)} configuration(s) in {time.perf_counter() - start:.2f}s.")
+
+    tasks = [(config, compact) for config in configs]
+    if use_multiprocessing and len(configs) > 1:
+        num_workers = num_workers or min(len(configs), cpu_count())
+        with Pool(processes=num_workers, initializer=_init_sweep_worker,
+                  initargs=(prepared,)) as pool:
+            results = pool.map(_run_config, tasks, chunksize=1)
+    else:
+        results = [_run_config_on(prepared, task) for task in tasks]
+
+    logger.info(f"Sweep of {len(configs)} configuration(s) finished in "
+                f"{time.perf_counter() - start:.2f}s.")
+    return results
+
+
+def format_sweep_report(results: Sequence[SweepResult]) -> str:
+    """Returns a plain-text table with the timing and outcome of each configuration."""
+    lines = [f"{'configuration':<60} {'solutions':>9} {'seconds':>9} {'s/solution':>10}  status"]
+    for result in results:
+        count = result.config.solutions_count
+        status = result.error or "ok"
+        lines.append(f"{str(tuple(result.config)):<60} {count:>9} {result.elapsed:>9.3f} "
+                     f"{result.elapsed / count:>10.4f}  {status}")
+    return "\n".join(lines)
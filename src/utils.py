@@ -12,20 +12,20 @@ import concurrent.futures
 import heapq
 from multiprocessing import Pool, cpu_count
 import os
-from typing import Dict, List, Set, Any, Tuple, Callable, Iterable
+from typing import Dict, List, Set, Any, Tuple, Callable, Iterable, Union
+import numpy as np
 import geopandas as gpd
+import shapely
 from shapely.geometry.base import BaseGeometry
 
+from src.csr_graph import CSRGraph
+from src.graph_overlay import GraphOverlay
+from src.metis_parser import csr_to_adjacency_lists, read_metis
+
 # Global flag for parallel processing.
 PARALLEL_PROCESSING_ENABLED = False
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-handler.setFormatter(formatter)
-if not logger.handlers:
-    logger.addHandler(handler)
 
 
 class DisjointSetUnion:
@@ -48,6 +48,60 @@ class DisjointSetUnion:
             self.parent[rootY] = rootX
 
 
+class RandomAccessSet:
+    """
+    A set supporting O(1) insertion, removal, and uniform random sampling.
+
+    Members are kept in a list alongside a member -> position map; removal moves the last
+    member into the vacated slot, so the list never has holes.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._items: List[Any] = []
+        self._pos: Dict[Any, int] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._pos
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def add(self, item: Any) -> None:
+        if item not in self._pos:
+            self._pos[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: Any) -> None:
+        position = self._pos.pop(item, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._pos[last] = position
+
+    def remove(self, item: Any) -> None:
+        if item not in self._pos:
+            raise KeyError(item)
+        self.discard(item)
+
+    def sample(self) -> Any:
+        """
+        Returns a uniformly random member without removing it.
+
+        Raises:
+            IndexError: If the set is empty.
+        """
+        if not self._items:
+            raise IndexError("Cannot sample from an empty set.")
+        return self._items[random.randrange(len(self._items))]
+
+
 def _has_rook_adjacency(geom1: BaseGeometry, geom2: BaseGeometry) -> bool:
     """
     Checks if two geometries share a rook-adjacent boundary (i.e., a common edge).
@@ -77,14 +131,66 @@ def _has_rook_adjacency(geom1: BaseGeometry, geom2: BaseGeometry) -> bool:
     return False
 
 
+# DE-9IM patterns per contiguity rule. Both require disjoint interiors; rook adjacency
+# needs the boundaries to share a one-dimensional piece (a common edge, matching
+# _has_rook_adjacency), queen adjacency accepts any shared boundary point.
+CONTIGUITY_PATTERNS = {
+    "rook": "F***1****",
+    "queen": "F***T****",
+}
+
+
+def build_contiguity_csr(geometries: Any, node_ids: Iterable[Any] = None,
+                         contiguity: str = "rook") -> CSRGraph:
+    """
+    Builds the contiguity graph of a sequence of polygons directly in CSR form.
+
+    All candidate pairs come from a single bulk STRtree query on bounding boxes. Each
+    unordered pair is then kept once and tested with one vectorized DE-9IM relate call,
+    so no Python-level work is done per pair. (Filtering candidates with a "touches"
+    tree predicate first is slower than the single relate pass.)
+
+    Parameters:
+        geometries (array-like of BaseGeometry): The polygons, in node order.
+        node_ids (Iterable, optional): Identifiers of the polygons; defaults to positions.
+        contiguity (str): "rook" (shared edge) or "queen" (shared edge or corner).
+
+    Returns:
+        CSRGraph: The contiguity graph.
+
+    Raises:
+        ValueError: If the contiguity rule is unknown.
+    """
+    if contiguity not in CONTIGUITY_PATTERNS:
+        raise ValueError(
+            f"Unknown contiguity rule {contiguity!r}; expected one of {sorted(CONTIGUITY_PATTERNS)}.")
+    geoms = np.asarray(geometries, dtype=object)
+    tree = shapely.STRtree(geoms)
+    left, right = tree.query(geoms)
+    once = left < right
+    left, right = left[once], right[once]
+    adjacent = shapely.relate_pattern(
+        geoms[left], geoms[right], CONTIGUITY_PATTERNS[contiguity])
+    return CSRGraph.from_edges(len(geoms), left[adjacent], right[adjacent], node_ids)
+
+
+def build_rook_csr(geometries: Any, node_ids: Iterable[Any] = None) -> CSRGraph:
+    """
+    Builds the rook adjacency graph of a sequence of polygons directly in CSR form.
+    See build_contiguity_csr.
+    """
+    return build_contiguity_csr(geometries, node_ids, "rook")
+
+
 def construct_adjacency_list(areas: Any) -> Dict[Any, Set[Any]]:
     """
     Creates a graph adjacency list using rook adjacency for spatial data or by converting a
-    pre-constructed graph-based input. For GeoDataFrame inputs, this function uses a ThreadPoolExecutor
-    to parallelize processing of each row.
+    pre-constructed graph-based input. For GeoDataFrame inputs, the graph is built in bulk by
+    build_rook_csr and keyed by the GeoDataFrame index.
 
     Parameters:
-        areas (GeoDataFrame, list, or dict): Spatial areas with geometry information or a pre-built adjacency list.
+        areas (GeoDataFrame, list, dict, or CSRGraph): Spatial areas with geometry information or a
+            pre-built graph (for example one loaded by adjacency_cache.load_shapefile_graph).
 
     Returns:
         Dict[Any, Set[Any]]: Mapping from area identifiers to sets of adjacent area identifiers.
@@ -93,6 +199,10 @@ def construct_adjacency_list(areas: Any) -> Dict[Any, Set[Any]]:
         TypeError: If the input type is unsupported.
         ValueError: If required geometry information is missing.
     """
+    if isinstance(areas, CSRGraph):
+        logger.info("Input is a CSRGraph; converted to an adjacency list.")
+        return areas.to_adjacency()
+
     if isinstance(areas, dict):
         for key, value in areas.items():
             if not isinstance(value, set):
@@ -102,31 +212,12 @@ def construct_adjacency_list(areas: Any) -> Dict[Any, Set[Any]]:
         return areas
 
     if isinstance(areas, gpd.GeoDataFrame):
-        # Use multi-threading to build the adjacency list.
-        adj_list = {}
-
-        def process_row(idx_area):
-            idx, area = idx_area
-            geom = area.geometry
-            neighbors = set()
-            possible_matches = list(areas.sindex.intersection(geom.bounds))
-            for other_idx in possible_matches:
-                if other_idx == idx:
-                    continue
-                other_geom = areas.loc[other_idx].geometry
-                if _has_rook_adjacency(geom, other_geom):
-                    neighbors.add(other_idx)
-            return idx, neighbors
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=cpu_count()) as executor:
-            results = executor.map(process_row, areas.iterrows())
-        for idx, nbrs in results:
-            adj_list[idx] = nbrs
-        logger.info("Adjacency list constructed in parallel from GeoDataFrame.")
+        adj_list = build_rook_csr(areas.geometry.values, areas.index).to_adjacency()
+        logger.info("Adjacency list constructed from GeoDataFrame.")
         return adj_list
 
     if isinstance(areas, list):
-        # Processing for list of dicts (same as before, sequentially)
+        # List of dicts with 'id' and 'geometry' keys.
         adj_list = {}
         if not all(isinstance(area, dict) for area in areas):
             logger.error(
@@ -142,27 +233,16 @@ def construct_adjacency_list(areas: Any) -> Dict[Any, Set[Any]]:
                 "Adjacency list constructed as a complete graph (dummy geometry).")
             return adj_list
         else:
-            n = len(areas)
-            for i in range(n):
-                area_i = areas[i]
-                id_i = area_i.get('id', i)
-                geom_i = area_i.get('geometry')
-                if geom_i is None:
-                    logger.error(f"Area with id {id_i} has no geometry.")
-                    raise ValueError(f"Area with id {id_i} has no geometry.")
-                adj_list[id_i] = set()
-                for j in range(n):
-                    if i == j:
-                        continue
-                    area_j = areas[j]
-                    id_j = area_j.get('id', j)
-                    geom_j = area_j.get('geometry')
-                    if geom_j is None:
-                        logger.error(f"Area with id {id_j} has no geometry.")
-                        raise ValueError(
-                            f"Area with id {id_j} has no geometry.")
-                    if _has_rook_adjacency(geom_i, geom_j):
-                        adj_list[id_i].add(id_j)
+            ids, geoms = [], []
+            for i, area in enumerate(areas):
+                area_id = area.get('id', i)
+                geom = area.get('geometry')
+                if geom is None:
+                    logger.error(f"Area with id {area_id} has no geometry.")
+                    raise ValueError(f"Area with id {area_id} has no geometry.")
+                ids.append(area_id)
+                geoms.append(geom)
+            adj_list = build_rook_csr(geoms, ids).to_adjacency()
             logger.info(
                 "Adjacency list constructed from list of dicts based on geometries.")
             return adj_list
@@ -295,7 +375,7 @@ def find_connected_components(adj_list: Dict[Any, List[Any]]) -> List[Set[Any]]:
                             stack.append(neighbor)
             components.append(component)
 
-    logger.info(f"Found {len(components)} connected component(s).")
+    logger.debug("Found %d connected component(s).", len(components))
     return components
 
 
@@ -318,8 +398,7 @@ def is_articulation_point(adj_list: Dict[Any, List[Any]], node: Any) -> bool:
 
     # ✅ **Fix: Leaf nodes are never articulation points**
     if len(adj_list[node]) <= 1:
-        logger.info(
-            f"Node {node} is a leaf node and cannot be an articulation point.")
+        logger.debug("Node %s is a leaf node and cannot be an articulation point.", node)
         return False
 
     def tarjan_ap_util(v: Any, parent: Any, disc: Dict[Any, int],
@@ -350,24 +429,51 @@ def is_articulation_point(adj_list: Dict[Any, List[Any]], node: Any) -> bool:
             tarjan_ap_util(v, None, disc, low, time, ap)
 
     is_ap = node in ap
-    logger.info(
-        f"Node {node} is {'an' if is_ap else 'not an'} articulation point.")
+    logger.debug("Node %s is %s articulation point.", node, "an" if is_ap else "not an")
 
     return is_ap
 
 
-def remove_articulation_area(adj_list: Dict[Any, List[Any]], node: Any) -> Dict[Any, List[Any]]:
+def remove_articulation_area(adj_list: Union[Dict[Any, List[Any]], CSRGraph, GraphOverlay],
+                             node: Any) -> Union[Dict[Any, List[Any]], GraphOverlay]:
     """
     Removes an articulation point from the graph and reassigns it to maintain connectivity.
     If removal disconnects the graph, reassigns the node to the largest connected component.
 
+    A dictionary input is left unchanged and a new adjacency list is returned. For a
+    CSRGraph or GraphOverlay input, node is a dense index and the change is recorded as
+    edge removals in an overlay (the given one, or a new one over the CSRGraph), which is
+    returned; the graph itself is neither copied nor modified.
+
     Parameters:
-        adj_list (Dict[Any, List[Any]]): The graph's adjacency list.
+        adj_list (Dict[Any, List[Any]], CSRGraph or GraphOverlay): The graph.
         node (Any): The articulation point to remove.
 
     Returns:
-        Dict[Any, List[Any]]: The updated adjacency list.
+        Dict[Any, List[Any]] or GraphOverlay: The updated adjacency list, or the overlay
+            holding the change.
+
+    Raises:
+        KeyError: If node is not in the graph.
     """
+    if isinstance(adj_list, (CSRGraph, GraphOverlay)):
+        overlay = adj_list if isinstance(adj_list, GraphOverlay) else GraphOverlay(adj_list)
+        if not 0 <= node < overlay.num_nodes:
+            logger.error(f"Node {node} not found in the graph.")
+            raise KeyError(f"Node {node} not in graph.")
+        original_neighbors = overlay.isolate(node)
+        components = [comp for comp in overlay.components() if node not in comp]
+        if len(components) > 1:
+            largest_component = max(components, key=len)
+            kept = [v for v in original_neighbors if v in largest_component]
+        else:
+            kept = original_neighbors[:1]
+        for neighbor in kept:
+            overlay.add_edge(node, neighbor)
+        logger.debug("Articulation node %s reattached to %d neighbor(s) in the overlay.",
+                     node, len(kept))
+        return overlay
+
     if node not in adj_list:
         logger.error(f"Node {node} not found in the adjacency list.")
         raise KeyError(f"Node {node} not in adjacency list.")
@@ -388,13 +494,11 @@ def remove_articulation_area(adj_list: Dict[Any, List[Any]], node: Any) -> Dict[
             if neighbor in largest_component:
                 new_adj[node].append(neighbor)
                 new_adj[neighbor].append(node)
-        logger.warning(
-            f"Articulation node {node} removed and reassigned to maintain connectivity.")
+        logger.debug("Articulation node %s removed and reassigned to maintain connectivity.", node)
     else:
         new_adj[node] = [original_neighbors[0]]
         new_adj[original_neighbors[0]].append(node)
-        logger.info(
-            f"Node {node} was removed but reassigned to maintain connectivity.")
+        logger.debug("Node %s was removed but reassigned to maintain connectivity.", node)
 
     return new_adj
 
@@ -406,7 +510,8 @@ def random_seed_selection(adj_list: Dict[Any, List[Any]], assigned_regions: Set[
     the top candidates quickly. The score is defined as the number of neighbors in assigned_regions.
 
     Parameters:
-        adj_list (Dict[Any, List[Any]]): The graph's adjacency list.
+        adj_list (Dict[Any, List[Any]] or CSRGraph): The graph's adjacency list. For a CSRGraph,
+            nodes are its dense indices and the scores are computed with vectorized array operations.
         assigned_regions (Set[Any]): Nodes that are already assigned.
         method (str): Selection method. Currently, only "gapless" is supported.
 
@@ -416,6 +521,9 @@ def random_seed_selection(adj_list: Dict[Any, List[Any]], assigned_regions: Set[
     Raises:
         ValueError: If no unassigned nodes are available or if the method is unknown.
     """
+    if isinstance(adj_list, CSRGraph):
+        return _random_seed_selection_csr(adj_list, assigned_regions, method)
+
     unassigned = set(adj_list.keys()) - assigned_regions
     if not unassigned:
         logger.error("No unassigned nodes available for seed selection.")
@@ -435,8 +543,7 @@ def random_seed_selection(adj_list: Dict[Any, List[Any]], assigned_regions: Set[
         for _ in range(min(10, len(heap))):
             top_candidates.append(heapq.heappop(heap)[1])
         chosen = random.choice(top_candidates)
-        logger.info(
-            f"Selected gapless seed: {chosen} from top candidates {top_candidates}")
+        logger.debug("Selected gapless seed: %s from top candidates %s", chosen, top_candidates)
 
         return chosen
     else:
@@ -444,10 +551,42 @@ def random_seed_selection(adj_list: Dict[Any, List[Any]], assigned_regions: Set[
         raise ValueError(f"Unknown seed selection method: {method}")
 
 
+def _random_seed_selection_csr(graph: CSRGraph, assigned_regions: Set[int], method: str) -> int:
+    """
+    CSR counterpart of random_seed_selection. Scores every unassigned node by its number of
+    assigned neighbors using a prefix sum over the neighbor array, then picks one of the
+    (up to) 10 best candidates, breaking score ties by node index like the heap version.
+    """
+    assigned = np.zeros(graph.num_nodes, dtype=bool)
+    if assigned_regions:
+        assigned[np.fromiter(assigned_regions, dtype=np.int64,
+                             count=len(assigned_regions))] = True
+    unassigned = np.flatnonzero(~assigned)
+    if unassigned.size == 0:
+        logger.error("No unassigned nodes available for seed selection.")
+        raise ValueError("No unassigned nodes available.")
+
+    if method != "gapless":
+        logger.error(f"Unknown seed selection method: {method}")
+        raise ValueError(f"Unknown seed selection method: {method}")
+
+    hits = np.zeros(graph.indices.size + 1, dtype=np.int64)
+    np.cumsum(assigned[graph.indices], out=hits[1:])
+    scores = hits[graph.indptr[1:]] - hits[graph.indptr[:-1]]
+
+    order = np.lexsort((unassigned, -scores[unassigned]))
+    top_candidates = unassigned[order[:10]].tolist()
+    chosen = random.choice(top_candidates)
+    logger.debug("Selected gapless seed: %s from top candidates %s", chosen, top_candidates)
+    return chosen
+
+
 def load_graph_from_metis(file_path: str) -> Dict[int, List[int]]:
     """
     Reads a graph in METIS format and converts it into an adjacency list.
 
+    Parsing is done by metis_parser.read_metis, which streams the file into CSR arrays.
+
     Parameters:
         file_path (str): Path to the METIS format file.
 
@@ -457,70 +596,9 @@ def load_graph_from_metis(file_path: str) -> Dict[int, List[int]]:
     Raises:
         ValueError: If the file is empty, header is invalid, or malformed.
     """
-    adj_list: Dict[int, List[int]] = {}
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-
-        if not lines:
-            logger.error("METIS file is empty.")
-            raise ValueError("Empty METIS file.")
-
-        content_lines = [line.strip() for line in lines if line.strip()
-                         and not line.strip().startswith('%')]
-        if not content_lines:
-            logger.error(
-                "METIS file is empty or contains only comments/whitespace.")
-            raise ValueError("Empty METIS file.")
-
-        header_tokens = content_lines[0].split()
-        if len(header_tokens) < 2:
-            logger.error(
-                "Invalid METIS header: requires at least two tokens (num_nodes and num_edges).")
-            raise ValueError("Invalid METIS header: not enough tokens.")
-        num_nodes = int(header_tokens[0])
-        header_edge_count = int(header_tokens[1])
-
-        if len(content_lines) - 1 < num_nodes:
-            logger.error("Insufficient vertex lines in METIS file.")
-            raise ValueError("Insufficient vertex lines in METIS file.")
-
-        for i in range(num_nodes):
-            line = content_lines[i + 1]
-            tokens = line.split()
-            neighbors = []
-            for token in tokens:
-                try:
-                    neighbor = int(token)
-                except Exception as e:
-                    logger.error(
-                        f"Vertex {i+1}: Invalid neighbor token '{token}'.")
-                    raise ValueError(
-                        f"Invalid neighbor token in vertex {i+1}.") from e
-                if neighbor != i + 1:
-                    neighbors.append(neighbor)
-            for neighbor in neighbors:
-                if neighbor < 1 or neighbor > num_nodes:
-                    logger.error(
-                        f"Vertex {i+1}: Neighbor index {neighbor} out of range (1 to {num_nodes}).")
-                    raise ValueError(
-                        f"Neighbor index out of range in vertex {i+1}.")
-            adj_list[i + 1] = neighbors
-
-        total_neighbor_entries = sum(len(nlist) for nlist in adj_list.values())
-        if total_neighbor_entries == header_edge_count:
-            final_num_edges = header_edge_count
-        elif total_neighbor_entries == 2 * header_edge_count:
-            final_num_edges = header_edge_count
-        else:
-            final_num_edges = total_neighbor_entries // 2
-            logger.warning(
-                f"Computed total neighbor entries ({total_neighbor_entries}) do not match header edge count ({header_edge_count}). Using computed edge count: {final_num_edges}.")
-
-        logger.info(
-            f"Loaded METIS graph from '{file_path}': {num_nodes} nodes, {final_num_edges} edges.")
-        return adj_list
-
+        graph = read_metis(file_path).graph
+        return csr_to_adjacency_lists(graph, base=1)
     except Exception as e:
         logger.error(f"Failed to load METIS graph from {file_path}: {e}")
         raise
@@ -570,7 +648,7 @@ def find_boundary_areas(region: Set[Any], adj_list: Dict[Any, List[Any]]) -> Set
             if neighbor not in region:
                 boundary.add(node)
                 break
-    logger.info(f"Identified {len(boundary)} boundary area(s) in the region.")
+    logger.debug("Identified %d boundary area(s) in the region.", len(boundary))
     return boundary
 
 
@@ -602,7 +680,7 @@ def calculate_low_link_values(adj_list: Dict[Any, List[Any]]) -> Tuple[Dict[Any,
         if node not in disc:
             dfs(node, None)
 
-    logger.info("Calculated low-link values for all nodes.")
+    logger.debug("Calculated low-link values for all nodes.")
     return disc, low
 
 
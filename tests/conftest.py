@@ -0,0 +1,23 @@
+"""
+tests/conftest.py
+
+Fixtures shared by the test modules.
+"""
+
+import pytest
+
+
+def _rook_grid(rows, cols):
+    return {r * cols + c: {r * cols + c + dr * cols + dc
+                           for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                           if 0 <= r + dr < rows and 0 <= c + dc < cols}
+            for r in range(rows) for c in range(cols)}
+
+
+@pytest.fixture
+def make_grid():
+    """
+    Returns a factory for rook-contiguity grids: make_grid(rows, cols) is an adjacency list
+    mapping node r * cols + c to the set of its up to four orthogonal neighbors.
+    """
+    return _rook_grid
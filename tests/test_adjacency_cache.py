@@ -0,0 +1,64 @@
+"""
+tests/test_adjacency_cache.py
+
+Unit tests for the on-disk adjacency cache in src/adjacency_cache.py. The tests cover:
+    - Building and storing a graph on a cache miss
+    - Memory-mapped loading on a cache hit without reading geometry
+    - Cache keys changing with file contents, contiguity rule and identifier column
+"""
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from src.adjacency_cache import cache_key, load_shapefile_graph
+from src.utils import construct_adjacency_list
+
+
+@pytest.fixture
+def grid_shapefile(tmp_path):
+    """A 3x3 grid of unit squares saved as a shapefile with string GEOIDs."""
+    squares = [Polygon([(c, r), (c + 1, r), (c + 1, r + 1), (c, r + 1)])
+               for r in range(3) for c in range(3)]
+    gdf = gpd.GeoDataFrame({"GEOID": [f"g{i}" for i in range(9)],
+                            "CODE": list(range(100, 109)),
+                            "geometry": squares}, crs="EPSG:3857")
+    path = tmp_path / "grid.shp"
+    gdf.to_file(path)
+    return str(path)
+
+
+def test_cache_miss_then_memory_mapped_hit(grid_shapefile, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    built = load_shapefile_graph(grid_shapefile, cache_dir=cache_dir)
+    assert built.num_edges == 12
+
+    def fail(*args, **kwargs):
+        raise AssertionError("geometry should not be read on a cache hit")
+
+    monkeypatch.setattr(gpd, "read_file", fail)
+    cached = load_shapefile_graph(grid_shapefile, cache_dir=cache_dir)
+    assert isinstance(cached.node_ids, np.memmap)
+    assert cached.to_adjacency() == built.to_adjacency()
+    assert construct_adjacency_list(cached)["g4"] == {"g1", "g3", "g5", "g7"}
+
+
+def test_contiguity_and_id_column(grid_shapefile, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    queen = load_shapefile_graph(grid_shapefile, contiguity="queen", cache_dir=cache_dir)
+    assert queen.num_edges == 20
+    by_code = load_shapefile_graph(grid_shapefile, id_column="CODE", cache_dir=cache_dir)
+    assert by_code.index_of(104) == 4
+    assert len({cache_key(grid_shapefile), cache_key(grid_shapefile, "queen"),
+                cache_key(grid_shapefile, id_column="CODE")}) == 3
+    with pytest.raises(ValueError):
+        load_shapefile_graph(grid_shapefile, contiguity="bishop", use_cache=False)
+
+
+def test_key_follows_file_contents(grid_shapefile):
+    before = cache_key(grid_shapefile)
+    gdf = gpd.read_file(grid_shapefile)
+    gdf.loc[0, "GEOID"] = "changed"
+    gdf.to_file(grid_shapefile)
+    assert cache_key(grid_shapefile) != before
@@ -0,0 +1,156 @@
+"""
+tests/test_checkpoint.py
+
+Unit tests for the append-only solution checkpoint in src/checkpoint.py. The tests cover:
+    - Recording solutions and reading them back after reopening
+    - Dropping a record torn by a crash
+    - Rejecting checkpoints of another ensemble
+    - Resuming a checkpointed run_parallel_prrp after a failure
+    - Index-derived seeds, sharded runs and merging shard files without modifying them
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.checkpoint import _RECORD, SolutionCheckpoint, ensemble_seeds, shard_range
+from src.coassignment import CoAssignmentAccumulator, merge_accumulator_shards
+from src.csr_graph import CSRGraph
+from src.solution import Solution
+from src.spatial_prrp import merge_prrp_shards, run_parallel_prrp, run_prrp_shard
+
+
+@pytest.fixture
+def graph(make_grid):
+    return CSRGraph.from_adjacency(make_grid(3, 4))
+
+
+def solution_of(graph, k):
+    return Solution([(i + k) % 3 for i in range(graph.num_nodes)], graph)
+
+
+def test_append_and_reopen(graph, tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    with SolutionCheckpoint(path, graph, [4, 4, 4]) as checkpoint:
+        seeds = [checkpoint.seed(index) for index in range(5)]
+        for index in (0, 3, 1):
+            checkpoint.append(index, seeds[index], solution_of(graph, index))
+
+    with SolutionCheckpoint(path, graph, [4, 4, 4]) as reopened:
+        assert ensemble_seeds(reopened.root_seed, 5) == seeds
+        assert reopened.missing(5) == [2, 4]
+        assert reopened.missing(range(3, 6)) == [4, 5]
+        assert [(index, seed) for index, seed, _ in reopened.solutions()] == \
+            [(0, seeds[0]), (3, seeds[3]), (1, seeds[1])]
+        assert all(solution == solution_of(graph, index)
+                   for index, _, solution in reopened.solutions())
+
+
+def test_torn_record_is_discarded(graph, tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    with SolutionCheckpoint(path, graph, [4, 4, 4]) as checkpoint:
+        for index in range(3):
+            checkpoint.append(index, 0, solution_of(graph, index))
+    os.truncate(path, os.path.getsize(path) - 10)
+
+    with SolutionCheckpoint(path, graph, [4, 4, 4]) as checkpoint:
+        assert checkpoint.missing(3) == [2]
+        checkpoint.append(2, 0, solution_of(graph, 2))
+    with SolutionCheckpoint(path, graph, [4, 4, 4]) as checkpoint:
+        assert len(checkpoint) == 3
+
+
+def test_other_ensembles_are_rejected(graph, make_grid, tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    SolutionCheckpoint(path, graph, [4, 4, 4], root_seed=1).close()
+    with pytest.raises(ValueError):
+        SolutionCheckpoint(path, graph, [6, 6])
+    with pytest.raises(ValueError):
+        SolutionCheckpoint(path, CSRGraph.from_adjacency(make_grid(4, 3)), [4, 4, 4])
+    with pytest.raises(ValueError):
+        SolutionCheckpoint(path, graph, [4, 4, 4], root_seed=2)
+    bogus = tmp_path / "bogus.ckpt"
+    bogus.write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError):
+        SolutionCheckpoint(str(bogus), graph, [4, 4, 4])
+
+
+def test_run_parallel_prrp_resumes(make_grid, tmp_path):
+    adj_list = make_grid(3, 4)
+    path = str(tmp_path / "ensemble.ckpt")
+    first = run_parallel_prrp(adj_list, 3, [4, 4, 4], 6, num_threads=2, checkpoint_path=path)
+
+    # Simulate a crash after two solutions, part-way through writing the third.
+    record = _RECORD.size + 4 * len(adj_list)
+    with SolutionCheckpoint(path, CSRGraph.from_adjacency(adj_list), [4, 4, 4]) as checkpoint:
+        assert len(checkpoint) == 6
+    header = os.path.getsize(path) - 6 * record
+    os.truncate(path, header + 2 * record + record // 2)
+
+    resumed = run_parallel_prrp(adj_list, 3, [4, 4, 4], 6, use_multiprocessing=False,
+                                checkpoint_path=path)
+    assert resumed == first
+    extended = run_parallel_prrp(adj_list, 3, [4, 4, 4], 8, num_threads=2,
+                                 checkpoint_path=path, compact=True)
+    assert [solution.to_regions() for solution in extended[:6]] == first
+    assert len(extended) == 8
+
+
+def test_seeds_depend_only_on_root_and_index():
+    seeds = ensemble_seeds(42, 10)
+    assert ensemble_seeds(42, 4, start=6) == seeds[6:]
+    assert len(set(seeds)) == 10 and seeds != ensemble_seeds(43, 10)
+    assert [len(shard_range(10, 3, k)) for k in range(3)] == [3, 3, 4]
+    assert list(shard_range(10, 3, 0)) + list(shard_range(10, 3, 1)) + \
+        list(shard_range(10, 3, 2)) == list(range(10))
+    with pytest.raises(ValueError):
+        shard_range(10, 3, 3)
+
+
+def test_shards_merge_into_single_host_run(make_grid, tmp_path):
+    adj_list = make_grid(3, 4)
+    single = run_parallel_prrp(adj_list, 3, [4, 4, 4], 7, num_threads=2, root_seed=2024)
+
+    paths = [str(tmp_path / f"shard{k}.ckpt") for k in range(3)]
+    for k, path in enumerate(paths):
+        indices = run_prrp_shard(adj_list, 3, [4, 4, 4], 7, root_seed=2024, num_shards=3,
+                                 shard_index=k, shard_path=path, use_multiprocessing=k != 1)
+        assert indices == shard_range(7, 3, k)
+    assert merge_prrp_shards(adj_list, [4, 4, 4], 7, paths) == single
+
+    # Per-host accumulators merge into the single-host accumulator.
+    graph = CSRGraph.from_adjacency(adj_list)
+    parts = [str(tmp_path / f"part{k}.npz") for k in range(3)]
+    for path, part_path in zip(paths, parts):
+        part = CoAssignmentAccumulator(graph)
+        with SolutionCheckpoint(path, graph, [4, 4, 4]) as shard:
+            part.add_many(solution for _, _, solution in shard.solutions())
+        part.save(part_path)
+    merged = merge_accumulator_shards(parts, graph)
+    whole = CoAssignmentAccumulator(graph)
+    whole.add_many(single)
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.num_solutions == whole.num_solutions == 7
+
+    # Merging only reads the shards: a torn tail is left in place.
+    with open(paths[0], "ab") as f:
+        f.write(b"torn")
+    size = os.path.getsize(paths[0])
+    assert merge_prrp_shards(adj_list, [4, 4, 4], 7, paths) == single
+    assert os.path.getsize(paths[0]) == size
+
+    # Same header, but the record's seed is not the ensemble's seed for its index.
+    forged = str(tmp_path / "forged.ckpt")
+    with SolutionCheckpoint(forged, graph, [4, 4, 4], root_seed=2024) as checkpoint:
+        checkpoint.append(6, checkpoint.seed(6) + 1, solution_of(graph, 0))
+    with pytest.raises(ValueError):
+        merge_prrp_shards(adj_list, [4, 4, 4], 7, paths[:2] + [forged])
+
+    with pytest.raises(ValueError):
+        merge_prrp_shards(adj_list, [4, 4, 4], 7, paths[:2])
+    other = str(tmp_path / "other.ckpt")
+    run_prrp_shard(adj_list, 3, [4, 4, 4], 7, root_seed=1, num_shards=3, shard_index=2,
+                   shard_path=other, use_multiprocessing=False)
+    with pytest.raises(ValueError):
+        merge_prrp_shards(adj_list, [4, 4, 4], 7, paths[:2] + [other])
@@ -0,0 +1,145 @@
+"""
+tests/test_coassignment.py
+
+Unit tests for the co-assignment accumulator in src/coassignment.py. The tests cover:
+    - Candidate pairs within a graph distance
+    - Counting from every supported solution form, one at a time and in batches
+    - Merging partial accumulators, including pickled ones from other processes
+    - Merging accumulator files saved by the hosts of a sharded run
+"""
+
+import pickle
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from src.coassignment import (CoAssignmentAccumulator, merge_accumulator_shards,
+                              pairs_within_distance)
+from src.csr_graph import CSRGraph
+from src.solution import Solution
+
+
+@pytest.fixture
+def grid(make_grid):
+    """A 4x4 rook grid with IDs 0..15."""
+    return CSRGraph.from_adjacency(make_grid(4, 4))
+
+
+def random_labels(rng, n, k):
+    return np.array([rng.randrange(k) for _ in range(n)], dtype=np.int32)
+
+
+def test_pairs_within_distance(grid):
+    assert pairs_within_distance(grid, 1).nnz == 24
+    # Manhattan distance <= 2 on a 4x4 grid.
+    expected = sum(1 for a, b in combinations(range(16), 2)
+                   if abs(a // 4 - b // 4) + abs(a % 4 - b % 4) <= 2)
+    assert pairs_within_distance(grid, 2).nnz == expected
+    with pytest.raises(ValueError):
+        pairs_within_distance(grid, 0)
+
+
+def test_counts_match_brute_force(grid):
+    rng = random.Random(3)
+    ensemble = [random_labels(rng, 16, 3) for _ in range(40)]
+    single = CoAssignmentAccumulator(grid, max_distance=2)
+    for labels in ensemble:
+        single.add(labels)
+    batched = CoAssignmentAccumulator(grid, max_distance=2)
+    batched.add_many(iter(ensemble), batch_size=7)
+    assert np.array_equal(single.counts, batched.counts)
+    assert batched.num_solutions == 40
+
+    for a, b in [(0, 1), (5, 6), (0, 8), (3, 6)]:
+        assert single.count(a, b) == sum(int(x[a] == x[b]) for x in ensemble)
+    with pytest.raises(KeyError):
+        single.count(0, 15)
+
+    dense = single.to_sparse(frequencies=True).toarray()
+    assert np.allclose(dense, dense.T)
+    assert dense[0, 1] == pytest.approx(single.count(0, 1) / 40)
+
+
+def test_accepts_set_based_solutions(grid):
+    regions = [set(range(8)), set(range(8, 15))]  # node 15 unassigned
+    accumulator = CoAssignmentAccumulator(grid)
+    accumulator.add(regions)
+    accumulator.add({1: regions[0], 2: regions[1]})
+    accumulator.add(Solution.from_regions(regions, grid))
+    assert accumulator.count(0, 1) == 3
+    assert accumulator.count(7, 11) == 0
+    assert accumulator.count(14, 15) == 0
+    assert accumulator.to_dict()[(0, 1)] == 3
+
+
+def test_merge_partial_accumulators(grid):
+    rng = random.Random(5)
+    ensemble = [random_labels(rng, 16, 4) for _ in range(30)]
+    whole = CoAssignmentAccumulator(grid, 2)
+    whole.add_many(ensemble)
+
+    parts = []
+    for shard in (ensemble[:10], ensemble[10:]):
+        part = CoAssignmentAccumulator(grid, 2)
+        part.add_many(shard)
+        parts.append(pickle.loads(pickle.dumps(part)))
+    merged = parts[0]
+    merged += parts[1]
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.num_solutions == 30
+    with pytest.raises(ValueError):
+        merged.merge(CoAssignmentAccumulator(grid, 1))
+
+
+def test_merge_accumulator_shards(grid, tmp_path):
+    rng = random.Random(6)
+    ensemble = [random_labels(rng, 16, 4) for _ in range(20)]
+    whole = CoAssignmentAccumulator(grid, 2)
+    whole.add_many(ensemble)
+
+    paths = [str(tmp_path / f"host{k}.npz") for k in range(2)]
+    for path, shard in zip(paths, (ensemble[:7], ensemble[7:])):
+        part = CoAssignmentAccumulator(grid, 2)
+        part.add_many(shard)
+        part.save(path)
+    merged = merge_accumulator_shards(paths, grid)
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.num_solutions == 20
+
+    # Same structure, different identifiers: another graph digest.
+    relabelled = CSRGraph.from_adjacency(
+        {node + 100: [nbr + 100 for nbr in grid.neighbors(node).tolist()] for node in range(16)})
+    other = str(tmp_path / "other.npz")
+    CoAssignmentAccumulator(relabelled, 2).save(other)
+    with pytest.raises(ValueError):
+        merge_accumulator_shards(paths + [other], grid)
+    near = str(tmp_path / "near.npz")
+    CoAssignmentAccumulator(grid, 1).save(near)
+    with pytest.raises(ValueError):
+        merge_accumulator_shards(paths + [near], grid)
+    with pytest.raises(ValueError):
+        merge_accumulator_shards([], grid)
+
+
+def test_rejects_solutions_of_other_graphs(grid, make_grid):
+    accumulator = CoAssignmentAccumulator(grid)
+    larger = CSRGraph.from_adjacency(make_grid(5, 5))
+    with pytest.raises(ValueError):
+        accumulator.add(Solution(np.zeros(25, dtype=np.int32), larger))
+    with pytest.raises(ValueError):
+        accumulator.add(np.zeros(25, dtype=np.int32))
+    with pytest.raises(ValueError):
+        accumulator.add_many([np.zeros((16, 1), dtype=np.int32)])
+    # Same nodes, different edges.
+    path = CSRGraph.from_adjacency({i: [j for j in (i - 1, i + 1) if 0 <= j < 16]
+                                    for i in range(16)})
+    with pytest.raises(ValueError):
+        accumulator.add(Solution(np.zeros(16, dtype=np.int32), path))
+    assert accumulator.num_solutions == 0
+
+    # An equal copy of the graph, e.g. one unpickled from a worker, is accepted.
+    copy = CSRGraph.from_adjacency(make_grid(4, 4))
+    accumulator.add(Solution(np.zeros(16, dtype=np.int32), copy))
+    assert accumulator.count(0, 1) == 1
@@ -0,0 +1,121 @@
+"""
+tests/test_csr_graph.py
+
+Unit tests for the compressed sparse row graph in src/csr_graph.py. The tests cover:
+    - Conversion from and to dictionary adjacency lists (integer and string identifiers)
+    - Identifier <-> dense index mapping
+    - Articulation points of whole graphs and induced subgraphs
+    - Connected components of induced subgraphs, set-based and vectorized
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.csr_graph import (
+    CSRGraph,
+    as_csr_graph,
+    articulation_points,
+    component_labels,
+    gather_neighbors,
+    induced_components,
+)
+from src.utils import find_articulation_points
+
+
+@pytest.fixture
+def path_graph():
+    """A 5-node path graph 1-2-3-4-5 keyed by 1-based integers."""
+    return {1: {2}, 2: {1, 3}, 3: {2, 4}, 4: {3, 5}, 5: {4}}
+
+
+def test_from_adjacency_round_trip(path_graph):
+    graph = CSRGraph.from_adjacency(path_graph)
+    assert graph.num_nodes == 5
+    assert graph.num_edges == 4
+    assert graph.indptr.dtype == np.int32
+    assert graph.indices.dtype == np.int32
+    assert graph.to_adjacency() == path_graph
+
+
+def test_contiguous_integer_ids_use_offset(path_graph):
+    graph = CSRGraph.from_adjacency(path_graph)
+    assert graph.node_ids is None
+    assert graph.index_of(1) == 0
+    assert graph.id_of(4) == 5
+    assert graph.ids_of([0, 2]) == [1, 3]
+    with pytest.raises(KeyError):
+        graph.index_of(6)
+
+
+def test_string_ids():
+    adj = {"a": ["b"], "b": ["a", "c"], "c": ["b"]}
+    graph = CSRGraph.from_adjacency(adj)
+    assert graph.index_of("c") == 2
+    assert graph.ids_of(graph.neighbors(1)) == ["a", "c"]
+    assert graph.to_adjacency() == {"a": {"b"}, "b": {"a", "c"}, "c": {"b"}}
+
+
+def test_from_edges():
+    graph = CSRGraph.from_edges(4, [2, 0, 1], [3, 1, 2], node_ids=["a", "b", "c", "d"])
+    assert graph.to_adjacency() == {"a": {"b"}, "b": {"a", "c"}, "c": {"b", "d"}, "d": {"c"}}
+    with pytest.raises(ValueError):
+        CSRGraph.from_edges(2, [0], [2])
+
+
+def test_unknown_neighbor_raises():
+    with pytest.raises(KeyError):
+        CSRGraph.from_adjacency({1: [2], 2: [1, 7]})
+
+
+def test_as_csr_graph_rejects_unsupported_types(path_graph):
+    graph = as_csr_graph(path_graph)
+    assert as_csr_graph(graph) is graph
+    with pytest.raises(TypeError):
+        as_csr_graph([1, 2, 3])
+
+
+def test_articulation_points_match_dict_implementation():
+    rng = random.Random(7)
+    adj = {i: set() for i in range(200)}
+    for i in range(200):
+        for j in rng.sample(range(200), 2):
+            if i != j:
+                adj[i].add(j)
+                adj[j].add(i)
+    graph = CSRGraph.from_adjacency(adj)
+    expected = find_articulation_points({k: list(v) for k, v in adj.items()})
+    assert set(graph.ids_of(articulation_points(graph))) == expected
+
+
+def test_articulation_points_of_induced_subgraph(path_graph):
+    graph = CSRGraph.from_adjacency(path_graph)
+    assert articulation_points(graph) == {1, 2, 3}
+    # Within {1, 2, 3} (ids 2-3-4) only the middle node is an articulation point.
+    assert articulation_points(graph, {1, 2, 3}) == {2}
+
+
+def test_induced_components(path_graph):
+    graph = CSRGraph.from_adjacency(path_graph)
+    components = induced_components(graph, {0, 1, 3, 4})
+    assert sorted(map(sorted, components)) == [[0, 1], [3, 4]]
+
+
+def test_vectorized_components_match_induced_components(make_grid):
+    rng = random.Random(11)
+    side = 12
+    graph = CSRGraph.from_adjacency(make_grid(side, side))
+
+    sources, neighbors = gather_neighbors(graph, np.array([0, 13]))
+    assert sources.tolist() == [0, 0, 1, 1, 1, 1]
+    assert neighbors.tolist() == graph.neighbors(0).tolist() + graph.neighbors(13).tolist()
+
+    for _ in range(20):
+        nodes = np.array(sorted(rng.sample(range(side * side), 70)))
+        num_components, labels = component_labels(graph, nodes)
+        expected = induced_components(graph, nodes.tolist())
+        assert num_components == len(expected)
+        assert sorted(sorted(nodes[labels == k].tolist()) for k in range(num_components)) == \
+            sorted(sorted(component) for component in expected)
+    assert component_labels(graph, np.array([], dtype=np.int64))[0] == 0
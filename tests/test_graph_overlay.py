@@ -0,0 +1,108 @@
+"""
+tests/test_graph_overlay.py
+
+Unit tests for the edge overlay in src/graph_overlay.py. The tests cover:
+    - Adding, removing and restoring edges without touching the base graph
+    - Materializing an overlay into a standalone CSRGraph
+    - Components of the overlay graph
+    - Recording articulation-area reassignment in an overlay
+    - Partitioning an overlay with pending changes
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.csr_graph import CSRGraph
+from src.graph_overlay import GraphOverlay
+from src.graph_prrp import run_graph_prrp
+from src.utils import remove_articulation_area
+
+
+@pytest.fixture
+def path_graph():
+    # 10 - 11 - 12 - 13
+    return CSRGraph.from_adjacency({10: [11], 11: [10, 12], 12: [11, 13], 13: [12]})
+
+
+def test_changes_leave_base_untouched(path_graph):
+    indices = path_graph.indices.copy()
+    overlay = GraphOverlay(path_graph)
+
+    overlay.add_edge(0, 3)
+    overlay.remove_edge(1, 2)
+    assert overlay.has_edge(3, 0) and not overlay.has_edge(2, 1)
+    assert sorted(overlay.neighbors(0)) == [1, 3]
+    assert overlay.degree(1) == 1 and overlay.degree(3) == 2
+    assert overlay.added_edges() == [(0, 3)] and overlay.removed_edges() == [(1, 2)]
+    assert np.array_equal(path_graph.indices, indices)
+
+    # Re-adding a removed base edge restores it rather than recording a virtual edge.
+    overlay.add_edge(2, 1)
+    assert overlay.removed_edges() == [] and overlay.has_edge(1, 2)
+    assert overlay.isolate(0) == [1, 3]
+    assert overlay.degree(0) == 0 and overlay.added_edges() == []
+    overlay.clear()
+    assert overlay.removed_edges() == [] and overlay.neighbors(0) == [1]
+
+    with pytest.raises(ValueError):
+        overlay.add_edge(2, 2)
+
+
+def test_materialize_and_adjacency(path_graph):
+    overlay = GraphOverlay(path_graph)
+    overlay.remove_edge(1, 2)
+    overlay.add_edge(0, 2)
+
+    graph = overlay.materialize()
+    assert graph.num_nodes == 4
+    assert [sorted(graph.neighbors(u).tolist()) for u in range(4)] == \
+        [sorted(overlay.neighbors(u)) for u in range(4)]
+    assert overlay.to_adjacency() == {10: {11, 12}, 11: {10}, 12: {10, 13}, 13: {12}}
+    assert graph.to_adjacency() == overlay.to_adjacency()
+
+
+def test_components(path_graph):
+    overlay = GraphOverlay(path_graph)
+    assert overlay.components() == [{0, 1, 2, 3}]
+    overlay.remove_edge(1, 2)
+    assert sorted(map(sorted, overlay.components())) == [[0, 1], [2, 3]]
+    assert sorted(map(sorted, overlay.components([0, 2, 3]))) == [[0], [2, 3]]
+
+
+def test_remove_articulation_area_records_overlay():
+    # A star with a tail: removing the hub 0 disconnects 1, 2 and the tail 3 - 4.
+    adj_list = {0: [1, 2, 3], 1: [0], 2: [0], 3: [0, 4], 4: [3]}
+    graph = CSRGraph.from_adjacency(adj_list)
+    hub = int(graph.indices_of([0])[0])
+
+    overlay = remove_articulation_area(graph, hub)
+    expected = remove_articulation_area(adj_list, 0)
+    assert overlay.to_adjacency() == {k: set(v) for k, v in expected.items()}
+    assert adj_list[0] == [1, 2, 3]
+    assert sorted(graph.neighbors(hub).tolist()) == sorted(graph.indices_of([1, 2, 3]).tolist())
+
+    # An existing overlay is updated in place and returned.
+    assert remove_articulation_area(overlay, hub) is overlay
+    with pytest.raises(KeyError):
+        remove_articulation_area(graph, graph.num_nodes)
+
+
+def test_run_graph_prrp_sees_overlay_changes(make_grid):
+    # Two disjoint 3x3 grids; the overlay joins them with the edge 2 - 9.
+    adj_list = {offset + node: {offset + nbr for nbr in nbrs}
+                for offset in (0, 9) for node, nbrs in make_grid(3, 3).items()}
+    graph = CSRGraph.from_adjacency(adj_list)
+    bridge = tuple(sorted(graph.indices_of([2, 9]).tolist()))
+
+    for seed in range(5):
+        overlay = GraphOverlay(graph)
+        overlay.add_edge(*bridge)
+        assert overlay.has_changes()
+        random.seed(seed)
+        partitions = run_graph_prrp(overlay, p=1, C=18, MR=3, MS=18)
+        # The joined graph is connected, so no repair edge is needed.
+        assert partitions == {1: set(adj_list)}
+        assert overlay.added_edges() == [bridge]
+    assert graph.to_adjacency() == adj_list
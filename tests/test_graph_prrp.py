@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import random
 import time
@@ -8,8 +9,12 @@ from src.graph_prrp import (
     run_graph_prrp,
     grow_partition,
     merge_disconnected_areas,
-    split_partition
+    split_partition,
+    _assign_leftovers,
+    LEFTOVER_POLICIES,
 )
+from src.csr_graph import CSRGraph
+from src.graph_overlay import GraphOverlay
 # Also import some utility functions for connectivity checking
 from src.utils import (
     construct_adjacency_list,
@@ -165,14 +170,24 @@ def large_random_graph():
 # -------------------------------
 
 
+def run_with_repairs(graph, **kwargs):
+    """
+    Runs graph PRRP on an overlay of graph and returns the partitions together with the
+    adjacency list including the connectivity-repair edges the run recorded.
+    """
+    overlay = GraphOverlay(CSRGraph.from_adjacency(graph))
+    partitions = run_graph_prrp(overlay, **kwargs)
+    return partitions, overlay.to_adjacency()
+
+
 def test_basic_partitioning(small_graph):
     """Basic Graph Partitioning Test: 10-node graph, p=2 partitions."""
-    partitions = run_graph_prrp(small_graph, p=2, C=5, MR=3, MS=6)
+    partitions, repaired = run_with_repairs(small_graph, p=2, C=5, MR=3, MS=6)
     assert len(partitions) == 2
     # Verify that each partition is connected.
     for part in partitions.values():
         comp = find_connected_components(
-            {n: list(small_graph[n] & part) for n in part})
+            {n: list(repaired[n] & part) for n in part})
         assert len(comp) == 1, "Partition is not connected."
 
 
@@ -200,11 +215,12 @@ def test_graph_smaller_than_p(small_graph):
 
 def test_handling_disconnected_graph(disconnected_graph):
     """Handling Disconnected Graph: Merging disconnected components."""
-    partition = set(disconnected_graph.keys())
-    merged = merge_disconnected_areas(disconnected_graph, set(), partition)
-    comp = find_connected_components(
-        {n: list(disconnected_graph[n] & merged) for n in merged})
-    assert len(comp) == 1, "Merged partition is not connected."
+    original = {k: set(v) for k, v in disconnected_graph.items()}
+    overlay = GraphOverlay(CSRGraph.from_adjacency(disconnected_graph))
+    partition = set(range(overlay.num_nodes))
+    merged = merge_disconnected_areas(overlay, set(), partition)
+    assert len(overlay.components(merged)) == 1, "Merged partition is not connected."
+    assert disconnected_graph == original, "The input graph must not be modified."
 
 
 def test_graph_with_bridges(hub_graph):
@@ -231,12 +247,12 @@ def test_graph_with_cycles(cycle_graph):
 
 def test_graph_with_isolated_nodes(isolated_graph):
     """Graph With Isolated Nodes: All nodes (even isolated) are assigned to partitions."""
-    partitions = run_graph_prrp(isolated_graph, p=3, C=3, MR=3, MS=4)
+    partitions, repaired = run_with_repairs(isolated_graph, p=3, C=3, MR=3, MS=4)
     total_nodes = sum(len(part) for part in partitions.values())
     assert total_nodes == len(isolated_graph)
     for part in partitions.values():
         comp = find_connected_components(
-            {n: list(isolated_graph[n] & part) for n in part})
+            {n: list(repaired[n] & part) for n in part})
         assert len(comp) == 1, "Partition with isolated node is not connected."
 
 
@@ -245,10 +261,10 @@ def test_graph_with_high_degree_nodes(hub_graph):
     Graph With High-Degree Nodes (Hubs):
     Verify that partitions remain balanced when high-degree nodes exist.
     """
-    partitions = run_graph_prrp(hub_graph, p=3, C=3, MR=3, MS=4)
+    partitions, repaired = run_with_repairs(hub_graph, p=3, C=3, MR=3, MS=4)
     for part in partitions.values():
         comp = find_connected_components(
-            {n: list(hub_graph[n] & part) for n in part})
+            {n: list(repaired[n] & part) for n in part})
         assert len(comp) == 1, "Partition with high-degree node is not connected."
 
 
@@ -294,10 +310,10 @@ def test_grid_graph_partitioning(grid_graph):
     Partitioning on Grid Graph:
     Ensure that partitioning a grid graph produces even, connected partitions.
     """
-    partitions = run_graph_prrp(grid_graph, p=3, C=3, MR=3, MS=5)
+    partitions, repaired = run_with_repairs(grid_graph, p=3, C=3, MR=3, MS=5)
     for part in partitions.values():
         comp = find_connected_components(
-            {n: list(grid_graph[n] & part) for n in part})
+            {n: list(repaired[n] & part) for n in part})
         assert len(comp) == 1, "Grid graph partition is not connected."
     total_nodes = sum(len(part) for part in partitions.values())
     assert total_nodes == len(grid_graph)
@@ -308,10 +324,10 @@ def test_star_graph_partitioning(hub_graph):
     Edge Case: Star Graph:
     Verify that partitioning a star graph properly handles the central hub.
     """
-    partitions = run_graph_prrp(hub_graph, p=2, C=3, MR=3, MS=4)
+    partitions, repaired = run_with_repairs(hub_graph, p=2, C=3, MR=3, MS=4)
     for part in partitions.values():
         comp = find_connected_components(
-            {n: list(hub_graph[n] & part) for n in part})
+            {n: list(repaired[n] & part) for n in part})
         assert len(comp) == 1, "Star graph partition is not connected."
     total_nodes = sum(len(part) for part in partitions.values())
     assert total_nodes == len(hub_graph)
@@ -334,3 +350,73 @@ def test_invalid_input_type():
     """
     with pytest.raises(TypeError):
         run_graph_prrp([1, 2, 3], p=1, C=1, MR=3, MS=1)
+
+
+def test_csr_graph_input(grid_graph):
+    """
+    CSR Input:
+    run_graph_prrp accepts a CSRGraph directly and returns the original node identifiers.
+    """
+    graph = CSRGraph.from_adjacency(grid_graph)
+    partitions = run_graph_prrp(graph, p=3, C=3, MR=3, MS=5)
+    all_nodes = set().union(*partitions.values())
+    assert all_nodes == set(grid_graph.keys())
+    assert graph.to_adjacency() == grid_graph, "CSR input must not be modified."
+
+
+@pytest.mark.parametrize("policy, expected", [("most_shared", 1), ("smallest", 2)])
+def test_leftover_assignment_policies(policy, expected):
+    """
+    Leftover Assignment:
+    Node 5 touches partition 1 twice and partition 2 once; node 6 is only reachable through
+    node 5, and node 7 cannot reach any partition.
+    """
+    graph = CSRGraph.from_adjacency({0: [1], 1: [0, 2, 5], 2: [1, 3, 5], 3: [2],
+                                     4: [5], 5: [1, 2, 4, 6], 6: [5], 7: []})
+    labels = np.array([1, 1, 1, 1, 2, -1, -1, -1], dtype=np.int32)
+    partitions = {1: {0, 1, 2, 3}, 2: {4}}
+    _assign_leftovers(graph, labels, partitions, policy)
+    assert labels[5] == labels[6] == expected
+    assert labels[7] == 2  # the smallest partition either way
+    assert set().union(*partitions.values()) == set(range(8))
+    assert all(labels[node] == pid for pid, part in partitions.items() for node in part)
+
+
+def test_unknown_leftover_policy(small_graph):
+    with pytest.raises(ValueError):
+        run_graph_prrp(small_graph, p=2, C=5, MR=3, MS=6, leftover_policy="nearest")
+    partitions = run_graph_prrp(small_graph, p=3, C=3, MR=3, MS=4, leftover_policy="smallest")
+    assert set().union(*partitions.values()) == set(small_graph)
+
+
+def test_grow_partition_seeds_against_assigned_nodes():
+    """
+    Gapless Seeding:
+    On a path whose first half is assigned, the seed is the unassigned node next to it.
+    """
+    path = {i: [j for j in (i - 1, i + 1) if 0 <= j < 10] for i in range(10)}
+    for _ in range(5):
+        U = set(range(5, 10))
+        assert grow_partition(path, U, p=1, c=1, MR=3, precomputed_ap=set()) == {5}
+        assert U == {6, 7, 8, 9}
+
+
+def test_labels_agree_with_partitions(grid_graph):
+    """
+    Label Array:
+    Every node ends in exactly one partition, and a leftover node tied between partitions
+    joins the one with the lowest ID under either policy.
+    """
+    for seed in range(20):
+        random.seed(seed)
+        partitions = run_graph_prrp(grid_graph, p=4, C=3, MR=2, MS=4)
+        assert sum(map(len, partitions.values())) == len(grid_graph)
+        assert set().union(*partitions.values()) == set(grid_graph)
+
+    # Node 2 touches partitions 1 and 2 once each, and both have two nodes.
+    graph = CSRGraph.from_adjacency({0: [1], 1: [0, 2], 2: [1, 3], 3: [2, 4], 4: [3]})
+    for policy in LEFTOVER_POLICIES:
+        labels = np.array([1, 1, -1, 2, 2], dtype=np.int32)
+        partitions = {1: {0, 1}, 2: {3, 4}}
+        _assign_leftovers(graph, labels, partitions, policy)
+        assert labels[2] == 1 and partitions == {1: {0, 1, 2}, 2: {3, 4}}
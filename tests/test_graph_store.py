@@ -0,0 +1,95 @@
+"""
+tests/test_graph_store.py
+
+Unit tests for the binary graph container in src/graph_store.py. The tests cover:
+    - Round trips of CSR arrays, weights, identifiers and metadata
+    - Memory-mapped loading
+    - Checksum verification of corrupted files
+    - Conversion of METIS files on first use
+    - Concurrent saves to the same path
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.csr_graph import CSRGraph
+from src.graph_store import load_graph, load_or_convert_metis, save_graph
+
+
+@pytest.fixture
+def square():
+    """A 4-cycle a-b-c-d with string identifiers."""
+    return CSRGraph.from_adjacency(
+        {"a": ["b", "d"], "b": ["a", "c"], "c": ["b", "d"], "d": ["c", "a"]})
+
+
+def test_round_trip_with_weights(square, tmp_path):
+    path = str(tmp_path / "square.prrpg")
+    vwgt = np.array([[1, 2], [3, 4], [5, 6], [7, 8]])
+    adjwgt = np.arange(square.indices.size) * 10
+    save_graph(path, square, vwgt, adjwgt, meta={"name": "square"})
+
+    stored = load_graph(path, verify=True)
+    # Views onto the read-only mapping, not copies.
+    assert not stored.graph.indices.flags.owndata
+    assert not stored.graph.indices.flags.writeable
+    assert stored.graph.to_adjacency() == square.to_adjacency()
+    assert stored.graph.index_of("c") == 2
+    assert stored.vwgt.tolist() == vwgt.tolist()
+    assert stored.adjwgt.tolist() == adjwgt.tolist()
+    assert stored.meta == {"name": "square"}
+
+
+def test_integer_ids_and_empty_graphs(tmp_path):
+    path = str(tmp_path / "ints.prrpg")
+    graph = CSRGraph.from_adjacency({5: [6], 6: [5], 7: []})
+    save_graph(path, graph)
+    stored = load_graph(path)
+    assert stored.graph.id_offset == 5
+    assert stored.graph.to_adjacency() == {5: {6}, 6: {5}, 7: set()}
+    assert stored.vwgt is None and stored.adjwgt is None
+
+    save_graph(path, CSRGraph.from_adjacency({}))
+    assert load_graph(path).graph.num_nodes == 0
+
+
+def test_corruption_is_detected(square, tmp_path):
+    path = tmp_path / "square.prrpg"
+    save_graph(str(path), square)
+    data = bytearray(path.read_bytes())
+    data[-8] ^= 0xFF
+    path.write_bytes(bytes(data))
+    load_graph(str(path))  # not verified by default
+    with pytest.raises(ValueError, match="Checksum"):
+        load_graph(str(path), verify=True)
+    with pytest.raises(ValueError, match="not a PRRP graph file"):
+        path.write_bytes(b"4 3\n")
+        load_graph(str(path))
+
+
+def test_object_ids_rejected(tmp_path):
+    graph = CSRGraph.from_adjacency({(0, 0): [(0, 1)], (0, 1): [(0, 0)]})
+    with pytest.raises(TypeError):
+        save_graph(str(tmp_path / "tuples.prrpg"), graph)
+
+
+def test_load_or_convert_metis(tmp_path):
+    metis_path = tmp_path / "graph.metis"
+    metis_path.write_text("3 2 01\n2 7\n1 7 3 9\n2 9\n")
+    stored = load_or_convert_metis(str(metis_path))
+    assert (tmp_path / "graph.prrpg").exists()
+    assert stored.graph.to_adjacency() == {0: {1}, 1: {0, 2}, 2: {1}}
+    assert stored.adjwgt.tolist() == [7, 7, 9, 9]
+
+
+def test_concurrent_saves_from_threads(square, tmp_path):
+    path = str(tmp_path / "square.prrpg")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda k: save_graph(path, square, meta={"writer": k}), range(32)))
+    stored = load_graph(path, verify=True)
+    assert stored.graph.to_adjacency() == square.to_adjacency()
+    assert stored.meta["writer"] in range(32)
+    assert os.listdir(tmp_path) == ["square.prrpg"]
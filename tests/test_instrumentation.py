@@ -0,0 +1,79 @@
+"""
+tests/test_instrumentation.py
+
+Unit tests for the hot-path instrumentation in src/instrumentation.py. The tests cover:
+    - Summary counters recorded by region growing, merging and splitting
+    - Sampled tracing through a custom sink
+    - Tracing leaving the generated regions unchanged
+"""
+
+import logging
+import random
+
+import pytest
+
+from src import instrumentation
+from src.instrumentation import (
+    count,
+    counters,
+    disable_tracing,
+    enable_tracing,
+    log_counters,
+    reset_counters,
+)
+from src.csr_graph import CSRGraph
+from src.spatial_prrp import _run_prrp_on_graph
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    reset_counters()
+    disable_tracing()
+    yield
+    reset_counters()
+    disable_tracing()
+
+
+def solve(adj_list, seed):
+    random.seed(seed)
+    return _run_prrp_on_graph(adj_list, CSRGraph.from_adjacency(adj_list), [30, 20, 14])
+
+
+def test_counters_summarize_a_run(make_grid, caplog):
+    adj_list = make_grid(8, 8)
+    solve(adj_list, 1)
+    totals = counters()
+    assert totals["grow.attempts"] >= 1
+    assert totals["grow.areas_added"] >= 30
+
+    count("custom", 2)
+    with caplog.at_level(logging.INFO, logger=instrumentation.__name__):
+        log_counters()
+    assert "custom=2" in caplog.text
+    reset_counters()
+    assert counters() == {}
+
+
+def test_sampled_tracing_does_not_change_results(make_grid):
+    adj_list = make_grid(8, 8)
+    baseline = solve(adj_list, 7)
+    events = []
+    enable_tracing(1.0, sink=lambda event, fields: events.append((event, fields)), seed=0)
+    assert solve(adj_list, 7) == baseline
+    assert any(event == "grow.add" and "size" in fields for event, fields in events)
+
+    events.clear()
+    enable_tracing(0.1, sink=lambda event, fields: events.append(event), seed=0)
+    solve(adj_list, 7)
+    grown = counters()["grow.areas_added"]
+    assert 0 < len(events) < grown
+
+
+def test_disabled_tracer_emits_nothing(make_grid):
+    events = []
+    enable_tracing(1.0, sink=lambda event, fields: events.append(event))
+    disable_tracing()
+    solve(make_grid(8, 8), 3)
+    assert events == []
+    with pytest.raises(ValueError):
+        enable_tracing(1.5)
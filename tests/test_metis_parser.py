@@ -10,6 +10,8 @@ These tests cover:
   - Detection and reporting of malformed files (empty files, only comments, malformed header,
     insufficient vertex lines, odd token counts for weighted edges, out-of-range neighbor indices).
   - Verification of 1-based to 0-based indexing conversion and self-loop prevention.
+  - Isolated vertices (empty lines), right-aligned fmt flags and chunked tokenization.
+  - Vertex and edge weights kept alongside the CSR arrays.
   - A performance test for a large METIS graph (data/PGPgiantcompo.graph).
 
 Run the tests with:
@@ -18,7 +20,9 @@ Run the tests with:
 
 import os
 import pytest
-from src.metis_parser import load_graph_from_metis
+import src.metis_parser as metis_parser
+from src.metis_parser import load_graph_from_metis, read_metis
+from src.utils import save_graph_to_metis
 
 # Helper function to write graph content to a temporary file.
 
@@ -226,6 +230,76 @@ def test_edge_count_validation(tmp_path):
     # Computed edge count = 4 // 2 = 2.
     assert num_edges == 2
 
+def test_blank_line_is_isolated_vertex(tmp_path):
+    """
+    An empty vertex line describes a vertex without neighbors, so graphs with isolated
+    vertices written by save_graph_to_metis load back unchanged.
+    """
+    adj = {1: [2], 2: [1], 3: [], 4: [5], 5: [4]}
+    file_path = str(tmp_path / "isolated.metis")
+    save_graph_to_metis(file_path, adj)
+    adj_list, num_nodes, num_edges = load_graph_from_metis(file_path)
+    assert adj_list == {0: [1], 1: [0], 2: [], 3: [4], 4: [3]}
+    assert (num_nodes, num_edges) == (5, 2)
+
+
+def test_fmt_is_right_aligned(tmp_path):
+    """
+    "1" means edge weights (like "001"), and "100" adds a vertex size before the neighbors.
+    """
+    edge_weighted = write_temp_graph(tmp_path, "2 1 1\n2 7\n1 7\n")
+    assert load_graph_from_metis(edge_weighted)[0] == {0: [1], 1: [0]}
+    sized = write_temp_graph(tmp_path, "2 1 100\n9 2\n9 1\n")
+    assert load_graph_from_metis(sized)[0] == {0: [1], 1: [0]}
+
+
+def test_read_metis_across_chunks(tmp_path, monkeypatch):
+    """Chunk boundaries (always on line breaks) and comments do not change the result."""
+    content = (
+        "% leading comment\n"
+        "4 4\n"
+        "2 3\n"
+        "  % comment between vertices 99\n"
+        "1 3 4\n"
+        "1 2\n"
+        "2"
+    )
+    file_path = write_temp_graph(tmp_path, content)
+    expected = read_metis(file_path)
+    monkeypatch.setattr(metis_parser, "_CHUNK_BYTES", 3)
+    chunked = read_metis(file_path)
+    assert chunked.graph.to_adjacency() == expected.graph.to_adjacency() == {
+        0: {1, 2}, 1: {0, 2, 3}, 2: {0, 1}, 3: {1}}
+    assert chunked.num_edges == 4
+
+
+def test_read_metis_keeps_weights(tmp_path, monkeypatch):
+    """
+    Vertex weights come back as an (n, ncon) array and edge weights aligned with the CSR
+    indices; the weight of a dropped self-loop is dropped with it.
+    """
+    content = (
+        "3 2 11 2\n"
+        "5 6 2 10\n"
+        "3 4 1 10 2 99 3 20\n"  # 2 99 is a self-loop
+        "7 8 2 20\n"
+    )
+    file_path = write_temp_graph(tmp_path, content)
+    for chunk_bytes in (1 << 20, 4):
+        monkeypatch.setattr(metis_parser, "_CHUNK_BYTES", chunk_bytes)
+        metis = read_metis(file_path)
+        assert metis.vwgt.tolist() == [[5, 6], [3, 4], [7, 8]]
+        assert metis.graph.indices.tolist() == [1, 0, 2, 1]
+        assert metis.adjwgt.tolist() == [10, 10, 20, 20]
+    unweighted = read_metis(write_temp_graph(tmp_path, "2 1\n2\n1\n"))
+    assert unweighted.vwgt is None and unweighted.adjwgt is None
+
+
+def test_invalid_token(tmp_path):
+    file_path = write_temp_graph(tmp_path, "2 1\n2\n1x\n")
+    with pytest.raises(ValueError, match="Invalid neighbor token in vertex 2"):
+        load_graph_from_metis(file_path)
+
 # ---------- Performance / Large Graph Test ----------
 
 
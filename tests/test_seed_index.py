@@ -0,0 +1,88 @@
+"""
+tests/test_seed_index.py
+
+Unit tests for the incremental gapless seed index in src/seed_index.py. The tests cover:
+    - Assigned-neighbor counts staying exact under assign/release sequences
+    - Gapless selection (adjacent to assigned nodes) and the random fallback
+    - Best-bucket selection
+    - Error handling for exhausted or inconsistent updates
+"""
+
+import random
+
+import pytest
+
+from src.csr_graph import CSRGraph
+from src.seed_index import GaplessSeedIndex
+from src.spatial_prrp import get_gapless_seed
+
+
+@pytest.fixture
+def grid(make_grid):
+    """A 4x4 grid graph with dense node ids 0..15."""
+    return make_grid(4, 4)
+
+
+def test_counts_match_brute_force(grid):
+    graph = CSRGraph.from_adjacency(grid)
+    index = GaplessSeedIndex(graph)
+    assigned = set()
+    rng = random.Random(3)
+    for _ in range(60):
+        node = rng.randrange(16)
+        if node in assigned:
+            index.release(node)
+            assigned.discard(node)
+        else:
+            index.assign(node)
+            assigned.add(node)
+        for n in range(16):
+            expected = sum(1 for nbr in grid[n] if nbr in assigned)
+            assert index.assigned_neighbor_count(n) == expected
+        assert len(index) == 16 - len(assigned)
+
+
+def test_initial_assigned_nodes(grid):
+    graph = CSRGraph.from_adjacency(grid)
+    index = GaplessSeedIndex(graph, assigned=[0, 1])
+    assert 0 not in index and 2 in index
+    assert index.assigned_neighbor_count(5) == 1
+    assert index.assigned_neighbor_count(4) == 1
+
+
+def test_select_seed_is_gapless(grid):
+    graph = CSRGraph.from_adjacency(grid)
+    index = GaplessSeedIndex(graph)
+    first = index.select_seed()
+    assert first in range(16)
+    for node in (0, 1, 4):
+        index.assign(node)
+    for _ in range(50):
+        seed = index.select_seed()
+        assert seed in {2, 5, 8}
+
+
+def test_select_best_seed(grid):
+    graph = CSRGraph.from_adjacency(grid)
+    index = GaplessSeedIndex(graph, assigned=[0, 1, 4])
+    # Node 5 touches both 1 and 4; no other node has two assigned neighbors.
+    assert index.select_best_seed() == 5
+
+
+def test_exhausted_index_raises(grid):
+    graph = CSRGraph.from_adjacency(grid)
+    index = GaplessSeedIndex(graph, assigned=range(16))
+    with pytest.raises(ValueError):
+        index.select_seed()
+    with pytest.raises(ValueError):
+        index.assign(3)
+    index.release(3)
+    assert index.select_seed() == 3
+
+
+def test_get_gapless_seed_with_index():
+    adj = {"a": {"b"}, "b": {"a", "c"}, "c": {"b", "d"}, "d": {"c"}}
+    graph = CSRGraph.from_adjacency(adj)
+    index = GaplessSeedIndex(graph, assigned=[graph.index_of("a")])
+    seed = get_gapless_seed(adj, {"b", "c", "d"}, {"a"}, seed_index=index)
+    assert seed == "b"
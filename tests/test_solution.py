@@ -0,0 +1,64 @@
+"""
+tests/test_solution.py
+
+Unit tests for the label-array solution type in src/solution.py. The tests cover:
+    - Conversion from and to the set-based spatial and graph views
+    - Region sizes, lookups and unassigned nodes
+    - Compact pickling of ensembles that share one graph
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from src.csr_graph import CSRGraph
+from src.solution import UNASSIGNED, Solution
+
+
+@pytest.fixture
+def path_graph():
+    """A path a-b-c-d-e with string identifiers."""
+    ids = "abcde"
+    return CSRGraph.from_adjacency(
+        {x: [y for y in ids[max(i - 1, 0):i + 2] if y != x] for i, x in enumerate(ids)})
+
+
+def test_round_trip_views(path_graph):
+    regions = [{"c", "d", "e"}, {"a", "b"}]
+    solution = Solution.from_regions(regions, path_graph)
+    assert solution.labels.dtype == np.int32
+    assert solution.labels.tolist() == [1, 1, 0, 0, 0]
+    assert solution.to_regions() == regions
+    assert solution.to_partitions() == {1: {"c", "d", "e"}, 2: {"a", "b"}}
+    assert Solution.from_partitions(solution.to_partitions(), path_graph) == solution
+    assert solution.region_sizes().tolist() == [3, 2]
+    assert solution.region(1) == {"a", "b"}
+    assert solution.region_of("d") == 0
+    assert len(solution) == 2
+
+
+def test_unassigned_and_failed_solutions(path_graph):
+    partial = Solution.from_regions([{"b"}, {"d", "e"}], path_graph)
+    assert partial.region_of("a") == UNASSIGNED
+    assert partial.to_regions() == [{"b"}, {"d", "e"}]
+    assert partial.region_sizes().tolist() == [1, 2]
+
+    failed = Solution.from_regions([], path_graph)
+    assert failed.num_regions == 0 and failed.to_regions() == []
+    with pytest.raises(ValueError):
+        Solution([0, 1], path_graph)
+    with pytest.raises(KeyError):
+        Solution.from_regions([{"z"}], path_graph)
+
+
+def test_ensemble_pickles_graph_once():
+    graph = CSRGraph.from_adjacency({i: [i - 1, i + 1] for i in range(1, 2999)}
+                                    | {0: [1], 2999: [2998]})
+    labels = (np.arange(3000) // 1000).astype(np.int32)
+    ensemble = [Solution(np.roll(labels, k), graph) for k in range(100)]
+    payload = pickle.dumps(ensemble)
+    # About 12 KB of labels per solution plus one copy of the graph.
+    assert len(payload) < 100 * 12_500 + len(pickle.dumps(graph))
+    restored = pickle.loads(payload)
+    assert restored[7] == ensemble[7] and restored[7].graph is restored[0].graph
@@ -15,17 +15,28 @@ Each test ensures that spatial contiguity and cardinality constraints are mainta
 
 import unittest
 import random
+import threading
 from copy import deepcopy
 from typing import Dict, Set, List, Any
 
+import numpy as np
+
+from src.csr_graph import CSRGraph, component_labels
 # Import functions to be tested from the PRRP module.
 from src.spatial_prrp import (
     get_gapless_seed,
     grow_region,
+    grow_from_seed,
     merge_disconnected_areas,
+    remove_boundary_areas,
     split_region,
     run_prrp,
-    run_parallel_prrp
+    run_parallel_prrp,
+    iter_prrp_solutions,
+    PRRPExecutor,
+    _grow_from_seed,
+    _local_fragments,
+    _mask_view,
 )
 # Import utility functions.
 from src.utils import find_connected_components, construct_adjacency_list
@@ -128,6 +139,43 @@ class TestSpatialPRRP(unittest.TestCase):
         self.assertEqual(len(components), 1,
                          "Grown region should be spatially contiguous.")
 
+    def test_grow_from_seed_large_grid(self):
+        """
+        Tests that incremental frontier growth on a 100x100 grid yields a contiguous region
+        of the target size and removes exactly its areas from the available set.
+        """
+        side = 100
+        grid = {}
+        for r in range(side):
+            for c in range(side):
+                grid[r * side + c] = {
+                    (r + dr) * side + c + dc
+                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                    if 0 <= r + dr < side and 0 <= c + dc < side}
+        available = set(grid)
+        region = grow_from_seed(grid, 0, available, 5000)
+        self.assertEqual(len(region), 5000)
+        self.assertEqual(len(available), side * side - 5000)
+        self.assertTrue(region.isdisjoint(available))
+        subgraph = {area: list(grid[area] & region) for area in region}
+        self.assertEqual(len(find_connected_components(subgraph)), 1)
+
+    def test_grow_region_rolls_back_failed_attempts(self):
+        """
+        Tests that failed growth attempts hand their areas back, so a call that exhausts its
+        retries leaves the available set exactly as it was.
+        """
+        # Two disconnected 6-area blocks: no region of 7 areas can be grown.
+        adj_list = {k: {k + d for d in (-1, 1) if 0 <= k + d < 6} for k in range(6)}
+        adj_list.update({k: {k + d for d in (-1, 1) if 6 <= k + d < 12} for k in range(6, 12)})
+        available = set(range(12))
+        with self.assertRaises(RuntimeError):
+            grow_region(adj_list, available, target_cardinality=7, max_retries=3)
+        self.assertEqual(available, set(range(12)))
+
+        region = grow_region(adj_list, available, target_cardinality=6)
+        self.assertEqual(available, set(range(12)) - region)
+
     def test_grow_region_insufficient_areas(self):
         """
         Tests that growing a region when available areas are insufficient raises a ValueError.
@@ -165,6 +213,39 @@ class TestSpatialPRRP(unittest.TestCase):
     # ==============================
     # 4. Test split_region
     # ==============================
+    def test_local_merge_matches_global_components(self):
+        """
+        Tests that whenever the localized merge check decides, its fragments are exactly the
+        components a global pass over the available areas would merge.
+        """
+        side = 20
+        grid = {r * side + c: {(r + dr) * side + c + dc
+                               for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                               if 0 <= r + dr < side and 0 <= c + dc < side}
+                for r in range(side) for c in range(side)}
+        graph = CSRGraph.from_adjacency(grid)
+        decided = 0
+        for seed in range(40):
+            random.seed(seed)
+            available = bytearray(b"\x01") * graph.num_nodes
+            for _ in range(5):
+                free = [i for i in range(graph.num_nodes) if available[i]]
+                region = _grow_from_seed(graph, random.choice(free), available,
+                                         random.randint(5, 60))
+                fragments = _local_fragments(graph, available, region)
+                free = np.flatnonzero(_mask_view(available))
+                num_components, labels = component_labels(graph, free)
+                sizes = np.bincount(labels)
+                largest = int(np.argmax(sizes))
+                if fragments is not None and sorted(sizes.tolist())[-2:] != [sizes[largest]] * 2:
+                    decided += 1
+                    self.assertEqual(
+                        sorted(map(sorted, fragments)),
+                        sorted(sorted(free[labels == k].tolist())
+                               for k in range(num_components) if k != largest))
+                _mask_view(available)[free[labels != largest]] = False
+        self.assertGreater(decided, 100)
+
     def test_split_region(self):
         """
         Tests that split_region correctly removes excess areas to meet the target cardinality
@@ -185,6 +266,40 @@ class TestSpatialPRRP(unittest.TestCase):
         self.assertEqual(len(components), 1,
                          "Split region must remain contiguous.")
 
+    def test_remove_boundary_areas_prunes_disconnected_region(self):
+        """
+        Tests that boundary removal from a region that is not contiguous to begin with (as
+        after merging enclosed areas) still ends with a single contiguous component.
+        """
+        for seed in range(10):
+            random.seed(seed)
+            adjusted_region = remove_boundary_areas({1, 2, 3, 4, 12}, 1, self.adj_list)
+            self.assertTrue(adjusted_region <= {1, 2, 3, 4, 12})
+            subgraph = {area: list(self.adj_list[area] & adjusted_region)
+                        for area in adjusted_region}
+            self.assertEqual(len(find_connected_components(subgraph)), 1)
+
+    def test_wrappers_accept_prebuilt_graph(self):
+        """
+        Tests that passing a prebuilt CSRGraph gives the same results as letting each
+        set-based function build its own from the adjacency list.
+        """
+        graph = CSRGraph.from_adjacency(self.adj_list)
+        calls = [
+            lambda **kw: grow_region(self.adj_list, set(self.available_areas), 5, **kw),
+            lambda **kw: grow_from_seed(self.adj_list, 1, set(self.available_areas), 5, **kw),
+            lambda **kw: remove_boundary_areas({1, 2, 3, 4, 12}, 1, self.adj_list, **kw),
+            lambda **kw: split_region({1, 2, 3, 4, 5, 6}, 4, self.adj_list, **kw),
+        ]
+        for call in calls:
+            random.seed(3)
+            expected = call()
+            random.seed(3)
+            self.assertEqual(call(graph=graph), expected)
+        available = set(self.available_areas) - {2, 6}
+        self.assertEqual(merge_disconnected_areas(self.adj_list, set(available), {2, 6}),
+                         merge_disconnected_areas(self.adj_list, available, {2, 6}, graph=graph))
+
     # ==============================
     # 5. Test run_prrp (Full PRRP Execution)
     # ==============================
@@ -243,6 +358,73 @@ class TestSpatialPRRP(unittest.TestCase):
         self.assertGreater(len(unique_solutions), 1,
                            "Parallel solutions should be statistically independent and not identical.")
 
+    def test_prrp_executor_reuses_pool(self):
+        """
+        Tests that a PRRPExecutor serves several calls from one pool and that a fixed
+        seed reproduces the same solution.
+        """
+        seeds = [11, 22, 11]
+        with PRRPExecutor(self.adj_list, num_workers=2) as executor:
+            first = executor.run(self.num_regions, self.cardinalities, 3, seeds=seeds)
+            pool = executor._pool
+            second = executor.run(2, [6, 6], 2, seeds=[2, 3])
+            self.assertIs(executor._pool, pool,
+                          "The pool should be reused across calls.")
+        self.assertIsNone(executor._pool)
+        self.assertEqual(first[0], first[2],
+                         "The same seed should reproduce the same solution.")
+        for solution in second:
+            self.assertEqual(sorted(map(len, solution)), [6, 6])
+        with self.assertRaises(ValueError):
+            PRRPExecutor(self.adj_list).run(2, [12], 1)
+
+    def test_iter_prrp_solutions_streams_with_bounded_prefetch(self):
+        """
+        Tests that streamed solutions match the seeded sequential ones, that an iterator
+        can be abandoned early, and that arguments are checked before iteration starts.
+        """
+        seeds = list(range(10))
+        streamed = dict(iter_prrp_solutions(self.adj_list, self.num_regions, self.cardinalities,
+                                            len(seeds), num_threads=2, seeds=seeds, prefetch=1))
+        sequential = dict(iter_prrp_solutions(self.adj_list, self.num_regions, self.cardinalities,
+                                              len(seeds), use_multiprocessing=False, seeds=seeds))
+        self.assertEqual(streamed, sequential)
+        self.assertEqual(set(streamed), set(seeds))
+
+        compact = dict(iter_prrp_solutions(self.adj_list, self.num_regions, self.cardinalities,
+                                           len(seeds), num_threads=2, seeds=seeds, compact=True))
+        self.assertEqual({seed: solution.to_regions() for seed, solution in compact.items()},
+                         sequential)
+
+        with PRRPExecutor(self.adj_list, num_workers=2) as executor:
+            stream = executor.imap(self.num_regions, self.cardinalities, 1000, prefetch=2)
+            next(stream)
+            stream.close()
+            self.assertEqual(len(executor.run(self.num_regions, self.cardinalities, 2)), 2)
+        with self.assertRaises(ValueError):
+            iter_prrp_solutions(self.adj_list, 2, [12], 1)
+
+    def test_prrp_executor_closes_with_open_stream(self):
+        """
+        Tests that leaving the with-block while a partly consumed iterator is still alive
+        shuts the pool down instead of waiting for the iterator forever.
+        """
+        held = []
+
+        def consume_partly():
+            with PRRPExecutor(self.adj_list, num_workers=2) as executor:
+                stream = executor.imap(self.num_regions, self.cardinalities, 50, prefetch=2)
+                for solution in stream:
+                    break
+                held.append(stream)
+
+        worker = threading.Thread(target=consume_partly, daemon=True)
+        worker.start()
+        worker.join(timeout=60)
+        self.assertFalse(worker.is_alive(), "Closing the executor hung on an open stream.")
+        # Only the solutions already submitted remain; the stream then ends.
+        self.assertLessEqual(len(list(held[0])), 2)
+
     # ==============================
     # 7. Edge Cases
     # ==============================
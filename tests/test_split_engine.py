@@ -0,0 +1,67 @@
+"""
+tests/test_split_engine.py
+
+Unit tests for the partition splitting engine in src/split_engine.py. The tests cover:
+    - Biconnected block computation on induced subgraphs
+    - Incremental articulation-point maintenance against full recomputation
+    - Boundary peeling that keeps the remaining partition connected
+"""
+
+import random
+
+import pytest
+
+from src.csr_graph import (
+    CSRGraph,
+    articulation_points,
+    biconnected_blocks,
+    induced_components,
+)
+from src.split_engine import ArticulationTracker, peel_boundary
+
+
+def test_biconnected_blocks_bowtie():
+    """Two triangles sharing node 2 form two blocks; a pendant edge forms a third."""
+    adj = {0: {1, 2}, 1: {0, 2}, 2: {0, 1, 3, 4},
+           3: {2, 4}, 4: {2, 3, 5}, 5: {4}}
+    graph = CSRGraph.from_adjacency(adj)
+    blocks = biconnected_blocks(graph, set(range(6)))
+    assert sorted(map(sorted, blocks)) == [[0, 1, 2], [2, 3, 4], [4, 5]]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_tracker_matches_recomputation(seed):
+    rng = random.Random(seed)
+    adj = {i: set() for i in range(120)}
+    for i in range(120):
+        for j in rng.sample(range(120), 2):
+            if i != j:
+                adj[i].add(j)
+                adj[j].add(i)
+    graph = CSRGraph.from_adjacency(adj)
+    nodes = set(range(120))
+    tracker = ArticulationTracker(graph, nodes)
+    order = list(nodes)
+    rng.shuffle(order)
+    for node in order[:100]:
+        tracker.remove(node)
+        nodes.discard(node)
+        assert tracker.articulation_points == articulation_points(graph, nodes)
+
+
+def test_peel_boundary_keeps_partition_connected(make_grid):
+    graph = CSRGraph.from_adjacency(make_grid(30, 30))
+    partition = set(range(0, 600))  # the top 20 rows of the grid
+    remaining, removed = peel_boundary(graph, partition, 250)
+    assert len(removed) == 250
+    assert remaining | removed == partition
+    assert len(induced_components(graph, remaining)) == 1
+
+
+def test_peel_boundary_falls_back_to_articulation_points():
+    # The only boundary node of {0, 1, 2} is 1 (it touches 3), and 1 is an articulation point.
+    graph = CSRGraph.from_adjacency({0: [1], 1: [0, 2, 3], 2: [1], 3: [1]})
+    for seed in range(5):
+        random.seed(seed)
+        remaining, removed = peel_boundary(graph, {0, 1, 2}, 1)
+        assert removed == {1} and remaining == {0, 2}
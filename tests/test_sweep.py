@@ -0,0 +1,76 @@
+"""
+tests/test_sweep.py
+
+Unit tests for the parameter sweep in src/sweep.py. The tests cover:
+    - Sweep results matching direct runs with the same seeds, in and out of a pool
+    - Per-configuration timing and failure reporting
+    - Validation of inconsistent configurations
+"""
+
+import random
+
+import pytest
+
+from src.checkpoint import ensemble_seeds
+from src.graph_prrp import run_graph_prrp
+from src.spatial_prrp import run_prrp
+from src.sweep import (GraphConfig, PreparedGraph, SpatialConfig, _worker_state,
+                       format_sweep_report, run_sweep)
+
+
+CONFIGS = [SpatialConfig(3, (4, 4, 4), solutions_count=3, root_seed=7),
+           SpatialConfig(2, (6, 6), solutions_count=2, root_seed=8),
+           GraphConfig(p=3, C=4, MR=5, MS=6, solutions_count=2, root_seed=9)]
+
+
+def direct(config, adj_list):
+    solutions = []
+    for seed in ensemble_seeds(config.root_seed, config.solutions_count):
+        random.seed(seed)
+        if isinstance(config, SpatialConfig):
+            solutions.append(run_prrp(adj_list, config.num_regions, list(config.cardinalities)))
+        else:
+            solutions.append(run_graph_prrp(adj_list, config.p, config.C, config.MR, config.MS))
+    return solutions
+
+
+def test_sweep_matches_direct_runs(make_grid):
+    expected = [direct(config, make_grid(3, 4)) for config in CONFIGS]
+    pooled = run_sweep(make_grid(3, 4), CONFIGS, num_workers=2)
+    sequential = run_sweep(PreparedGraph(make_grid(3, 4)), CONFIGS, use_multiprocessing=False)
+    assert _worker_state == {}, "A sequential sweep must not keep the graph alive."
+    for results in (pooled, sequential):
+        assert [result.config for result in results] == CONFIGS
+        assert [result.solutions for result in results] == expected
+        assert all(result.error is None and result.elapsed > 0 for result in results)
+
+    compact = run_sweep(make_grid(3, 4), CONFIGS[:1], compact=True)
+    assert [solution.to_regions() for solution in compact[0].solutions] == expected[0]
+
+
+def test_failures_are_reported_per_configuration(make_grid):
+    configs = [SpatialConfig(1, (12,), root_seed=1),
+               GraphConfig(p=2, C=20, MR=5, MS=30, root_seed=1)]
+    results = run_sweep(make_grid(3, 4), configs, use_multiprocessing=False)
+    assert results[0].error is None and len(results[0].solutions) == 1
+    assert results[1].error.startswith("ValueError") and results[1].solutions == []
+    report = format_sweep_report(results)
+    assert len(report.splitlines()) == 3 and "ValueError" in report
+
+    with pytest.raises(ValueError):
+        run_sweep(make_grid(3, 4), [SpatialConfig(2, (4, 4, 4))])
+    with pytest.raises(ValueError):
+        run_sweep(make_grid(3, 4), [GraphConfig(3, 4, 5, 6, leftover_policy="nearest")])
+    with pytest.raises(TypeError):
+        run_sweep(make_grid(3, 4), [(3, (4, 4, 4))])
+
+
+def test_prepared_graph_state(make_grid):
+    adj_list = make_grid(3, 4)
+    adj_list[12], adj_list[13] = {13}, {12}
+    prepared = PreparedGraph(adj_list)
+    assert prepared.component_sizes == [12, 2]
+    with pytest.raises(ValueError):
+        run_sweep(prepared, [SpatialConfig(2, (13, 1))], use_multiprocessing=False)
+    assert prepared.graph.num_nodes == 14
+    assert prepared.articulation == set()
@@ -42,6 +42,8 @@ from src.utils import (
     calculate_low_link_values,
     parallel_execute,
     PARALLEL_PROCESSING_ENABLED,
+    RandomAccessSet,
+    build_rook_csr,
 )
 
 
@@ -101,6 +103,23 @@ def test_construct_adjacency_list_geodataframe():
     ), "Isolated region should have an empty neighbor set."
 
 
+def test_build_rook_csr_ignores_corner_contacts():
+    """
+    A 3x3 grid of unit squares: edge-sharing squares are neighbors, squares that meet
+    only at a corner are not. The GeoDataFrame path keys results by the frame's index.
+    """
+    squares = [Polygon([(c, r), (c + 1, r), (c + 1, r + 1), (c, r + 1)])
+               for r in range(3) for c in range(3)]
+    graph = build_rook_csr(squares)
+    assert graph.num_edges == 12
+    assert set(graph.neighbors(4).tolist()) == {1, 3, 5, 7}
+    assert set(graph.neighbors(0).tolist()) == {1, 3}
+
+    gdf = gpd.GeoDataFrame({'geometry': squares}, index=[f"sq{i}" for i in range(9)])
+    adj_list = construct_adjacency_list(gdf)
+    assert adj_list["sq4"] == {"sq1", "sq3", "sq5", "sq7"}
+
+
 def test_construct_adjacency_list_list():
     """
     Test adjacency list creation using a list of dict-like objects.
@@ -125,6 +144,15 @@ def test_construct_adjacency_list_list():
     assert adj_list['c'] == set(), "Isolated area should have no neighbors."
 
 
+def test_construct_adjacency_list_list_matches_geodataframe():
+    """The list-of-dicts path and the GeoDataFrame path agree on a 4x4 grid."""
+    squares = [Polygon([(c, r), (c + 1, r), (c + 1, r + 1), (c, r + 1)])
+               for r in range(4) for c in range(4)]
+    areas = [{'id': i, 'geometry': sq} for i, sq in enumerate(squares)]
+    assert construct_adjacency_list(areas) == construct_adjacency_list(
+        gpd.GeoDataFrame({'geometry': squares}))
+
+
 def test_construct_adjacency_list_preconstructed_dict():
     """
     Test that if a pre-constructed dictionary is provided, the function converts neighbor lists to sets.
@@ -357,6 +385,31 @@ def test_random_seed_selection_no_valid_candidate():
     assert seed == 3, "Seed should be the only unassigned node (3)."
 
 
+# -----------------------------
+# Tests for RandomAccessSet
+# -----------------------------
+
+def test_random_access_set_operations():
+    """
+    Test that RandomAccessSet behaves like a set under adds/removals and samples only members.
+    """
+    ras = RandomAccessSet([1, 2, 3])
+    ras.add(2)
+    assert len(ras) == 3
+    ras.remove(1)
+    ras.discard(42)
+    assert set(ras) == {2, 3}
+    assert 1 not in ras and 3 in ras
+    for _ in range(20):
+        assert ras.sample() in {2, 3}
+    with pytest.raises(KeyError):
+        ras.remove(1)
+    ras.remove(2)
+    ras.remove(3)
+    with pytest.raises(IndexError):
+        ras.sample()
+
+
 # -----------------------------
 # Tests for load_graph_from_metis
 # -----------------------------